@@ -0,0 +1,26 @@
+"""saved influencers keyset index
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_saved_influencers_brand_created",
+        "saved_influencers",
+        ["brand_id", "created_at", "influencer_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_saved_influencers_brand_created", table_name="saved_influencers")
@@ -0,0 +1,40 @@
+"""campaign accepted_count for capacity accounting
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "campaigns",
+        sa.Column("accepted_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE campaigns c
+        SET accepted_count = a.n
+        FROM (
+            SELECT campaign_id, count(*) AS n
+            FROM campaign_applications
+            WHERE status = 'accepted'
+            GROUP BY campaign_id
+        ) a
+        WHERE a.campaign_id = c.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("campaigns", "accepted_count")
@@ -0,0 +1,92 @@
+"""influencer full-text search vector
+
+The column is filled by a trigger rather than declared GENERATED: adding a
+stored generated column rewrites the whole table under an exclusive lock.
+Existing rows are backfilled in short committed batches and the GIN index is
+built CONCURRENTLY.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+SEARCH_VECTOR = """
+    setweight(to_tsvector('simple', coalesce({row}display_name, '')), 'A') ||
+    setweight(to_tsvector('simple', concat_ws(' ', {row}instagram_handle, {row}tiktok_handle, {row}youtube_handle)), 'B') ||
+    setweight(to_tsvector('english', coalesce({row}bio, '')), 'C')
+"""
+
+
+def upgrade() -> None:
+    op.add_column("influencer_profiles", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION influencer_profiles_search_vector() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR.format(row="NEW.")};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER influencer_profiles_search_vector
+        BEFORE INSERT OR UPDATE OF display_name, bio, instagram_handle, tiktok_handle, youtube_handle
+        ON influencer_profiles
+        FOR EACH ROW EXECUTE FUNCTION influencer_profiles_search_vector()
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            result = bind.execute(
+                sa.text(
+                    f"""
+                    UPDATE influencer_profiles
+                    SET search_vector = {SEARCH_VECTOR.format(row="")}
+                    WHERE id IN (
+                        SELECT id FROM influencer_profiles
+                        WHERE search_vector IS NULL
+                        LIMIT {BATCH_SIZE}
+                    )
+                    """
+                )
+            )
+            if result.rowcount == 0:
+                break
+        op.create_index(
+            "ix_influencer_profiles_search_vector",
+            "influencer_profiles",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_influencer_profiles_search_vector",
+            table_name="influencer_profiles",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.execute("DROP TRIGGER IF EXISTS influencer_profiles_search_vector ON influencer_profiles")
+    op.execute("DROP FUNCTION IF EXISTS influencer_profiles_search_vector()")
+    op.drop_column("influencer_profiles", "search_vector")
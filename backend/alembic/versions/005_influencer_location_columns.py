@@ -0,0 +1,77 @@
+"""structured influencer location (city, country code)
+
+Existing rows are parsed in Python with the same parser the model uses and
+written back in committed keyset batches; the indexes are built CONCURRENTLY.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.locations import parse_location
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    op.add_column("influencer_profiles", sa.Column("location_city", sa.String(100), nullable=True))
+    op.add_column("influencer_profiles", sa.Column("location_country", sa.String(2), nullable=True))
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        last_id = None
+        while True:
+            rows = bind.execute(
+                sa.text(
+                    """
+                    SELECT id, location FROM influencer_profiles
+                    WHERE location IS NOT NULL AND (CAST(:last_id AS uuid) IS NULL OR id > :last_id)
+                    ORDER BY id
+                    LIMIT :limit
+                    """
+                ),
+                {"last_id": last_id, "limit": BATCH_SIZE},
+            ).all()
+            if not rows:
+                break
+            params = [
+                {"id": row.id, "city": city, "country": country}
+                for row in rows
+                for city, country in [parse_location(row.location)]
+            ]
+            bind.execute(
+                sa.text("UPDATE influencer_profiles SET location_city = :city, location_country = :country WHERE id = :id"),
+                params,
+            )
+            last_id = rows[-1].id
+
+        for column in ("location_city", "location_country"):
+            op.create_index(
+                f"ix_influencer_profiles_{column}",
+                "influencer_profiles",
+                [column],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in ("location_city", "location_country"):
+            op.drop_index(
+                f"ix_influencer_profiles_{column}",
+                table_name="influencer_profiles",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    op.drop_column("influencer_profiles", "location_country")
+    op.drop_column("influencer_profiles", "location_city")
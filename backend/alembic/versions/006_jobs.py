@@ -0,0 +1,54 @@
+"""postgres-backed job queue
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("queue", sa.String(50), nullable=False),
+        sa.Column("task", sa.String(100), nullable=False),
+        sa.Column("payload", postgresql.JSONB(), nullable=False, server_default="{}"),
+        sa.Column(
+            "status",
+            sa.Enum("queued", "running", "succeeded", "failed", name="jobstatus"),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="5"),
+        sa.Column("run_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("unique_key", sa.String(200), unique=True),
+        sa.Column("locked_at", sa.DateTime(timezone=True)),
+        sa.Column("locked_by", sa.String(100)),
+        sa.Column("last_error", sa.Text()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("finished_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index(
+        "ix_jobs_queue_run_at_queued", "jobs", ["queue", "run_at"], postgresql_where=sa.text("status = 'queued'")
+    )
+    op.create_index(
+        "ix_jobs_locked_at_running", "jobs", ["locked_at"], postgresql_where=sa.text("status = 'running'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_locked_at_running", table_name="jobs")
+    op.drop_index("ix_jobs_queue_run_at_queued", table_name="jobs")
+    op.drop_table("jobs")
+    op.execute("DROP TYPE IF EXISTS jobstatus")
@@ -0,0 +1,77 @@
+"""sharded campaign rollups for the brand dashboard
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match rollup_service.ROLLUP_SHARDS; reconciliation adds any missing shards.
+SHARDS = 8
+
+
+def upgrade() -> None:
+    op.create_table(
+        "campaign_rollups",
+        sa.Column(
+            "campaign_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("campaigns.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("shard", sa.SmallInteger(), primary_key=True),
+        sa.Column("brand_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("pending", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("accepted", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rejected", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("title", sa.String(200)),
+        sa.Column("status", postgresql.ENUM(name="campaignstatus", create_type=False)),
+        sa.Column("budget", sa.Numeric(12, 2)),
+        sa.Column("price_per_influencer", sa.Numeric(10, 2)),
+        sa.Column("end_date", sa.Date()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_campaign_rollups_brand_id", "campaign_rollups", ["brand_id"])
+
+    # Exact counts and campaign fields on shard 0, empty rows for the rest.
+    op.execute(
+        f"""
+        INSERT INTO campaign_rollups
+            (campaign_id, shard, brand_id, pending, accepted, rejected,
+             title, status, budget, price_per_influencer, end_date)
+        SELECT c.id, s.shard, c.brand_id,
+               CASE WHEN s.shard = 0 THEN coalesce(a.pending, 0) ELSE 0 END,
+               CASE WHEN s.shard = 0 THEN coalesce(a.accepted, 0) ELSE 0 END,
+               CASE WHEN s.shard = 0 THEN coalesce(a.rejected, 0) ELSE 0 END,
+               CASE WHEN s.shard = 0 THEN c.title END,
+               CASE WHEN s.shard = 0 THEN c.status END,
+               CASE WHEN s.shard = 0 THEN c.budget END,
+               CASE WHEN s.shard = 0 THEN c.price_per_influencer END,
+               CASE WHEN s.shard = 0 THEN c.end_date END
+        FROM campaigns c
+        CROSS JOIN generate_series(0, {SHARDS - 1}) AS s(shard)
+        LEFT JOIN (
+            SELECT campaign_id,
+                   count(*) FILTER (WHERE status = 'pending') AS pending,
+                   count(*) FILTER (WHERE status = 'accepted') AS accepted,
+                   count(*) FILTER (WHERE status = 'rejected') AS rejected
+            FROM campaign_applications
+            GROUP BY campaign_id
+        ) a ON a.campaign_id = c.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_campaign_rollups_brand_id", table_name="campaign_rollups")
+    op.drop_table("campaign_rollups")
@@ -0,0 +1,43 @@
+"""application inbox keyset indexes
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_campaign_applications_inbox": ["campaign_id", "status", "created_at", "id"],
+    "ix_campaign_applications_campaign_created": ["campaign_id", "created_at", "id"],
+    "ix_campaign_applications_influencer_created": ["influencer_id", "created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(
+                name,
+                "campaign_applications",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(
+                name,
+                table_name="campaign_applications",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
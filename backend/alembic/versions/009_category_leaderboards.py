@@ -0,0 +1,39 @@
+"""category leaderboards
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by the refresh_leaderboards job on its first run.
+    op.create_table(
+        "category_leaderboards",
+        sa.Column("category", sa.String(), primary_key=True),
+        sa.Column("metric", sa.String(20), primary_key=True),
+        sa.Column("rank", sa.SmallInteger(), primary_key=True),
+        sa.Column(
+            "influencer_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("influencer_profiles.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("category_leaderboards")
@@ -0,0 +1,4 @@
+import time
+
+# Start of the app's import phase, reported as startup_phase_seconds{phase="import"}.
+IMPORT_STARTED = time.perf_counter()
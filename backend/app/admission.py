@@ -0,0 +1,133 @@
+"""Admission control for expensive endpoints.
+
+Every route class has a token bucket per user and a cap on concurrent requests
+in this process (ADMISSION_LIMITS). Before either is consulted, requests are
+shed with 503 while the process is already overloaded: when recent pool
+checkout waits or event-loop lag exceed their thresholds, accepting more work
+only queues it into timeouts. Limits are kept per process, so with N workers
+a user can get up to N times the configured rate.
+"""
+from __future__ import annotations
+
+import math
+import time
+from typing import NamedTuple
+
+from app import metrics
+from app.config import settings
+
+# Pool-wait samples lose half their weight every this many seconds, so the
+# signal recovers even if nothing checks out a connection for a while.
+POOL_WAIT_HALF_LIFE = 5.0
+MAX_BUCKETS = 50_000
+
+
+class Limits(NamedTuple):
+    per_minute: float
+    burst: int
+    concurrency: int
+
+
+class Rejection(NamedTuple):
+    status_code: int
+    reason: str
+    retry_after: int
+
+
+def parse_limits(spec: str) -> dict[str, Limits]:
+    """``"ai=20/10/8,search=240/60/32"``: per-minute rate / burst / concurrency per class."""
+    limits = {}
+    for part in spec.split(","):
+        name, _, values = part.strip().partition("=")
+        if name:
+            per_minute, burst, concurrency = values.split("/")
+            limits[name] = Limits(float(per_minute), int(burst), int(concurrency))
+    return limits
+
+
+class RouteClass:
+    def __init__(self, name: str, limits: Limits):
+        self.name = name
+        self.limits = limits
+        self.in_flight = 0
+        # key -> [tokens, monotonic time they were counted]
+        self._buckets: dict[str, list[float]] = {}
+
+    def take(self, key: str, now: float) -> float:
+        """Spend a token for ``key``; returns 0, or seconds until one is available."""
+        rate = self.limits.per_minute / 60
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= MAX_BUCKETS:
+                self._prune(now)
+            bucket = self._buckets[key] = [float(self.limits.burst), now]
+        tokens = min(self.limits.burst, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / rate if rate > 0 else 60.0
+
+    def _prune(self, now: float) -> None:
+        # Buckets that have refilled are indistinguishable from new ones.
+        rate = self.limits.per_minute / 60
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if bucket[0] + (now - bucket[1]) * rate < self.limits.burst
+        }
+
+
+_classes = {name: RouteClass(name, limits) for name, limits in parse_limits(settings.admission_limits).items()}
+_pool_wait = 0.0
+_pool_wait_at = 0.0
+
+
+def _decayed_pool_wait(now: float) -> float:
+    return _pool_wait * 0.5 ** ((now - _pool_wait_at) / POOL_WAIT_HALF_LIFE)
+
+
+def record_pool_wait(seconds: float) -> None:
+    """Fold one connection checkout wait into the decaying average."""
+    global _pool_wait, _pool_wait_at
+    now = time.monotonic()
+    _pool_wait = _decayed_pool_wait(now) * 0.8 + seconds * 0.2
+    _pool_wait_at = now
+
+
+def overload_reason() -> str | None:
+    if metrics.EVENT_LOOP_LAG_LAST.get() > settings.shed_loop_lag_seconds:
+        return "event_loop_lag"
+    if _decayed_pool_wait(time.monotonic()) > settings.shed_pool_wait_seconds:
+        return "pool_wait"
+    return None
+
+
+def acquire(route_class: str, key: str) -> Rejection | None:
+    """Admit one request, taking a concurrency slot that :func:`release` returns."""
+    rc = _classes.get(route_class)
+    if rc is None:
+        return None
+    reason = overload_reason()
+    if reason is not None:
+        metrics.ADMISSION_REJECTIONS.inc(route_class, reason)
+        return Rejection(503, reason, math.ceil(settings.shed_retry_after_seconds))
+    # Concurrency first: a request turned away for a busy process must not
+    # cost the user a token.
+    if rc.in_flight >= rc.limits.concurrency:
+        metrics.ADMISSION_REJECTIONS.inc(route_class, "concurrency")
+        return Rejection(503, "concurrency", 1)
+    wait = rc.take(key, time.monotonic())
+    if wait > 0:
+        metrics.ADMISSION_REJECTIONS.inc(route_class, "rate_limited")
+        return Rejection(429, "rate_limited", math.ceil(wait))
+    rc.in_flight += 1
+    metrics.ADMISSION_IN_FLIGHT.set(rc.in_flight, route_class)
+    return None
+
+
+def release(route_class: str) -> None:
+    rc = _classes.get(route_class)
+    if rc is not None:
+        rc.in_flight -= 1
+        metrics.ADMISSION_IN_FLIGHT.set(rc.in_flight, route_class)
@@ -8,8 +8,54 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
     openai_api_key: str = ""
+    admin_api_key: str = ""
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: float = 1800.0
+    warmup_connections: int = 5
+    ready_check_timeout_seconds: float = 2.0
+    admission_limits: str = "ai=20/10/8,search=240/60/32,export=6/3/2"
+    shed_pool_wait_seconds: float = 0.5
+    shed_loop_lag_seconds: float = 0.25
+    shed_retry_after_seconds: float = 5.0
+    saved_cache_ttl_seconds: float = 60.0
+    singleflight_timeout_seconds: float = 30.0
+    speculative_search: bool = False
+    estimate_cube_refresh_seconds: float = 300.0
+    matching_index_refresh_seconds: float = 60.0
+    suggest_index_refresh_seconds: float = 300.0
+    leaderboard_size: int = 50
+    leaderboard_refresh_seconds: float = 600.0
+    leaderboard_cache_seconds: float = 60.0
+    leaderboard_debounce_seconds: float = 30.0
+    events_max_streams: int = 20000
+    events_max_streams_per_user: int = 5
+    events_queue_size: int = 100
+    events_heartbeat_seconds: float = 25.0
+    events_retry_ms: int = 5000
+    snapshot_dir: str = ""
+    snapshot_refresh_seconds: float = 300.0
+    snapshot_check_seconds: float = 5.0
+    snapshot_max_age_seconds: float = 1800.0
+    snapshot_keep_versions: int = 3
+    worker_queues: str = "default=4,maintenance=1"
+    job_poll_interval_seconds: float = 1.0
+    job_housekeeping_interval_seconds: float = 30.0
+    job_lock_timeout_seconds: float = 900.0
+    job_backoff_base_seconds: float = 10.0
+    job_backoff_max_seconds: float = 3600.0
+    worker_shutdown_timeout_seconds: float = 30.0
+    metrics_dir: str = ""
+    metrics_flush_seconds: float = 5.0
+    loop_lag_interval_seconds: float = 0.5
+    tracing_exporter: str = ""
+    tracing_sample_ratio: float = 1.0
+    tracing_file_path: str = "traces.jsonl"
+    tracing_otlp_endpoint: str = ""
+    tracing_service_name: str = "influencer-platform-api"
 
     model_config = {"env_file": "../.env", "extra": "ignore"}
 
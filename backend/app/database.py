@@ -1,13 +1,52 @@
 from __future__ import annotations
 
+import time
+
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from app import admission, metrics
 from app.config import settings
 
-engine = create_async_engine(settings.database_url, echo=False)
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            metrics.DB_POOL_WAIT.observe(waited)
+            admission.record_pool_wait(waited)
+
+
+engine = create_async_engine(
+    settings.database_url,
+    echo=False,
+    poolclass=InstrumentedPool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout_seconds,
+    pool_recycle=settings.db_pool_recycle_seconds,
+)
 async_session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+def _pool_stats() -> dict[tuple[str, ...], float]:
+    pool = engine.pool
+    return {
+        ("size",): pool.size(),
+        ("checked_in",): pool.checkedin(),
+        ("checked_out",): pool.checkedout(),
+        ("overflow",): max(0, pool.overflow()),
+    }
+
+
+metrics.DB_POOL_CONNECTIONS.set_function(_pool_stats)
+
+
 async def get_db() -> AsyncSession:
     async with async_session_factory() as session:
         try:
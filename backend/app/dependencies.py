@@ -1,17 +1,28 @@
 from __future__ import annotations
 
+import secrets
 import uuid
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi import Depends, HTTPException, Query, Request, status
+from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app import admission
+from app.config import settings
 from app.database import get_db
 from app.models import Role, User
+from app.projections import CAMPAIGN_PROJECTIONS, INFLUENCER_PROJECTIONS, Fieldset, parse_fields
+from app.schemas.campaign import CampaignResponse
+from app.schemas.influencer import InfluencerProfileResponse
 from app.services.auth_service import decode_token, get_user_by_id
 
+MAX_BATCH_IDS = 500
+
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
+admin_key_header = APIKeyHeader(name="X-Admin-Key", auto_error=False)
 
 
 async def get_current_user(
@@ -27,9 +38,93 @@ async def get_current_user(
     return user
 
 
+def get_token_payload(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(optional_security)],
+) -> dict | None:
+    """Decoded access token if one was sent, without touching the database."""
+    if credentials is None:
+        return None
+    payload = decode_token(credentials.credentials)
+    if not payload or payload.get("type") != "access":
+        return None
+    return payload
+
+
 def require_role(role: Role):
     def checker(user: Annotated[User, Depends(get_current_user)]) -> User:
         if user.role != role:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
         return user
     return checker
+
+
+def require_admin_key(key: Annotated[str | None, Depends(admin_key_header)]) -> None:
+    if not settings.admin_api_key or not key or not secrets.compare_digest(key, settings.admin_api_key):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin key")
+
+
+def admit(route_class: str):
+    """Route dependency applying admission control for ``route_class``.
+
+    Keyed by the token's user id, or the client address for anonymous calls.
+    It only decodes the token, so rejected requests never touch the pool.
+    """
+
+    async def dependency(request: Request, payload: Annotated[dict | None, Depends(get_token_payload)]):
+        key = payload["sub"] if payload else f"ip:{request.client.host if request.client else 'unknown'}"
+        rejection = admission.acquire(route_class, key)
+        if rejection is not None:
+            detail = "Rate limit exceeded" if rejection.status_code == 429 else "Server busy, retry later"
+            raise HTTPException(
+                status_code=rejection.status_code,
+                detail=detail,
+                headers={"Retry-After": str(rejection.retry_after)},
+            )
+        try:
+            yield
+        finally:
+            admission.release(route_class)
+
+    return dependency
+
+
+def batch_ids(
+    ids: Annotated[list[str], Query(description="Comma-separated or repeated ids")],
+) -> list[uuid.UUID]:
+    """Parse ?ids=a,b&ids=c into unique UUIDs, keeping first-seen order."""
+    parsed: dict[uuid.UUID, None] = {}
+    for chunk in ids:
+        for raw in chunk.split(","):
+            if not raw.strip():
+                continue
+            try:
+                parsed[uuid.UUID(raw.strip())] = None
+            except ValueError:
+                raise HTTPException(status_code=422, detail=f"Invalid id: {raw}")
+    if not parsed:
+        raise HTTPException(status_code=422, detail="No ids given")
+    if len(parsed) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_IDS} ids per request")
+    return list(parsed)
+
+
+def fieldset(model: type[BaseModel], projections: dict[str, tuple[str, ...]]):
+    """Route dependency parsing ``?fields=`` into a :class:`Fieldset` of ``model``.
+
+    Records the projection name on the request for the payload metrics.
+    """
+    description = f"full (default), {', '.join(projections)} or comma-separated field names"
+
+    def dependency(request: Request, fields: str | None = Query(None, description=description)) -> Fieldset:
+        try:
+            parsed = parse_fields(fields, model, projections)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        request.state.projection = parsed.name
+        return parsed
+
+    return dependency
+
+
+influencer_fields = fieldset(InfluencerProfileResponse, INFLUENCER_PROJECTIONS)
+campaign_fields = fieldset(CampaignResponse, CAMPAIGN_PROJECTIONS)
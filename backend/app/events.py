@@ -0,0 +1,183 @@
+"""Push notifications over Postgres LISTEN/NOTIFY.
+
+Writers call :func:`applications_changed` inside their transaction; Postgres
+delivers the notifications only if it commits. Each API process holds one
+dedicated LISTEN connection (:func:`listen`) outside the pool and fans events
+out to the in-process subscribers of the addressed user, who read them from
+``GET /api/v1/events`` as server-sent events. An idle stream costs a queue and
+a suspended coroutine, no database connection.
+
+Delivery is best effort: a subscriber that falls EVENTS_QUEUE_SIZE events
+behind is disconnected, and after the listener reconnects every stream gets a
+``resync`` event, so clients refetch whenever they (re)connect or see one.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+
+import asyncpg
+from sqlalchemy import Text, any_, cast, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import metrics
+from app.config import settings
+from app.models import BrandProfile, Campaign, CampaignApplication, InfluencerProfile
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "app_events"
+LISTENER_PING_SECONDS = 30.0
+LISTENER_PING_TIMEOUT_SECONDS = 5.0
+
+
+class Subscription:
+    __slots__ = ("user_id", "queue")
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        # (event type, JSON data); None tells the stream to close.
+        self.queue: asyncio.Queue[tuple[str, str] | None] = asyncio.Queue(settings.events_queue_size)
+
+
+_subscriptions: dict[str, set[Subscription]] = {}
+_count = 0
+
+
+def has_capacity(user_id: str) -> bool:
+    """Whether this process and the user are both below their stream limits."""
+    return (
+        _count < settings.events_max_streams
+        and len(_subscriptions.get(user_id, ())) < settings.events_max_streams_per_user
+    )
+
+
+def subscribe(user_id: str) -> Subscription | None:
+    """Register a stream for ``user_id``; None when at capacity."""
+    global _count
+    if not has_capacity(user_id):
+        return None
+    subscription = Subscription(user_id)
+    _subscriptions.setdefault(user_id, set()).add(subscription)
+    _count += 1
+    metrics.EVENT_STREAMS.set(_count)
+    return subscription
+
+
+def unsubscribe(subscription: Subscription) -> None:
+    global _count
+    streams = _subscriptions.get(subscription.user_id)
+    if streams is None or subscription not in streams:
+        return
+    streams.discard(subscription)
+    if not streams:
+        del _subscriptions[subscription.user_id]
+    _count -= 1
+    metrics.EVENT_STREAMS.set(_count)
+
+
+def _deliver(subscription: Subscription, event: tuple[str, str]) -> None:
+    try:
+        subscription.queue.put_nowait(event)
+        metrics.EVENTS_DELIVERED.inc("delivered")
+    except asyncio.QueueFull:
+        # Too slow to keep up: drop the backlog and close; the client refetches on reconnect.
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+        unsubscribe(subscription)
+        metrics.EVENTS_DELIVERED.inc("overflow")
+
+
+def _dispatch(connection, pid: int, channel: str, payload: str) -> None:
+    try:
+        event = json.loads(payload)
+        streams = _subscriptions.get(str(event["user_id"]))
+    except (ValueError, KeyError, TypeError):
+        logger.warning(f"Ignoring malformed notification: {payload[:200]}")
+        return
+    if not streams:
+        metrics.EVENTS_DELIVERED.inc("unrouted")
+        return
+    for subscription in list(streams):
+        _deliver(subscription, (event["type"], payload))
+
+
+def _broadcast_resync() -> None:
+    event = ("resync", json.dumps({"type": "resync"}))
+    for streams in list(_subscriptions.values()):
+        for subscription in list(streams):
+            _deliver(subscription, event)
+
+
+def _dsn() -> str:
+    return make_url(settings.database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+async def listen() -> None:
+    """Hold this process's LISTEN connection, reconnecting with backoff."""
+    delay = 1.0
+    while True:
+        try:
+            conn = await asyncpg.connect(_dsn())
+            try:
+                closed = asyncio.Event()
+                conn.add_termination_listener(lambda _: closed.set())
+                await conn.add_listener(CHANNEL, _dispatch)
+                metrics.EVENT_LISTENER_UP.set(1)
+                delay = 1.0
+                # Anything published while we were not listening is lost.
+                _broadcast_resync()
+                while not closed.is_set():
+                    try:
+                        await asyncio.wait_for(closed.wait(), timeout=LISTENER_PING_SECONDS)
+                    except asyncio.TimeoutError:
+                        # Notices half-open TCP connections that never terminate.
+                        await conn.execute("SELECT 1", timeout=LISTENER_PING_TIMEOUT_SECONDS)
+            finally:
+                metrics.EVENT_LISTENER_UP.set(0)
+                if not conn.is_closed():
+                    conn.terminate()
+            logger.warning("Event listener connection closed, reconnecting")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Event listener failed, retrying in {delay:.0f}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+async def applications_changed(db: AsyncSession, event_type: str, application_ids: list[uuid.UUID]) -> None:
+    """Queue one notification per application for whoever should hear about it.
+
+    New applications go to the campaign's brand, status changes to the
+    applicant. The payload is built in the same statement, so this costs one
+    round trip however many applications a bulk update touched.
+    """
+    if not application_ids:
+        return
+    if event_type == "application.created":
+        recipient = BrandProfile.user_id
+        source = CampaignApplication.__table__.join(Campaign, Campaign.id == CampaignApplication.campaign_id).join(
+            BrandProfile, BrandProfile.id == Campaign.brand_id
+        )
+    else:
+        recipient = InfluencerProfile.user_id
+        source = CampaignApplication.__table__.join(
+            InfluencerProfile, InfluencerProfile.id == CampaignApplication.influencer_id
+        )
+    payload = func.json_build_object(
+        "type", event_type,
+        "user_id", recipient,
+        "campaign_id", CampaignApplication.campaign_id,
+        "application_id", CampaignApplication.id,
+        "status", CampaignApplication.status,
+    )
+    await db.execute(
+        select(func.pg_notify(CHANNEL, cast(payload, Text)))
+        .select_from(source)
+        .where(CampaignApplication.id == any_(application_ids))
+    )
@@ -0,0 +1,115 @@
+"""Background job handlers run by ``python -m app.worker``."""
+from __future__ import annotations
+
+import logging
+import os
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import any_, select, update
+
+from app import metrics, snapshot
+from app.config import settings
+from app.database import async_session_factory
+from app.models import Campaign, InfluencerProfile
+from app.services import job_service, leaderboard_service, rollup_service
+from app.services.fraud_service import calculate_authenticity_scores
+
+logger = logging.getLogger(__name__)
+
+RESCORE_BATCH_SIZE = 1000
+RECONCILE_BATCH_SIZE = 500
+
+
+@job_service.task("rescore_authenticity", queue="maintenance", every=timedelta(days=1))
+async def rescore_authenticity(payload: dict) -> None:
+    """Recompute authenticity scores, for the given influencer_ids or every profile.
+
+    Walks the table in id order and commits per batch, so a retry after a crash
+    only redoes the batch that was in flight.
+    """
+    ids = [uuid.UUID(i) for i in payload.get("influencer_ids", [])]
+    last_id = None
+    updated = 0
+    while True:
+        query = select(
+            InfluencerProfile.id,
+            InfluencerProfile.follower_count,
+            InfluencerProfile.avg_likes,
+            InfluencerProfile.avg_comments,
+            InfluencerProfile.engagement_rate,
+        ).order_by(InfluencerProfile.id).limit(RESCORE_BATCH_SIZE)
+        if ids:
+            query = query.where(InfluencerProfile.id == any_(ids))
+        if last_id is not None:
+            query = query.where(InfluencerProfile.id > last_id)
+        async with async_session_factory() as session:
+            rows = (await session.execute(query)).all()
+            if not rows:
+                break
+            scores = calculate_authenticity_scores([tuple(row[1:]) for row in rows])
+            # ORM bulk UPDATE by primary key: one executemany per batch.
+            await session.execute(
+                update(InfluencerProfile),
+                [
+                    {"id": row.id, "authenticity_score": score, "fake_follower_pct": fake_pct}
+                    for row, (score, fake_pct) in zip(rows, scores)
+                ],
+            )
+            await session.commit()
+        updated += len(rows)
+        last_id = rows[-1].id
+    logger.info(f"Rescored authenticity for {updated} profiles")
+
+
+@job_service.task("prune_jobs", queue="maintenance", every=timedelta(hours=1))
+async def prune_jobs(payload: dict) -> None:
+    async with async_session_factory() as session:
+        removed = await job_service.prune_finished(session, timedelta(days=payload.get("days", 7)))
+        await session.commit()
+    logger.info(f"Pruned {removed} finished jobs")
+
+
+@job_service.task("reconcile_campaign_rollups", queue="maintenance", every=timedelta(hours=1))
+async def reconcile_campaign_rollups(payload: dict) -> None:
+    """Recount dashboard rollups from applications, one committed batch of campaigns at a time."""
+    last_id = None
+    checked = drifted = 0
+    while True:
+        query = select(Campaign.id).order_by(Campaign.id).limit(RECONCILE_BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(Campaign.id > last_id)
+        async with async_session_factory() as session:
+            ids = list((await session.execute(query)).scalars())
+            if not ids:
+                break
+            drifted += await rollup_service.reconcile(session, ids)
+            await session.commit()
+        checked += len(ids)
+        last_id = ids[-1]
+    metrics.ROLLUP_DRIFT.inc(amount=drifted)
+    log = logger.warning if drifted else logger.info
+    log(f"Reconciled campaign rollups: {drifted} of {checked} campaigns had drifted")
+
+
+@job_service.task(
+    "refresh_leaderboards",
+    queue="maintenance",
+    every=timedelta(seconds=settings.leaderboard_refresh_seconds),
+)
+async def refresh_leaderboards(payload: dict) -> None:
+    async with async_session_factory() as session:
+        written = await leaderboard_service.refresh(session)
+        await session.commit()
+    logger.info(f"Refreshed category leaderboards: {written} entries")
+
+
+@job_service.task(
+    "build_search_snapshot",
+    queue="maintenance",
+    max_attempts=2,
+    every=timedelta(seconds=settings.snapshot_refresh_seconds) if settings.snapshot_dir else None,
+)
+async def build_search_snapshot(payload: dict) -> None:
+    os.makedirs(settings.snapshot_dir, exist_ok=True)
+    await snapshot.build()
@@ -0,0 +1,77 @@
+"""Parse free-text locations ("Los Angeles, US") into a city and ISO country code."""
+from __future__ import annotations
+
+import string
+
+COUNTRY_ALIASES = {
+    "us": "US", "usa": "US", "united states": "US", "united states of america": "US", "america": "US",
+    "uk": "GB", "gb": "GB", "united kingdom": "GB", "great britain": "GB", "britain": "GB", "england": "GB",
+    "in": "IN", "india": "IN",
+    "br": "BR", "brazil": "BR", "brasil": "BR",
+    "fr": "FR", "france": "FR",
+    "jp": "JP", "japan": "JP",
+    "au": "AU", "australia": "AU",
+    "ca": "CA", "canada": "CA",
+    "de": "DE", "germany": "DE", "deutschland": "DE",
+    "ae": "AE", "uae": "AE", "united arab emirates": "AE",
+    "sg": "SG", "singapore": "SG",
+    "kr": "KR", "korea": "KR", "south korea": "KR",
+    "mx": "MX", "mexico": "MX",
+    "es": "ES", "spain": "ES",
+    "it": "IT", "italy": "IT",
+    "nl": "NL", "netherlands": "NL",
+    "be": "BE", "belgium": "BE",
+    "cn": "CN", "china": "CN",
+    "ng": "NG", "nigeria": "NG",
+    "za": "ZA", "south africa": "ZA",
+}
+
+# Cities that are commonly given without a country.
+CITY_COUNTRIES = {
+    "Los Angeles": "US", "New York": "US", "Miami": "US", "Chicago": "US", "San Francisco": "US",
+    "London": "GB", "Manchester": "GB",
+    "Mumbai": "IN", "Delhi": "IN", "Bangalore": "IN",
+    "Paris": "FR", "Tokyo": "JP", "Sydney": "AU", "Melbourne": "AU", "Toronto": "CA", "Vancouver": "CA",
+    "Berlin": "DE", "Sao Paulo": "BR", "Rio De Janeiro": "BR", "Dubai": "AE", "Singapore": "SG",
+    "Seoul": "KR", "Brussels": "BE", "Amsterdam": "NL", "Madrid": "ES", "Milan": "IT",
+}
+
+
+def normalize_country(text: str | None) -> str | None:
+    """ISO 3166-1 alpha-2 code for a country name, alias or code; None if unknown."""
+    if not text:
+        return None
+    key = " ".join(text.lower().replace(".", "").split())
+    if key in COUNTRY_ALIASES:
+        return COUNTRY_ALIASES[key]
+    if len(key) == 2 and key.isalpha():
+        return key.upper()
+    return None
+
+
+def normalize_city(text: str | None) -> str | None:
+    if not text or not text.strip():
+        return None
+    return string.capwords(text.strip())
+
+
+def parse_location(text: str | None) -> tuple[str | None, str | None]:
+    """Split "City, Region, Country" into (city, country_code).
+
+    A lone token is read as a country when it names one, otherwise as a city
+    whose country is filled in from CITY_COUNTRIES when known.
+    """
+    if not text or not text.strip():
+        return None, None
+    parts = [p.strip() for p in text.split(",") if p.strip()]
+    if len(parts) == 1:
+        # Only known names or upper-case codes: "la" is more likely a city than Laos.
+        country = COUNTRY_ALIASES.get(" ".join(parts[0].lower().split()))
+        if country is None and len(parts[0]) == 2 and parts[0].isalpha() and parts[0].isupper():
+            country = parts[0]
+        if country:
+            return None, country
+        city = normalize_city(parts[0])
+        return city, CITY_COUNTRIES.get(city)
+    city = normalize_city(parts[0])
+    return city, normalize_country(parts[-1]) or CITY_COUNTRIES.get(city)
@@ -1,7 +1,31 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import auth, brands, campaigns, influencers, search
+import app as package
+from app import events, jobs, metrics, tracing, warmup  # noqa: F401  (importing jobs registers the handlers for enqueue)
+from app.routers import auth, brands, campaigns, events as events_router, influencers, search
+from app.services import estimate_service, matching_service, suggest_service
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    tasks = [
+        asyncio.create_task(metrics.monitor_event_loop()),
+        asyncio.create_task(warmup.run()),
+        asyncio.create_task(estimate_service.refresh_periodically()),
+        asyncio.create_task(matching_service.rebuild_periodically()),
+        asyncio.create_task(suggest_service.rebuild_periodically()),
+        asyncio.create_task(events.listen()),
+    ]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 def create_app() -> FastAPI:
@@ -10,6 +34,7 @@ def create_app() -> FastAPI:
         version="0.1.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
     application.add_middleware(
@@ -19,18 +44,35 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    application.add_middleware(metrics.MetricsMiddleware)
+    tracing.setup_tracing(application)
 
     application.include_router(auth.router)
     application.include_router(influencers.router)
     application.include_router(brands.router)
     application.include_router(campaigns.router)
     application.include_router(search.router)
+    application.include_router(events_router.router)
 
     @application.get("/health")
     async def health():
         return {"status": "ok"}
 
+    @application.get("/ready")
+    async def ready(response: Response):
+        if not await warmup.check():
+            response.status_code = 503
+            return {"status": "warming" if not warmup.ready else "unavailable", "startup": warmup.phases}
+        return {"status": "ready", "startup": warmup.phases}
+
+    @application.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        # Rendered on the event loop: collectors are mutated there, never mid-scrape.
+        return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
     return application
 
 
 app = create_app()
+warmup.phases["import"] = round(time.perf_counter() - package.IMPORT_STARTED, 3)
+metrics.STARTUP_PHASE_SECONDS.set(warmup.phases["import"], "import")
@@ -0,0 +1,396 @@
+"""In-process Prometheus metrics.
+
+Collectors are plain dicts keyed by label tuples, so recording a sample is a dict
+lookup and an add. With several uvicorn workers set ``METRICS_DIR``: every worker
+periodically dumps its samples to ``<METRICS_DIR>/<pid>.json`` and ``/metrics``
+merges all files (counters and histograms are summed, gauges get a ``pid`` label).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REGISTRY: list[_Metric] = []
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], object] = {}
+        REGISTRY.append(self)
+
+    def snapshot(self) -> list[list]:
+        return [[list(labels), value] for labels, value in self._values.items()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._function: Callable[[], dict[tuple[str, ...], float]] | None = None
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def set_function(self, function: Callable[[], dict[tuple[str, ...], float]]) -> None:
+        """Compute the gauge at collection time instead of on every change."""
+        self._function = function
+
+    def snapshot(self) -> list[list]:
+        if self._function is not None:
+            try:
+                self._values.update(self._function())
+            except Exception as e:
+                logger.warning(f"Gauge {self.name} collection failed: {e}")
+        return super().snapshot()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        state = self._values.get(labels)
+        if state is None:
+            # Per-bucket (non-cumulative) counts, +Inf last, then sum.
+            state = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template, method and status.",
+    ("method", "route", "status"),
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "SQLAlchemy pool connections by state (size, checked_in, checked_out, overflow).",
+    ("state",),
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent acquiring a connection from the pool.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+AI_REQUEST_DURATION = Histogram(
+    "ai_request_duration_seconds",
+    "OpenAI call latency by operation and outcome.",
+    ("operation", "outcome"),
+)
+AI_FALLBACKS = Counter(
+    "ai_fallbacks_total",
+    "AI operations answered by the rule-based mock, by reason.",
+    ("operation", "reason"),
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt hash/verify duration.",
+    ("operation",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0),
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between a scheduled event-loop wake-up and when it actually ran.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+EVENT_LOOP_LAG_LAST = Gauge("event_loop_lag_last_seconds", "Most recent event-loop lag sample.")
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "In-process cache lookups by cache and result (hit, miss).",
+    ("cache", "result"),
+)
+INMEMORY_INDEX_ENTRIES = Gauge(
+    "inmemory_index_entries",
+    "Entries held by per-process in-memory indexes.",
+    ("index",),
+)
+INMEMORY_INDEX_BYTES = Gauge(
+    "inmemory_index_bytes",
+    "Approximate memory held by per-process in-memory indexes.",
+    ("index",),
+)
+JOBS_PROCESSED = Counter(
+    "jobs_processed_total",
+    "Background job runs by queue, task and outcome (succeeded, retried, failed, lost).",
+    ("queue", "task", "outcome"),
+)
+JOB_DURATION = Histogram(
+    "job_duration_seconds",
+    "Background job run time by queue and task.",
+    ("queue", "task"),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0),
+)
+JOB_START_DELAY = Histogram(
+    "job_start_delay_seconds",
+    "Time between a job becoming due and a worker claiming it.",
+    ("queue",),
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 15.0, 60.0, 300.0, 900.0),
+)
+COALESCED_CALLS = Counter(
+    "coalesced_calls_total",
+    "Coalesced calls by operation and role: leader ran the work, follower shared its result.",
+    ("operation", "role"),
+)
+COALESCE_TIMEOUTS = Counter(
+    "coalesce_timeouts_total", "Callers that stopped waiting for a shared call.", ("operation",)
+)
+NATURAL_SEARCH_DURATION = Histogram(
+    "natural_search_duration_seconds", "Natural search latency by mode (sequential, speculative).", ("mode",)
+)
+SPECULATIVE_SEARCHES = Counter(
+    "speculative_searches_total",
+    "Speculative natural searches by outcome: hit when the LLM agreed with the rule-based filters.",
+    ("outcome",),
+)
+SPECULATIVE_SAVED_SECONDS = Histogram(
+    "speculative_saved_seconds", "Latency saved per speculative hit (SQL time overlapped with the LLM call)."
+)
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejections_total",
+    "Requests refused by admission control (rate_limited, concurrency, pool_wait, event_loop_lag).",
+    ("route_class", "reason"),
+)
+ADMISSION_IN_FLIGHT = Gauge("admission_in_flight", "Admitted requests in progress per route class.", ("route_class",))
+STARTUP_PHASE_SECONDS = Gauge(
+    "startup_phase_seconds", "Duration of each startup phase (import, pool, caches, warmup).", ("phase",)
+)
+APP_READY = Gauge("app_ready", "1 once startup warm-up has finished in this process.")
+ROLLUP_DRIFT = Counter(
+    "rollup_drift_total", "Campaigns whose dashboard rollup disagreed with a recount and was corrected."
+)
+EVENT_STREAMS = Gauge("event_streams", "Open server-sent event streams in this process.")
+EVENT_LISTENER_UP = Gauge("event_listener_up", "1 while this process holds its LISTEN connection.")
+EVENTS_DELIVERED = Counter(
+    "events_delivered_total",
+    "Notifications fanned out to streams by outcome (delivered, overflow, unrouted).",
+    ("outcome",),
+)
+RESPONSE_BYTES = Histogram(
+    "http_response_bytes",
+    "Response body size of list endpoints by route template and field projection.",
+    ("route", "projection"),
+    buckets=(1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 500000),
+)
+PROJECTION_DURATION = Histogram(
+    "http_projection_duration_seconds",
+    "Latency of list endpoints by route template and field projection.",
+    ("route", "projection"),
+)
+JOBS_RUNNING = Gauge("jobs_running", "Jobs currently executing in this worker.", ("queue",))
+JOB_QUEUE_DEPTH = Gauge("job_queue_depth", "Queued jobs (due or scheduled) per queue.", ("queue",))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: list[str] | tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def _collect_local() -> dict[str, dict]:
+    return {
+        m.name: {
+            "kind": m.kind,
+            "help": m.documentation,
+            "labelnames": list(m.labelnames),
+            "buckets": list(getattr(m, "buckets", ())),
+            "values": m.snapshot(),
+        }
+        for m in REGISTRY
+    }
+
+
+def write_snapshot() -> None:
+    """Dump this process's samples for the multi-worker merge. No-op without METRICS_DIR."""
+    if not settings.metrics_dir:
+        return
+    os.makedirs(settings.metrics_dir, exist_ok=True)
+    path = os.path.join(settings.metrics_dir, f"{os.getpid()}.json")
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(_collect_local(), f)
+    os.replace(tmp, path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _collect_merged() -> dict[str, dict]:
+    write_snapshot()
+    merged: dict[str, dict] = {}
+    for filename in os.listdir(settings.metrics_dir):
+        if not filename.endswith(".json"):
+            continue
+        pid = int(filename[:-5])
+        try:
+            with open(os.path.join(settings.metrics_dir, filename)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        alive = _pid_alive(pid)
+        for name, metric in data.items():
+            target = merged.setdefault(name, {**metric, "values": {}})
+            for labels, value in metric["values"]:
+                if metric["kind"] == "gauge":
+                    # Gauges describe a live process; drop those of dead workers.
+                    if not alive:
+                        continue
+                    target["labelnames"] = metric["labelnames"] + ["pid"]
+                    target["values"][tuple(labels) + (str(pid),)] = value
+                elif metric["kind"] == "counter":
+                    key = tuple(labels)
+                    target["values"][key] = target["values"].get(key, 0.0) + value
+                else:
+                    key = tuple(labels)
+                    current = target["values"].get(key)
+                    target["values"][key] = value if current is None else [a + b for a, b in zip(current, value)]
+    for metric in merged.values():
+        metric["values"] = [[list(k), v] for k, v in metric["values"].items()]
+    return merged
+
+
+def render() -> str:
+    """Render all collectors in the Prometheus text exposition format."""
+    collected = _collect_merged() if settings.metrics_dir else _collect_local()
+    lines: list[str] = []
+    for name, metric in collected.items():
+        labelnames = tuple(metric["labelnames"])
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        for labels, value in metric["values"]:
+            if metric["kind"] != "histogram":
+                lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(list(metric["buckets"]) + [float("inf")], value[:-1]):
+                cumulative += count
+                bucket_labels = _format_labels(labelnames + ("le",), list(labels) + [_format_value(bound)])
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labelnames, labels)} {_format_value(value[-1])}")
+            lines.append(f"{name}_count{_format_labels(labelnames, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+async def monitor_event_loop() -> None:
+    """Sample event-loop lag and periodically flush the multi-worker snapshot."""
+    loop = asyncio.get_running_loop()
+    interval = settings.loop_lag_interval_seconds
+    last_flush = loop.time()
+    while True:
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - scheduled)
+        EVENT_LOOP_LAG.observe(lag)
+        EVENT_LOOP_LAG_LAST.set(lag)
+        if settings.metrics_dir and loop.time() - last_flush >= settings.metrics_flush_seconds:
+            last_flush = loop.time()
+            try:
+                write_snapshot()
+            except OSError as e:
+                logger.warning(f"Writing metrics snapshot failed: {e}")
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency by matched route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        body_bytes = 0
+        # Shared with request.state, where the fieldset dependency records the projection.
+        state = scope.setdefault("state", {})
+
+        async def send_wrapper(message):
+            nonlocal status_code, body_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_DURATION.observe(duration, scope["method"], route, str(status_code))
+            projection = state.get("projection")
+            if projection is not None and status_code == 200:
+                RESPONSE_BYTES.observe(body_bytes, route, projection)
+                PROJECTION_DURATION.observe(duration, route, projection)
@@ -2,6 +2,10 @@ from app.models.application import ApplicationStatus, CampaignApplication
 from app.models.brand import BrandProfile
 from app.models.campaign import Campaign, CampaignStatus, Platform
 from app.models.influencer import InfluencerProfile
+from app.models.job import Job, JobStatus
+from app.models.leaderboard import CategoryLeaderboard
+from app.models.rollup import CampaignRollup
+from app.models.saved import saved_influencers
 from app.models.user import Base, Role, User
 
 __all__ = [
@@ -15,4 +19,9 @@ __all__ = [
     "Platform",
     "CampaignApplication",
     "ApplicationStatus",
+    "CampaignRollup",
+    "CategoryLeaderboard",
+    "Job",
+    "JobStatus",
+    "saved_influencers",
 ]
@@ -5,7 +5,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Text, UniqueConstraint, func
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Text, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -20,7 +20,12 @@ class ApplicationStatus(str, enum.Enum):
 
 class CampaignApplication(Base):
     __tablename__ = "campaign_applications"
-    __table_args__ = (UniqueConstraint("campaign_id", "influencer_id"),)
+    __table_args__ = (
+        UniqueConstraint("campaign_id", "influencer_id"),
+        Index("ix_campaign_applications_inbox", "campaign_id", "status", "created_at", "id"),
+        Index("ix_campaign_applications_campaign_created", "campaign_id", "created_at", "id"),
+        Index("ix_campaign_applications_influencer_created", "influencer_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     campaign_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("campaigns.id"), nullable=False)
@@ -45,6 +45,7 @@ class Campaign(Base):
     start_date: Mapped[Optional[date]] = mapped_column(Date)
     end_date: Mapped[Optional[date]] = mapped_column(Date)
     max_influencers: Mapped[Optional[int]] = mapped_column(Integer)
+    accepted_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     brand = relationship("BrandProfile", back_populates="campaigns")
@@ -4,10 +4,11 @@ import uuid
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import Boolean, Float, ForeignKey, Integer, Numeric, String, Text
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DDL, Boolean, Float, ForeignKey, Index, Integer, Numeric, String, Text, event
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR, UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
+from app.locations import parse_location
 from app.models.user import Base
 
 
@@ -34,7 +35,47 @@ class InfluencerProfile(Base):
     fake_follower_pct: Mapped[float] = mapped_column(Float, default=0.0)
     price_per_post: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2))
     location: Mapped[Optional[str]] = mapped_column(String(100))
+    # Parsed from location whenever it is set through the ORM.
+    location_city: Mapped[Optional[str]] = mapped_column(String(100), index=True)
+    location_country: Mapped[Optional[str]] = mapped_column(String(2), index=True)
     is_verified: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Maintained by the influencer_profiles_search_vector trigger below.
+    search_vector: Mapped[Optional[str]] = mapped_column(TSVECTOR, deferred=True)
 
     user = relationship("User", back_populates="influencer_profile")
     applications = relationship("CampaignApplication", back_populates="influencer")
+
+    @validates("location")
+    def _parse_location(self, key, value):
+        self.location_city, self.location_country = parse_location(value)
+        return value
+
+    __table_args__ = (
+        Index("ix_influencer_profiles_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+
+# Weighted: display name (A) > handles (B) > bio (C). Names and handles use the
+# "simple" config so they are matched verbatim; the bio is stemmed as English.
+SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION influencer_profiles_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.display_name, '')), 'A') ||
+        setweight(to_tsvector('simple', concat_ws(' ', NEW.instagram_handle, NEW.tiktok_handle, NEW.youtube_handle)), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.bio, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SEARCH_VECTOR_TRIGGER = """
+CREATE TRIGGER influencer_profiles_search_vector
+BEFORE INSERT OR UPDATE OF display_name, bio, instagram_handle, tiktok_handle, youtube_handle
+ON influencer_profiles
+FOR EACH ROW EXECUTE FUNCTION influencer_profiles_search_vector()
+"""
+
+# asyncpg runs one statement per execute, hence two DDL hooks.
+event.listen(InfluencerProfile.__table__, "after_create", DDL(SEARCH_VECTOR_FUNCTION))
+event.listen(InfluencerProfile.__table__, "after_create", DDL(SEARCH_VECTOR_TRIGGER))
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, Index, Integer, Numeric, SmallInteger, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.campaign import CampaignStatus
+from app.models.user import Base
+
+
+class CampaignRollup(Base):
+    """Per-campaign application counts for the brand dashboard, split over shards.
+
+    Writers add to one random shard so concurrent applications to a hot campaign
+    don't queue on a single row; readers sum the shards. The campaign fields the
+    dashboard shows are copied onto shard 0 only.
+    """
+
+    __tablename__ = "campaign_rollups"
+
+    campaign_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True
+    )
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    brand_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    pending: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    accepted: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rejected: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    title: Mapped[Optional[str]] = mapped_column(String(200))
+    status: Mapped[Optional[CampaignStatus]] = mapped_column(Enum(CampaignStatus))
+    budget: Mapped[Optional[Decimal]] = mapped_column(Numeric(12, 2))
+    price_per_influencer: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2))
+    end_date: Mapped[Optional[date]] = mapped_column(Date)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (Index("ix_campaign_rollups_brand_id", "brand_id"),)
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Table, func
+
+from app.models.user import Base
+
+saved_influencers = Table(
+    "saved_influencers",
+    Base.metadata,
+    Column("brand_id", ForeignKey("brand_profiles.id"), primary_key=True),
+    Column("influencer_id", ForeignKey("influencer_profiles.id"), primary_key=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Index("ix_saved_influencers_brand_created", "brand_id", "created_at", "influencer_id"),
+)
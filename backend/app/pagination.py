@@ -0,0 +1,32 @@
+"""Opaque keyset-pagination cursors."""
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, Callable
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[Any], Any]) -> list:
+    """Inverse of encode_cursor; raises ValueError on anything malformed.
+
+    With ``parsers``, the cursor must hold exactly one value per parser and
+    each value is converted by its parser, e.g. ``datetime.fromisoformat``.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or (parsers and len(values) != len(parsers)):
+        raise ValueError("Invalid cursor")
+    if not parsers:
+        return values
+    try:
+        return [parse(value) for parse, value in zip(parsers, values)]
+    except (AttributeError, TypeError, ValueError) as e:
+        # Tampered cursors can carry any JSON type, which parsers reject in different ways.
+        raise ValueError("Invalid cursor") from e
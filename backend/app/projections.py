@@ -0,0 +1,95 @@
+"""Sparse fieldsets for list endpoints.
+
+``fields=card`` (what the mobile list cards render), ``fields=full`` (the
+default) or any comma-separated mix of projection and field names. The SQL
+loads only the requested columns, and items are validated into a model
+holding only the requested fields, built once per fieldset. Partial responses
+bypass the route's response model, which would reject those items.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+from fastapi import Response
+from pydantic import BaseModel, create_model
+from sqlalchemy.orm import load_only
+
+INFLUENCER_PROJECTIONS = {
+    "card": (
+        "id", "display_name", "avatar_url", "is_verified", "location", "follower_count",
+        "engagement_rate", "authenticity_score", "categories", "price_per_post", "is_saved",
+    ),
+}
+CAMPAIGN_PROJECTIONS = {
+    "card": (
+        "id", "title", "brand_name", "status", "platform", "description", "budget", "category",
+        "application_count",
+    ),
+}
+
+
+class Fieldset(NamedTuple):
+    # full, card or custom; labels the payload metrics.
+    name: str
+    # In model order; None means every field.
+    fields: tuple[str, ...] | None
+
+    def wants(self, field: str) -> bool:
+        return self.fields is None or field in self.fields
+
+
+FULL = Fieldset("full", None)
+
+
+def parse_fields(spec: str | None, model: type[BaseModel], projections: dict[str, tuple[str, ...]]) -> Fieldset:
+    """Raises ValueError on an unknown projection or field name."""
+    tokens = [token.strip() for token in (spec or "").split(",") if token.strip()]
+    if not tokens or "full" in tokens:
+        return FULL
+    wanted = {"id"}
+    for token in tokens:
+        if token in projections:
+            wanted.update(projections[token])
+        elif token in model.model_fields:
+            wanted.add(token)
+        else:
+            raise ValueError(f"Unknown field: {token}")
+    if wanted >= model.model_fields.keys():
+        return FULL
+    name = tokens[0] if len(tokens) == 1 and tokens[0] in projections else "custom"
+    return Fieldset(name, tuple(field for field in model.model_fields if field in wanted))
+
+
+def load_options(entity, fieldset: Fieldset) -> list:
+    """ORM options loading only the entity columns a fieldset asks for (plus the key)."""
+    if fieldset.fields is None:
+        return []
+    columns = entity.__table__.c
+    return [load_only(*(getattr(entity, field) for field in fieldset.fields if field in columns))]
+
+
+@lru_cache(maxsize=256)
+def _projection_model(model: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    return create_model(
+        f"{model.__name__}Projection",
+        __config__=model.model_config,
+        **{field: (model.model_fields[field].annotation, model.model_fields[field]) for field in fields},
+    )
+
+
+def serialize(model: type[BaseModel], source: Any, fieldset: Fieldset) -> BaseModel:
+    """``source`` (an ORM object or a dict) as ``model``, or as its projection
+    onto the fieldset, which reads only the requested attributes."""
+    if fieldset.fields is not None:
+        model = _projection_model(model, fieldset.fields)
+    return model.model_validate(source)
+
+
+def respond(model: type[BaseModel], fieldset: Fieldset, **values) -> BaseModel | Response:
+    """The list envelope ``model``; with a partial fieldset already rendered,
+    serializing the projected items as their own type."""
+    if fieldset.fields is None:
+        return model(**values)
+    payload = model.model_construct(**values).model_dump_json(serialize_as_any=True)
+    return Response(payload, media_type="application/json")
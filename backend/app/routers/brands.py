@@ -1,30 +1,27 @@
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import delete, select
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import require_role
-from app.models import BrandProfile, InfluencerProfile, Role, User
-from app.schemas.brand import BrandProfileResponse, BrandProfileUpdate
-from app.schemas.influencer import InfluencerProfileResponse
+from app.dependencies import influencer_fields, require_role
+from app.models import BrandProfile, Role, User
+from app.projections import Fieldset, respond, serialize
+from app.schemas.brand import BrandDashboardResponse, BrandProfileResponse, BrandProfileUpdate
+from app.schemas.influencer import InfluencerProfileResponse, SavedBulkRequest, SavedInfluencerPage
+from app.services.brand_service import get_brand_id
+from app.services.rollup_service import dashboard
+from app.services.saved_service import (
+    get_saved_ids,
+    list_saved,
+    save_influencers,
+    unsave_influencers,
+)
 
 router = APIRouter(prefix="/api/v1/brands", tags=["brands"])
 
-# Saved influencers association table - using raw SQL for simplicity
-from sqlalchemy import Column, DateTime, ForeignKey, Table, func
-from app.models.user import Base
-
-saved_influencers = Table(
-    "saved_influencers",
-    Base.metadata,
-    Column("brand_id", ForeignKey("brand_profiles.id"), primary_key=True),
-    Column("influencer_id", ForeignKey("influencer_profiles.id"), primary_key=True),
-    Column("created_at", DateTime(timezone=True), server_default=func.now()),
-)
-
 
 async def _get_brand_profile(db: AsyncSession, user_id: uuid.UUID) -> BrandProfile:
     result = await db.execute(select(BrandProfile).where(BrandProfile.user_id == user_id))
@@ -57,19 +54,66 @@ async def update_my_profile(
     return BrandProfileResponse.model_validate(brand)
 
 
-@router.get("/me/saved", response_model=list[InfluencerProfileResponse])
+async def _require_brand_id(db: AsyncSession, user_id: uuid.UUID) -> uuid.UUID:
+    brand_id = await get_brand_id(db, user_id)
+    if brand_id is None:
+        raise HTTPException(status_code=404, detail="Brand profile not found")
+    return brand_id
+
+
+@router.get("/me/dashboard", response_model=BrandDashboardResponse)
+async def get_dashboard(
+    user: Annotated[User, Depends(require_role(Role.brand))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    brand_id = await _require_brand_id(db, user.id)
+    return BrandDashboardResponse(**await dashboard(db, brand_id))
+
+
+@router.get("/me/saved", response_model=SavedInfluencerPage)
 async def get_saved(
     user: Annotated[User, Depends(require_role(Role.brand))],
     db: Annotated[AsyncSession, Depends(get_db)],
+    fields: Annotated[Fieldset, Depends(influencer_fields)],
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
 ):
-    brand = await _get_brand_profile(db, user.id)
-    result = await db.execute(
-        select(InfluencerProfile)
-        .join(saved_influencers, saved_influencers.c.influencer_id == InfluencerProfile.id)
-        .where(saved_influencers.c.brand_id == brand.id)
+    brand_id = await _require_brand_id(db, user.id)
+    try:
+        influencers, next_cursor = await list_saved(db, brand_id, cursor, limit, fields)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    items = [serialize(InfluencerProfileResponse, i, fields) for i in influencers]
+    if fields.wants("is_saved"):
+        for item in items:
+            item.is_saved = True
+    return respond(
+        SavedInfluencerPage,
+        fields,
+        items=items,
+        next_cursor=next_cursor,
+        total=len(await get_saved_ids(db, brand_id)),
     )
-    influencers = result.scalars().all()
-    return [InfluencerProfileResponse.model_validate(i) for i in influencers]
+
+
+@router.post("/me/saved/bulk", status_code=status.HTTP_201_CREATED)
+async def save_many(
+    body: SavedBulkRequest,
+    user: Annotated[User, Depends(require_role(Role.brand))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    brand_id = await _require_brand_id(db, user.id)
+    return {"saved": await save_influencers(db, brand_id, body.influencer_ids)}
+
+
+@router.delete("/me/saved/bulk")
+async def unsave_many(
+    body: SavedBulkRequest,
+    user: Annotated[User, Depends(require_role(Role.brand))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    brand_id = await _require_brand_id(db, user.id)
+    return {"removed": await unsave_influencers(db, brand_id, body.influencer_ids)}
 
 
 @router.post("/me/saved/{influencer_id}", status_code=status.HTTP_201_CREATED)
@@ -78,17 +122,12 @@ async def save_influencer(
     user: Annotated[User, Depends(require_role(Role.brand))],
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    brand = await _get_brand_profile(db, user.id)
-    existing = await db.execute(
-        select(saved_influencers).where(
-            saved_influencers.c.brand_id == brand.id,
-            saved_influencers.c.influencer_id == influencer_id,
-        )
-    )
-    if existing.first():
+    brand_id = await _require_brand_id(db, user.id)
+    if await save_influencers(db, brand_id, [influencer_id]):
+        return {"detail": "Saved"}
+    if influencer_id in await get_saved_ids(db, brand_id):
         return {"detail": "Already saved"}
-    await db.execute(saved_influencers.insert().values(brand_id=brand.id, influencer_id=influencer_id))
-    return {"detail": "Saved"}
+    raise HTTPException(status_code=404, detail="Influencer not found")
 
 
 @router.delete("/me/saved/{influencer_id}")
@@ -97,11 +136,6 @@ async def unsave_influencer(
     user: Annotated[User, Depends(require_role(Role.brand))],
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    brand = await _get_brand_profile(db, user.id)
-    await db.execute(
-        delete(saved_influencers).where(
-            saved_influencers.c.brand_id == brand.id,
-            saved_influencers.c.influencer_id == influencer_id,
-        )
-    )
+    brand_id = await _require_brand_id(db, user.id)
+    await unsave_influencers(db, brand_id, [influencer_id])
     return {"detail": "Removed"}
@@ -4,41 +4,51 @@ import uuid
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_current_user, require_role
-from app.models import BrandProfile, Role, User
+from app.dependencies import batch_ids, campaign_fields, get_current_user, require_role
+from app.models import ApplicationStatus, Platform, Role, User
+from app.projections import Fieldset, respond, serialize
 from app.schemas.campaign import (
+    ApplicationBulkStatusResponse,
+    ApplicationBulkStatusUpdate,
     ApplicationCreate,
+    ApplicationPage,
     ApplicationResponse,
     ApplicationStatusUpdate,
+    CampaignBatchResponse,
     CampaignCreate,
+    CampaignEstimateRequest,
+    CampaignEstimateResponse,
     CampaignListResponse,
     CampaignResponse,
     CampaignUpdate,
 )
 from app.services.campaign_service import (
     apply_to_campaign,
+    bulk_update_application_status,
     create_campaign,
     get_campaign,
+    get_campaigns_by_ids,
     list_applications,
     list_campaigns,
     update_application_status,
     update_campaign,
 )
+from app.services.brand_service import get_brand_id
+from app.services.estimate_service import estimate_reach
 from app.services.influencer_service import get_influencer_by_user
+from app.services.matching_service import campaign_changed
 
 router = APIRouter(prefix="/api/v1/campaigns", tags=["campaigns"])
 
 
 async def _get_brand_id(db: AsyncSession, user_id: uuid.UUID) -> uuid.UUID:
-    result = await db.execute(select(BrandProfile).where(BrandProfile.user_id == user_id))
-    brand = result.scalar_one_or_none()
-    if not brand:
+    brand_id = await get_brand_id(db, user_id)
+    if not brand_id:
         raise HTTPException(status_code=404, detail="Brand profile not found")
-    return brand.id
+    return brand_id
 
 
 @router.post("/", response_model=CampaignResponse, status_code=status.HTTP_201_CREATED)
@@ -49,6 +59,7 @@ async def create(
 ):
     brand_id = await _get_brand_id(db, user.id)
     campaign = await create_campaign(db, brand_id, body.model_dump())
+    campaign_changed(campaign)
     result = await get_campaign(db, campaign.id)
     return CampaignResponse(**result)
 
@@ -56,15 +67,20 @@ async def create(
 @router.get("/", response_model=CampaignListResponse)
 async def list_all(
     db: Annotated[AsyncSession, Depends(get_db)],
+    fields: Annotated[Fieldset, Depends(campaign_fields)],
     category: str | None = None,
     platform: str | None = None,
     status_filter: str | None = Query(None, alias="status"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
 ):
-    items, total = await list_campaigns(db, category=category, platform=platform, status=status_filter, page=page, limit=limit)
-    return CampaignListResponse(
-        items=[CampaignResponse(**c) for c in items],
+    items, total = await list_campaigns(
+        db, category=category, platform=platform, status=status_filter, page=page, limit=limit, fields=fields
+    )
+    return respond(
+        CampaignListResponse,
+        fields,
+        items=[serialize(CampaignResponse, c, fields) for c in items],
         total=total,
         page=page,
         limit=limit,
@@ -75,19 +91,48 @@ async def list_all(
 async def list_mine(
     user: Annotated[User, Depends(require_role(Role.brand))],
     db: Annotated[AsyncSession, Depends(get_db)],
+    fields: Annotated[Fieldset, Depends(campaign_fields)],
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
 ):
     brand_id = await _get_brand_id(db, user.id)
-    items, total = await list_campaigns(db, brand_id=brand_id, status=None, page=page, limit=limit)
-    return CampaignListResponse(
-        items=[CampaignResponse(**c) for c in items],
+    items, total = await list_campaigns(db, brand_id=brand_id, status=None, page=page, limit=limit, fields=fields)
+    return respond(
+        CampaignListResponse,
+        fields,
+        items=[serialize(CampaignResponse, c, fields) for c in items],
         total=total,
         page=page,
         limit=limit,
     )
 
 
+@router.get("/batch", response_model=CampaignBatchResponse)
+async def get_batch(
+    ids: Annotated[list[uuid.UUID], Depends(batch_ids)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    items, missing = await get_campaigns_by_ids(db, ids)
+    return CampaignBatchResponse(items=[CampaignResponse(**c) for c in items], missing=missing)
+
+
+@router.post("/estimate", response_model=CampaignEstimateResponse)
+async def estimate(
+    body: CampaignEstimateRequest,
+    user: Annotated[User, Depends(require_role(Role.brand))],
+):
+    if body.platform not in Platform.__members__:
+        raise HTTPException(status_code=422, detail=f"Unknown platform: {body.platform}")
+    result = await estimate_reach(
+        category=body.category,
+        platform=body.platform,
+        min_followers=body.min_followers,
+        min_engagement=body.min_engagement_rate,
+        min_authenticity=body.min_authenticity,
+    )
+    return CampaignEstimateResponse(**result)
+
+
 @router.get("/{campaign_id}", response_model=CampaignResponse)
 async def get_detail(
     campaign_id: uuid.UUID,
@@ -110,6 +155,7 @@ async def update(
     campaign = await update_campaign(db, campaign_id, brand_id, body.model_dump(exclude_unset=True))
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found or not owned by you")
+    campaign_changed(campaign)
     result = await get_campaign(db, campaign.id)
     return CampaignResponse(**result)
 
@@ -126,6 +172,8 @@ async def apply(
         raise HTTPException(status_code=404, detail="Influencer profile not found")
     try:
         application = await apply_to_campaign(db, campaign_id, profile.id, body.pitch)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
     return ApplicationResponse(
@@ -138,18 +186,51 @@ async def apply(
     )
 
 
-@router.get("/{campaign_id}/applications", response_model=list[ApplicationResponse])
+@router.get("/{campaign_id}/applications", response_model=ApplicationPage)
 async def get_applications(
     campaign_id: uuid.UUID,
     user: Annotated[User, Depends(require_role(Role.brand))],
     db: Annotated[AsyncSession, Depends(get_db)],
+    status: ApplicationStatus | None = None,
+    sort_by: str = Query("created_at", pattern="^(created_at|follower_count|engagement_rate|authenticity_score)$"),
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
 ):
     brand_id = await _get_brand_id(db, user.id)
     try:
-        apps = await list_applications(db, campaign_id, brand_id)
+        page = await list_applications(db, campaign_id, brand_id, status, sort_by, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page is None:
+        raise HTTPException(status_code=404, detail="Campaign not found or not owned by you")
+    return ApplicationPage(**page)
+
+
+@router.put("/{campaign_id}/applications", response_model=ApplicationBulkStatusResponse)
+async def bulk_update_app_status(
+    campaign_id: uuid.UUID,
+    body: ApplicationBulkStatusUpdate,
+    user: Annotated[User, Depends(require_role(Role.brand))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    if body.application_ids is None and body.filter_status is None:
+        raise HTTPException(status_code=422, detail="Provide application_ids or filter_status")
+    brand_id = await _get_brand_id(db, user.id)
+    try:
+        result = await bulk_update_application_status(
+            db,
+            campaign_id,
+            brand_id,
+            body.status,
+            body.application_ids,
+            body.filter_status,
+            body.auto_reject_remaining,
+        )
     except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    return [ApplicationResponse(**a) for a in apps]
+        raise HTTPException(status_code=422, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Campaign not found or not owned by you")
+    return ApplicationBulkStatusResponse(**result)
 
 
 @router.put("/{campaign_id}/applications/{application_id}", response_model=ApplicationResponse)
@@ -161,7 +242,10 @@ async def update_app_status(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     brand_id = await _get_brand_id(db, user.id)
-    application = await update_application_status(db, campaign_id, application_id, brand_id, body.status)
+    try:
+        application = await update_application_status(db, campaign_id, application_id, brand_id, body.status)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
     return ApplicationResponse(
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from typing import Annotated, AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app import events
+from app.config import settings
+from app.dependencies import get_token_payload
+
+router = APIRouter(prefix="/api/v1", tags=["events"])
+
+
+class _EventStreamResponse(StreamingResponse):
+    """Releases the subscription however the response ends, including when
+    the client is gone before the body iterator ever starts."""
+
+    def __init__(self, subscription: events.Subscription, expires_at: float | None):
+        super().__init__(
+            _event_stream(subscription, expires_at),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        self.subscription = subscription
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            events.unsubscribe(self.subscription)
+
+
+async def _event_stream(subscription: events.Subscription, expires_at: float | None) -> AsyncIterator[str]:
+    yield f"retry: {settings.events_retry_ms}\n\n"
+    while True:
+        timeout = settings.events_heartbeat_seconds
+        if expires_at is not None:
+            # End with the token; the client reconnects with a fresh one.
+            timeout = min(timeout, expires_at - time.time())
+            if timeout <= 0:
+                return
+        try:
+            event = await asyncio.wait_for(subscription.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+        if event is None:
+            return
+        yield f"event: {event[0]}\ndata: {event[1]}\n\n"
+
+
+@router.get("/events")
+async def stream_events(payload: Annotated[dict | None, Depends(get_token_payload)]):
+    """Server-sent application events for the caller: ``application.created``
+    (brands), ``application.status_changed`` (influencers) and ``resync``."""
+    if payload is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    subscription = events.subscribe(payload["sub"])
+    if subscription is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many event streams",
+            headers={"Retry-After": str(math.ceil(settings.events_retry_ms / 1000))},
+        )
+    return _EventStreamResponse(subscription, payload.get("exp"))
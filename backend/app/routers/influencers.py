@@ -1,44 +1,253 @@
 from __future__ import annotations
 
+import csv
+import io
+import json
 import uuid
-from typing import Annotated
+from typing import Annotated, AsyncIterator, Sequence
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_current_user, require_role
-from app.models import Role, User
-from app.schemas.influencer import InfluencerListResponse, InfluencerProfileResponse, InfluencerProfileUpdate
-from app.services.influencer_service import get_influencer, get_influencer_by_user, list_influencers, update_influencer
+from app.dependencies import (
+    admit,
+    batch_ids,
+    get_current_user,
+    get_token_payload,
+    influencer_fields,
+    require_admin_key,
+    require_role,
+)
+from app.models import ApplicationStatus, Role, User
+from app.projections import Fieldset, respond, serialize
+from app.schemas.campaign import ApplicationPage, CampaignResponse
+from app.schemas.influencer import (
+    InfluencerBatchResponse,
+    InfluencerImportResponse,
+    InfluencerListResponse,
+    InfluencerProfileResponse,
+    InfluencerProfileUpdate,
+    InfluencerSuggestion,
+    LeaderboardEntry,
+    LeaderboardResponse,
+)
+from app.services.campaign_service import get_influencer_applications
+from app.services.influencer_service import (
+    facet_counts,
+    get_influencer,
+    get_influencer_by_user,
+    get_influencers_by_ids,
+    import_influencers,
+    list_influencers,
+    stream_influencers,
+    update_influencer,
+)
+from app.services.leaderboard_service import METRICS, leaderboard, profile_edited
+from app.services.matching_service import matching_campaigns
+from app.services.saved_service import mark_saved, saved_ids_for_token
+from app.services.suggest_service import profile_changed, suggest
 
 router = APIRouter(prefix="/api/v1/influencers", tags=["influencers"])
 
 
-@router.get("/", response_model=InfluencerListResponse)
+def _countries(country: str | None) -> list[str] | None:
+    codes = [part.strip() for part in (country or "").split(",") if part.strip()]
+    return codes or None
+
+
+@router.get("/", response_model=InfluencerListResponse, dependencies=[Depends(admit("search"))])
 async def list_all(
     db: Annotated[AsyncSession, Depends(get_db)],
+    token: Annotated[dict | None, Depends(get_token_payload)],
+    fields: Annotated[Fieldset, Depends(influencer_fields)],
     category: str | None = None,
     min_followers: int | None = None,
     max_followers: int | None = None,
     min_engagement: float | None = None,
     location: str | None = None,
+    country: str | None = Query(None, description="Comma-separated ISO country codes or names"),
     platform: str | None = None,
-    sort_by: str = "follower_count",
+    q: str | None = Query(None, min_length=1, max_length=200),
+    sort_by: str | None = None,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    facets: bool = False,
 ):
     items, total = await list_influencers(
-        db, category, min_followers, max_followers, min_engagement, location, platform, sort_by, page, limit
+        db, category, min_followers, max_followers, min_engagement, location, platform, sort_by, page, limit,
+        q=q, country=_countries(country), fields=fields,
     )
-    return InfluencerListResponse(
-        items=[InfluencerProfileResponse.model_validate(i) for i in items],
+    facet_result = None
+    if facets:
+        facet_result = await facet_counts(
+            db,
+            category=category,
+            min_followers=min_followers,
+            max_followers=max_followers,
+            min_engagement=min_engagement,
+            location=location,
+            platform=platform,
+            q=q,
+            country=_countries(country),
+        )
+    saved_ids = await saved_ids_for_token(db, token) if fields.wants("is_saved") else None
+    return respond(
+        InfluencerListResponse,
+        fields,
+        items=mark_saved([serialize(InfluencerProfileResponse, i, fields) for i in items], saved_ids),
         total=total,
         page=page,
         limit=limit,
+        facets=facet_result,
+    )
+
+
+@router.get("/batch", response_model=InfluencerBatchResponse)
+async def get_batch(
+    ids: Annotated[list[uuid.UUID], Depends(batch_ids)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    items, missing = await get_influencers_by_ids(db, ids)
+    return InfluencerBatchResponse(
+        items=[InfluencerProfileResponse.model_validate(i) for i in items],
+        missing=missing,
     )
 
 
+@router.get("/suggest", response_model=list[InfluencerSuggestion])
+async def suggest_influencers(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+):
+    return [InfluencerSuggestion(**s) for s in await suggest(prefix, limit)]
+
+
+@router.get("/leaderboards/{category}", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    category: str,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    token: Annotated[dict | None, Depends(get_token_payload)],
+    metric: str = Query("composite", pattern=f"^({'|'.join(METRICS)})$"),
+    limit: int = Query(10, ge=1, le=100),
+):
+    refreshed_at, entries = await leaderboard(db, category, metric, limit)
+    # Cached profiles are shared between requests; is_saved goes on copies.
+    profiles = mark_saved([profile.model_copy() for _, _, profile in entries], await saved_ids_for_token(db, token))
+    return LeaderboardResponse(
+        category=category,
+        metric=metric,
+        refreshed_at=refreshed_at,
+        items=[
+            LeaderboardEntry(rank=rank, score=score, influencer=profile)
+            for (rank, score, _), profile in zip(entries, profiles)
+        ],
+    )
+
+
+# is_saved is per-viewer, not a profile column.
+EXPORT_COLUMNS = [f for f in InfluencerProfileResponse.model_fields if f != "is_saved"]
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return ";".join(value)
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return value
+
+
+async def _csv_chunks(partitions: AsyncIterator[Sequence[Row]]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    async for rows in partitions:
+        writer.writerows([_csv_value(v) for v in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+async def _ndjson_chunks(partitions: AsyncIterator[Sequence[Row]]) -> AsyncIterator[str]:
+    async for rows in partitions:
+        yield "".join(json.dumps(row._asdict(), default=str) + "\n" for row in rows)
+
+
+@router.get("/export", dependencies=[Depends(admit("export"))])
+async def export(
+    user: Annotated[User, Depends(require_role(Role.brand))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    category: str | None = None,
+    min_followers: int | None = None,
+    max_followers: int | None = None,
+    min_engagement: float | None = None,
+    location: str | None = None,
+    country: str | None = Query(None, description="Comma-separated ISO country codes or names"),
+    platform: str | None = None,
+    q: str | None = Query(None, min_length=1, max_length=200),
+    sort_by: str | None = None,
+):
+    # Hand the auth lookup's connection back before the long-running stream starts.
+    await db.commit()
+    partitions = stream_influencers(
+        EXPORT_COLUMNS, category, min_followers, max_followers, min_engagement, location, platform, sort_by,
+        q=q, country=_countries(country),
+    )
+    if export_format == "ndjson":
+        return StreamingResponse(
+            _ndjson_chunks(partitions),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": 'attachment; filename="influencers.ndjson"'},
+        )
+    return StreamingResponse(
+        _csv_chunks(partitions),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="influencers.csv"'},
+    )
+
+
+def _csv_records(text: str):
+    for record in csv.DictReader(io.StringIO(text)):
+        record = {k: v for k, v in record.items() if k and v not in ("", None)}
+        if "categories" in record:
+            record["categories"] = [c.strip() for c in record["categories"].split(";") if c.strip()]
+        if "audience_gender_split" in record:
+            try:
+                record["audience_gender_split"] = json.loads(record["audience_gender_split"])
+            except ValueError:
+                pass
+        yield record
+
+
+def _ndjson_records(text: str):
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON: {e}")
+
+
+@router.post("/import", response_model=InfluencerImportResponse, dependencies=[Depends(require_admin_key)])
+async def bulk_import(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    import_format: str | None = Query(None, alias="format", pattern="^(csv|ndjson)$"),
+):
+    if import_format is None:
+        content_type = request.headers.get("content-type", "")
+        import_format = "ndjson" if "ndjson" in content_type or "json" in content_type else "csv"
+    text = (await request.body()).decode("utf-8-sig")
+    records = _ndjson_records(text) if import_format == "ndjson" else _csv_records(text)
+    result = await import_influencers(db, records)
+    return InfluencerImportResponse(**result)
+
+
 @router.get("/me", response_model=InfluencerProfileResponse)
 async def get_my_profile(
     user: Annotated[User, Depends(require_role(Role.influencer))],
@@ -59,20 +268,42 @@ async def update_my_profile(
     profile = await get_influencer_by_user(db, user.id)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
-    updated = await update_influencer(db, profile, body.model_dump(exclude_unset=True))
+    data = body.model_dump(exclude_unset=True)
+    old_categories = list(profile.categories or ())
+    updated = await update_influencer(db, profile, data)
+    await profile_edited(db, updated, {key for key, value in data.items() if value is not None}, old_categories)
+    profile_changed(updated)
     return InfluencerProfileResponse.model_validate(updated)
 
 
-@router.get("/me/applications")
+@router.get("/me/applications", response_model=ApplicationPage)
 async def my_applications(
     user: Annotated[User, Depends(require_role(Role.influencer))],
     db: Annotated[AsyncSession, Depends(get_db)],
+    status: ApplicationStatus | None = None,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+):
+    profile = await get_influencer_by_user(db, user.id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    try:
+        page = await get_influencer_applications(db, profile.id, status, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return ApplicationPage(**page)
+
+
+@router.get("/me/matching-campaigns", response_model=list[CampaignResponse])
+async def my_matching_campaigns(
+    user: Annotated[User, Depends(require_role(Role.influencer))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    limit: int = Query(50, ge=1, le=200),
 ):
     profile = await get_influencer_by_user(db, user.id)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
-    from app.services.campaign_service import get_influencer_applications
-    return await get_influencer_applications(db, profile.id)
+    return [CampaignResponse(**c) for c in await matching_campaigns(db, profile, limit)]
 
 
 @router.get("/{influencer_id}", response_model=InfluencerProfileResponse)
@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -5,40 +6,53 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
 
 from app.database import get_db
-from app.dependencies import get_current_user
+from app.dependencies import admit, get_current_user, influencer_fields
 from app.models import User
+from app.projections import Fieldset, respond, serialize
 from app.schemas.influencer import InfluencerProfileResponse
 from app.schemas.search import NaturalSearchRequest, NaturalSearchResponse, RecommendationResponse
+from app.services.saved_service import mark_saved, saved_ids_for_user
 from app.services.search_service import get_recommendations, natural_search
 
 router = APIRouter(prefix="/api/v1/search", tags=["search"])
 
 
-@router.post("/natural", response_model=NaturalSearchResponse)
+@router.post("/natural", response_model=NaturalSearchResponse, dependencies=[Depends(admit("ai"))])
 async def search_natural(
     body: NaturalSearchRequest,
     user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
+    fields: Annotated[Fieldset, Depends(influencer_fields)],
 ):
-    result = await natural_search(db, body.query)
-    return NaturalSearchResponse(
+    try:
+        result = await natural_search(body.query, body.facets, fields)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Search timed out")
+    saved_ids = await saved_ids_for_user(db, user.id, user.role.value) if fields.wants("is_saved") else None
+    return respond(
+        NaturalSearchResponse,
+        fields,
         query=result["query"],
         interpreted_filters=result["interpreted_filters"],
-        results=[InfluencerProfileResponse.model_validate(i) for i in result["results"]],
+        results=mark_saved([serialize(InfluencerProfileResponse, i, fields) for i in result["results"]], saved_ids),
         total=result["total"],
+        facets=result["facets"],
     )
 
 
-@router.get("/recommendations/{campaign_id}", response_model=RecommendationResponse)
+@router.get(
+    "/recommendations/{campaign_id}", response_model=RecommendationResponse, dependencies=[Depends(admit("ai"))]
+)
 async def recommendations(
     campaign_id: uuid.UUID,
     user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
 ):
     try:
-        result = await get_recommendations(db, campaign_id)
+        result = await get_recommendations(campaign_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Recommendations timed out")
     return RecommendationResponse(
         campaign_id=result["campaign_id"],
         recommendations=[InfluencerProfileResponse.model_validate(i) for i in result["recommendations"]],
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import uuid
+from datetime import date
+from decimal import Decimal
 
 from pydantic import BaseModel
 
@@ -23,3 +25,26 @@ class BrandProfileUpdate(BaseModel):
     industry: str | None = None
     website: str | None = None
     description: str | None = None
+
+
+class DashboardCampaign(BaseModel):
+    campaign_id: uuid.UUID
+    title: str | None = None
+    status: str | None = None
+    applications: dict[str, int]
+    total_applications: int
+    acceptance_rate: float | None = None
+    budget: Decimal | None = None
+    price_per_influencer: Decimal | None = None
+    committed_spend: Decimal | None = None
+    budget_remaining: Decimal | None = None
+    end_date: date | None = None
+    days_remaining: int | None = None
+
+
+class BrandDashboardResponse(BaseModel):
+    campaigns: list[DashboardCampaign]
+    applications: dict[str, int]
+    acceptance_rate: float | None = None
+    committed_spend: Decimal
+    budget: Decimal
@@ -4,7 +4,7 @@ import uuid
 from datetime import date, datetime
 from decimal import Decimal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class CampaignCreate(BaseModel):
@@ -55,6 +55,7 @@ class CampaignResponse(BaseModel):
     start_date: date | None = None
     end_date: date | None = None
     max_influencers: int | None = None
+    accepted_count: int = 0
     created_at: datetime
     brand_name: str | None = None
     application_count: int | None = None
@@ -69,6 +70,30 @@ class CampaignListResponse(BaseModel):
     limit: int
 
 
+class CampaignBatchResponse(BaseModel):
+    items: list[CampaignResponse]
+    missing: list[uuid.UUID]
+
+
+class CampaignEstimateRequest(BaseModel):
+    category: str | None = None
+    min_followers: int | None = Field(None, ge=0)
+    min_engagement_rate: float | None = Field(None, ge=0)
+    min_authenticity: float | None = Field(None, ge=0, le=100)
+    platform: str = "any"
+
+
+class CampaignEstimateResponse(BaseModel):
+    influencer_count: int
+    total_reach: int
+    priced_influencers: int
+    price_p10: Decimal | None = None
+    price_p50: Decimal | None = None
+    price_p90: Decimal | None = None
+    approximate: bool
+    built_at: datetime
+
+
 class ApplicationCreate(BaseModel):
     pitch: str | None = None
 
@@ -82,10 +107,34 @@ class ApplicationResponse(BaseModel):
     created_at: datetime
     influencer_name: str | None = None
     influencer_avatar: str | None = None
+    influencer_follower_count: int | None = None
+    influencer_engagement_rate: float | None = None
+    influencer_authenticity_score: float | None = None
     campaign_title: str | None = None
 
     model_config = {"from_attributes": True}
 
 
+class ApplicationPage(BaseModel):
+    items: list[ApplicationResponse]
+    next_cursor: str | None = None
+    totals: dict[str, int]
+
+
 class ApplicationStatusUpdate(BaseModel):
     status: str
+
+
+class ApplicationBulkStatusUpdate(BaseModel):
+    status: str
+    application_ids: list[uuid.UUID] | None = Field(None, max_length=1000)
+    filter_status: str | None = None
+    auto_reject_remaining: bool = False
+
+
+class ApplicationBulkStatusResponse(BaseModel):
+    updated: int
+    skipped_over_capacity: int
+    auto_rejected: int
+    accepted_count: int
+    max_influencers: int | None = None
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class InfluencerProfileResponse(BaseModel):
@@ -27,7 +28,10 @@ class InfluencerProfileResponse(BaseModel):
     fake_follower_pct: float = 0.0
     price_per_post: Decimal | None = None
     location: str | None = None
+    location_city: str | None = None
+    location_country: str | None = None
     is_verified: bool = False
+    is_saved: bool | None = None
 
     model_config = {"from_attributes": True}
 
@@ -51,8 +55,77 @@ class InfluencerProfileUpdate(BaseModel):
     location: str | None = None
 
 
+class InfluencerImportRow(BaseModel):
+    email: str
+    display_name: str
+    bio: str | None = None
+    avatar_url: str | None = None
+    categories: list[str] | None = None
+    instagram_handle: str | None = None
+    tiktok_handle: str | None = None
+    youtube_handle: str | None = None
+    follower_count: int = 0
+    engagement_rate: float = 0.0
+    avg_likes: int = 0
+    avg_comments: int = 0
+    audience_top_country: str | None = None
+    audience_age_range: str | None = None
+    audience_gender_split: dict | None = None
+    price_per_post: Decimal | None = None
+    location: str | None = None
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class InfluencerImportResponse(BaseModel):
+    received: int
+    upserted: int
+    created_users: int
+    errors: list[ImportRowError]
+
+
 class InfluencerListResponse(BaseModel):
     items: list[InfluencerProfileResponse]
     total: int
     page: int
     limit: int
+    facets: dict[str, dict[str, int]] | None = None
+
+
+class InfluencerSuggestion(BaseModel):
+    id: uuid.UUID
+    display_name: str
+    matched_handle: str | None = None
+    avatar_url: str | None = None
+    follower_count: int
+
+
+class InfluencerBatchResponse(BaseModel):
+    items: list[InfluencerProfileResponse]
+    missing: list[uuid.UUID]
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    score: float
+    influencer: InfluencerProfileResponse
+
+
+class LeaderboardResponse(BaseModel):
+    category: str
+    metric: str
+    refreshed_at: datetime | None = None
+    items: list[LeaderboardEntry]
+
+
+class SavedInfluencerPage(BaseModel):
+    items: list[InfluencerProfileResponse]
+    next_cursor: str | None = None
+    total: int
+
+
+class SavedBulkRequest(BaseModel):
+    influencer_ids: list[uuid.UUID] = Field(min_length=1, max_length=500)
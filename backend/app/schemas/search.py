@@ -7,6 +7,7 @@ from app.schemas.influencer import InfluencerProfileResponse
 
 class NaturalSearchRequest(BaseModel):
     query: str
+    facets: bool = False
 
 
 class NaturalSearchResponse(BaseModel):
@@ -14,6 +15,7 @@ class NaturalSearchResponse(BaseModel):
     interpreted_filters: dict
     results: list[InfluencerProfileResponse]
     total: int
+    facets: dict[str, dict[str, int]] | None = None
 
 
 class RecommendationResponse(BaseModel):
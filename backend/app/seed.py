@@ -16,7 +16,9 @@ from app.models import (
     Platform,
     Role,
     User,
+    saved_influencers,
 )
+from app.services import leaderboard_service, rollup_service
 from app.services.auth_service import hash_password
 from app.services.fraud_service import calculate_authenticity_score
 
@@ -139,12 +141,9 @@ def _random_engagement(followers):
 
 
 async def seed():
-    from app.routers.brands import saved_influencers
-
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
-        await conn.run_sync(saved_influencers.create, checkfirst=True)
 
     async with async_session_factory() as session:
         influencer_profiles = []
@@ -231,6 +230,7 @@ async def seed():
                 start_date=start,
                 end_date=start + timedelta(days=random.randint(14, 60)),
                 max_influencers=random.randint(3, 10),
+                accepted_count=0,
             )
             session.add(campaign)
             await session.flush()
@@ -246,6 +246,11 @@ async def seed():
                     status=random.choice([ApplicationStatus.pending, ApplicationStatus.pending, ApplicationStatus.accepted, ApplicationStatus.rejected]),
                     pitch=f"Hi! I'd love to be part of your {campaign.title} campaign. I have {inf.follower_count:,} followers and a {inf.engagement_rate*100:.1f}% engagement rate.",
                 )
+                if app.status == ApplicationStatus.accepted:
+                    if campaign.accepted_count >= campaign.max_influencers:
+                        app.status = ApplicationStatus.pending
+                    else:
+                        campaign.accepted_count += 1
                 session.add(app)
 
         for brand in brand_profiles:
@@ -255,6 +260,9 @@ async def seed():
                     saved_influencers.insert().values(brand_id=brand.id, influencer_id=inf.id)
                 )
 
+        await session.flush()
+        await rollup_service.reconcile(session, [c.id for c in campaigns])
+        await leaderboard_service.refresh(session)
         await session.commit()
 
     print(f"Seeded {len(INFLUENCER_DATA)} influencers, {len(BRAND_DATA)} brands, {len(CAMPAIGN_DATA)} campaigns")
@@ -2,23 +2,44 @@ from __future__ import annotations
 
 import json
 import logging
+import re
+import time
 
+from app import metrics
 from app.config import settings
+from app.locations import CITY_COUNTRIES, COUNTRY_ALIASES
+from app.tracing import set_attributes, traced
 
 logger = logging.getLogger(__name__)
 
 
+@traced
 async def interpret_search_query(query: str) -> dict:
     """Use AI to interpret a natural language search into structured filters."""
     if settings.openai_api_key:
         try:
-            return await _openai_interpret(query)
+            return await _timed_openai_call("interpret", _openai_interpret(query))
         except Exception as e:
             logger.warning(f"OpenAI call failed, using mock: {e}")
+            metrics.AI_FALLBACKS.inc("interpret", "error")
+    else:
+        metrics.AI_FALLBACKS.inc("interpret", "no_api_key")
 
-    return _mock_interpret(query)
+    return mock_interpret(query)
 
 
+async def _timed_openai_call(operation: str, call):
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        result = await call
+        outcome = "ok"
+        return result
+    finally:
+        metrics.AI_REQUEST_DURATION.observe(time.perf_counter() - start, operation, outcome)
+
+
+@traced
 async def _openai_interpret(query: str) -> dict:
     from openai import AsyncOpenAI
 
@@ -32,7 +53,8 @@ async def _openai_interpret(query: str) -> dict:
                     "You extract search filters from natural language queries about influencers. "
                     "Return a JSON object with these optional keys: "
                     "category (string), min_followers (int), max_followers (int), "
-                    "min_engagement (float 0-1), location (string), platform (instagram|tiktok|youtube), "
+                    "min_engagement (float 0-1), city (string), country (ISO 3166-1 alpha-2 code), "
+                    "platform (instagram|tiktok|youtube), "
                     "min_authenticity (float 0-100). Only include keys that are mentioned or implied."
                 ),
             },
@@ -41,11 +63,20 @@ async def _openai_interpret(query: str) -> dict:
         response_format={"type": "json_object"},
         temperature=0,
     )
+    _record_usage(response)
     return json.loads(response.choices[0].message.content)
 
 
-def _mock_interpret(query: str) -> dict:
-    """Rule-based fallback for search interpretation."""
+def _record_usage(response) -> None:
+    attributes = {"gen_ai.system": "openai", "gen_ai.response.model": response.model}
+    if response.usage:
+        attributes["gen_ai.usage.input_tokens"] = response.usage.prompt_tokens
+        attributes["gen_ai.usage.output_tokens"] = response.usage.completion_tokens
+    set_attributes(attributes)
+
+
+def mock_interpret(query: str) -> dict:
+    """Rule-based fallback for search interpretation; also the instant guess speculative search runs on."""
     query_lower = query.lower()
     filters = {}
 
@@ -86,33 +117,45 @@ def _mock_interpret(query: str) -> dict:
             filters["platform"] = plat
             break
 
-    locations = {
-        "us": "US", "usa": "US", "united states": "US",
-        "uk": "UK", "india": "IN", "brazil": "BR",
-        "los angeles": "Los Angeles", "new york": "New York",
-        "london": "London", "mumbai": "Mumbai",
-    }
-    for keyword, loc in locations.items():
-        if keyword in query_lower:
-            filters["location"] = loc
+    # Cities before countries; whole words only, so "us" never matches "music".
+    for city in CITY_COUNTRIES:
+        if re.search(rf"\b{re.escape(city.lower())}\b", query_lower):
+            filters["city"] = city
             break
+    else:
+        for alias, code in COUNTRY_ALIASES.items():
+            if len(alias) > 2 and re.search(rf"\b{re.escape(alias)}\b", query_lower):
+                filters["country"] = code
+                break
+        else:
+            for code in ("US", "UK", "UAE"):
+                if re.search(rf"\b{code}\b", query):
+                    filters["country"] = COUNTRY_ALIASES[code.lower()]
+                    break
 
     return filters
 
 
+@traced
 async def recommend_influencers_for_campaign(
     campaign_title: str, campaign_category: str | None, influencer_names: list[str]
 ) -> str:
     """Generate AI reasoning for why these influencers are recommended."""
     if settings.openai_api_key:
         try:
-            return await _openai_recommend(campaign_title, campaign_category, influencer_names)
+            return await _timed_openai_call(
+                "recommend", _openai_recommend(campaign_title, campaign_category, influencer_names)
+            )
         except Exception as e:
             logger.warning(f"OpenAI call failed, using mock: {e}")
+            metrics.AI_FALLBACKS.inc("recommend", "error")
+    else:
+        metrics.AI_FALLBACKS.inc("recommend", "no_api_key")
 
     return _mock_recommend(campaign_title, campaign_category, influencer_names)
 
 
+@traced
 async def _openai_recommend(
     campaign_title: str, campaign_category: str | None, influencer_names: list[str]
 ) -> str:
@@ -134,6 +177,7 @@ async def _openai_recommend(
         temperature=0.7,
         max_tokens=200,
     )
+    _record_usage(response)
     return response.choices[0].message.content
 
 
@@ -8,20 +8,27 @@ from passlib.context import CryptContext
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app import metrics
 from app.config import settings
 from app.models import BrandProfile, InfluencerProfile, Role, User
+from app.tracing import traced
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+@traced
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    with metrics.PASSWORD_HASH_DURATION.time("hash"):
+        return pwd_context.hash(password)
 
 
+@traced
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    with metrics.PASSWORD_HASH_DURATION.time("verify"):
+        return pwd_context.verify(plain, hashed)
 
 
+@traced
 def create_access_token(user_id: str, role: str) -> str:
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
     return jwt.encode(
@@ -31,6 +38,7 @@ def create_access_token(user_id: str, role: str) -> str:
     )
 
 
+@traced
 def create_refresh_token(user_id: str) -> str:
     expire = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
     return jwt.encode(
@@ -40,6 +48,7 @@ def create_refresh_token(user_id: str) -> str:
     )
 
 
+@traced
 def decode_token(token: str) -> dict | None:
     try:
         return jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
@@ -47,6 +56,7 @@ def decode_token(token: str) -> dict | None:
         return None
 
 
+@traced
 async def register_user(
     db: AsyncSession,
     email: str,
@@ -83,6 +93,7 @@ async def register_user(
     return user
 
 
+@traced
 async def authenticate_user(db: AsyncSession, email: str, password: str) -> User | None:
     result = await db.execute(select(User).where(User.email == email))
     user = result.scalar_one_or_none()
@@ -91,6 +102,7 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> User
     return user
 
 
+@traced
 async def get_user_by_id(db: AsyncSession, user_id: uuid.UUID) -> User | None:
     result = await db.execute(select(User).where(User.id == user_id))
     return result.scalar_one_or_none()
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import BrandProfile
+from app.tracing import traced
+
+# A user's brand profile never changes once created, so this per-process map
+# needs no invalidation.
+_brand_ids: dict[uuid.UUID, uuid.UUID] = {}
+
+
+@traced
+async def get_brand_id(db: AsyncSession, user_id: uuid.UUID) -> uuid.UUID | None:
+    if user_id in _brand_ids:
+        return _brand_ids[user_id]
+    brand_id = (await db.execute(select(BrandProfile.id).where(BrandProfile.user_id == user_id))).scalar()
+    if brand_id is not None:
+        _brand_ids[user_id] = brand_id
+    return brand_id
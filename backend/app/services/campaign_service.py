@@ -1,22 +1,109 @@
 from __future__ import annotations
 
 import uuid
+from collections import Counter
+from datetime import datetime
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, Select, Text, and_, any_, func, literal, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import UUID, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import BrandProfile, Campaign, CampaignApplication, CampaignStatus, InfluencerProfile, Platform
+from app import events
+from app.models import (
+    ApplicationStatus,
+    BrandProfile,
+    Campaign,
+    CampaignApplication,
+    CampaignStatus,
+    InfluencerProfile,
+    Platform,
+)
+from app.pagination import decode_cursor, encode_cursor
+from app.projections import FULL, Fieldset, load_options
+from app.services import rollup_service
+from app.tracing import traced
 
+APPLICANT_SORTS = {
+    "created_at": CampaignApplication.created_at,
+    "follower_count": InfluencerProfile.follower_count,
+    "engagement_rate": InfluencerProfile.engagement_rate,
+    "authenticity_score": InfluencerProfile.authenticity_score,
+}
+_CURSOR_TYPES = {
+    "created_at": datetime.fromisoformat,
+    "follower_count": int,
+    "engagement_rate": float,
+    "authenticity_score": float,
+}
 
+
+def _application_count():
+    return (
+        select(func.count())
+        .where(CampaignApplication.campaign_id == Campaign.id)
+        .correlate(Campaign)
+        .scalar_subquery()
+        .label("application_count")
+    )
+
+
+def _campaign_dict(
+    campaign: Campaign, brand_name: str, app_count: int | None = None, fields: Fieldset = FULL
+) -> dict:
+    data = {c.key: getattr(campaign, c.key) for c in Campaign.__table__.columns if fields.wants(c.key)}
+    for key in ("platform", "status"):
+        if key in data:
+            data[key] = data[key].value
+    if fields.wants("brand_name"):
+        data["brand_name"] = brand_name
+    if fields.wants("application_count"):
+        data["application_count"] = app_count
+    return data
+
+
+def _application_dict(application: CampaignApplication) -> dict:
+    return {
+        "id": application.id,
+        "campaign_id": application.campaign_id,
+        "influencer_id": application.influencer_id,
+        "status": application.status.value,
+        "pitch": application.pitch,
+        "created_at": application.created_at,
+    }
+
+
+async def _application_page(
+    db: AsyncSession, query: Select, sort_by: str, sort_column, cursor: str | None, limit: int
+) -> tuple[list[Row], str | None]:
+    """Descending (sort_column, application id) keyset page of ``query``,
+    whose first column must be the CampaignApplication."""
+    if cursor:
+        after = decode_cursor(cursor, _CURSOR_TYPES[sort_by], uuid.UUID)
+        query = query.where(tuple_(sort_column, CampaignApplication.id) < tuple_(*after))
+    query = query.order_by(sort_column.desc(), CampaignApplication.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+        value = last.created_at.isoformat() if sort_by == "created_at" else getattr(rows[-1], sort_by)
+        next_cursor = encode_cursor([value, str(last.id)])
+    return rows, next_cursor
+
+
+@traced
 async def create_campaign(db: AsyncSession, brand_id: uuid.UUID, data: dict) -> Campaign:
     platform = data.pop("platform", "any")
     status = data.pop("status", "draft")
     campaign = Campaign(brand_id=brand_id, platform=Platform(platform), status=CampaignStatus(status), **data)
     db.add(campaign)
     await db.flush()
+    await rollup_service.campaign_written(db, campaign.id)
     return campaign
 
 
+@traced
 async def list_campaigns(
     db: AsyncSession,
     brand_id: uuid.UUID | None = None,
@@ -25,7 +112,10 @@ async def list_campaigns(
     status: str | None = None,
     page: int = 1,
     limit: int = 20,
+    fields: Fieldset = FULL,
 ) -> tuple[list[dict], int]:
+    """Page of campaigns as dicts holding only ``fields``; the application
+    count subquery runs only when it is asked for."""
     query = select(Campaign, BrandProfile.company_name).join(
         BrandProfile, Campaign.brand_id == BrandProfile.id
     )
@@ -44,47 +134,39 @@ async def list_campaigns(
     count_q = select(func.count()).select_from(query.subquery())
     total = (await db.execute(count_q)).scalar()
 
-    query = query.order_by(Campaign.created_at.desc()).offset((page - 1) * limit).limit(limit)
-    result = await db.execute(query)
-    rows = result.all()
-
-    campaigns = []
-    for campaign, brand_name in rows:
-        app_count_q = select(func.count()).where(CampaignApplication.campaign_id == campaign.id)
-        app_count = (await db.execute(app_count_q)).scalar()
-        campaigns.append({
-            **{c.key: getattr(campaign, c.key) for c in Campaign.__table__.columns},
-            "platform": campaign.platform.value,
-            "status": campaign.status.value,
-            "brand_name": brand_name,
-            "application_count": app_count,
-        })
-
-    return campaigns, total
+    query = query.options(*load_options(Campaign, fields)).order_by(Campaign.created_at.desc())
+    if fields.wants("application_count"):
+        query = query.add_columns(_application_count())
+    result = await db.execute(query.offset((page - 1) * limit).limit(limit))
+    return [_campaign_dict(*row, fields=fields) for row in result.all()], total
 
 
+@traced
 async def get_campaign(db: AsyncSession, campaign_id: uuid.UUID) -> dict | None:
     result = await db.execute(
-        select(Campaign, BrandProfile.company_name)
+        select(Campaign, BrandProfile.company_name, _application_count())
         .join(BrandProfile, Campaign.brand_id == BrandProfile.id)
         .where(Campaign.id == campaign_id)
     )
     row = result.first()
     if not row:
         return None
-    campaign, brand_name = row
-    app_count = (await db.execute(
-        select(func.count()).where(CampaignApplication.campaign_id == campaign.id)
-    )).scalar()
-    return {
-        **{c.key: getattr(campaign, c.key) for c in Campaign.__table__.columns},
-        "platform": campaign.platform.value,
-        "status": campaign.status.value,
-        "brand_name": brand_name,
-        "application_count": app_count,
-    }
+    return _campaign_dict(*row)
+
 
+@traced
+async def get_campaigns_by_ids(db: AsyncSession, campaign_ids: list[uuid.UUID]) -> tuple[list[dict], list[uuid.UUID]]:
+    """Resolve many campaigns in one query; returns them in input order plus the missing ids."""
+    result = await db.execute(
+        select(Campaign, BrandProfile.company_name, _application_count())
+        .join(BrandProfile, Campaign.brand_id == BrandProfile.id)
+        .where(Campaign.id == any_(campaign_ids))
+    )
+    found = {row[0].id: _campaign_dict(*row) for row in result.all()}
+    return [found[i] for i in campaign_ids if i in found], [i for i in campaign_ids if i not in found]
 
+
+@traced
 async def update_campaign(db: AsyncSession, campaign_id: uuid.UUID, brand_id: uuid.UUID, data: dict) -> Campaign | None:
     result = await db.execute(select(Campaign).where(Campaign.id == campaign_id, Campaign.brand_id == brand_id))
     campaign = result.scalar_one_or_none()
@@ -99,100 +181,316 @@ async def update_campaign(db: AsyncSession, campaign_id: uuid.UUID, brand_id: uu
             else:
                 setattr(campaign, key, value)
     await db.flush()
+    await rollup_service.campaign_written(db, campaign.id)
     return campaign
 
 
-async def apply_to_campaign(
-    db: AsyncSession, campaign_id: uuid.UUID, influencer_id: uuid.UUID, pitch: str | None = None
-) -> CampaignApplication:
+def _eligible():
+    """SQL predicate: the campaign is open, has capacity and the influencer meets its thresholds."""
+    return and_(
+        Campaign.status == CampaignStatus.active,
+        or_(Campaign.end_date.is_(None), Campaign.end_date >= func.current_date()),
+        or_(Campaign.max_influencers.is_(None), Campaign.accepted_count < Campaign.max_influencers),
+        or_(Campaign.min_followers.is_(None), InfluencerProfile.follower_count >= Campaign.min_followers),
+        or_(Campaign.min_engagement_rate.is_(None), InfluencerProfile.engagement_rate >= Campaign.min_engagement_rate),
+        or_(
+            Campaign.platform == Platform.any,
+            and_(Campaign.platform == Platform.instagram, InfluencerProfile.instagram_handle.isnot(None)),
+            and_(Campaign.platform == Platform.tiktok, InfluencerProfile.tiktok_handle.isnot(None)),
+            and_(Campaign.platform == Platform.youtube, InfluencerProfile.youtube_handle.isnot(None)),
+        ),
+    )
+
+
+async def _explain_rejected_application(db: AsyncSession, campaign_id: uuid.UUID, influencer_id: uuid.UUID):
+    """Slow path after the insert matched nothing: work out which rule refused it."""
+    campaign = (await db.execute(select(Campaign).where(Campaign.id == campaign_id))).scalar_one_or_none()
+    if not campaign:
+        raise LookupError("Campaign not found")
     existing = await db.execute(
-        select(CampaignApplication).where(
+        select(CampaignApplication.id).where(
             CampaignApplication.campaign_id == campaign_id,
             CampaignApplication.influencer_id == influencer_id,
         )
     )
-    if existing.scalar_one_or_none():
+    if existing.first():
         raise ValueError("Already applied to this campaign")
+    if campaign.status != CampaignStatus.active:
+        raise ValueError("Campaign is not accepting applications")
+    if campaign.max_influencers is not None and campaign.accepted_count >= campaign.max_influencers:
+        raise ValueError("Campaign is full")
+    raise ValueError("Influencer does not meet the campaign requirements")
+
+
+@traced
+async def apply_to_campaign(
+    db: AsyncSession, campaign_id: uuid.UUID, influencer_id: uuid.UUID, pitch: str | None = None
+) -> Row:
+    """Insert an application in a single statement.
 
-    application = CampaignApplication(
-        campaign_id=campaign_id,
-        influencer_id=influencer_id,
-        pitch=pitch,
+    Eligibility is checked against the campaign and profile rows inside the
+    INSERT ... SELECT, and ON CONFLICT absorbs concurrent duplicates, so
+    double-taps never surface as IntegrityErrors. Applying only reads the
+    campaign row, so a hot campaign takes no lock on it; the dashboard count
+    goes to one of several rollup shards.
+    """
+    result = await db.execute(
+        insert(CampaignApplication)
+        .from_select(
+            ["id", "campaign_id", "influencer_id", "status", "pitch"],
+            select(
+                literal(uuid.uuid4(), UUID(as_uuid=True)),
+                Campaign.id,
+                InfluencerProfile.id,
+                literal(ApplicationStatus.pending, CampaignApplication.status.type),
+                literal(pitch, Text()),
+            )
+            .select_from(Campaign)
+            .join(InfluencerProfile, InfluencerProfile.id == influencer_id)
+            .where(Campaign.id == campaign_id, _eligible()),
+        )
+        .on_conflict_do_nothing(index_elements=["campaign_id", "influencer_id"])
+        .returning(
+            CampaignApplication.id,
+            CampaignApplication.campaign_id,
+            CampaignApplication.influencer_id,
+            CampaignApplication.status,
+            CampaignApplication.pitch,
+            CampaignApplication.created_at,
+        )
     )
-    db.add(application)
-    await db.flush()
+    application = result.first()
+    if application is None:
+        await _explain_rejected_application(db, campaign_id, influencer_id)
+    await rollup_service.applications_moved(db, campaign_id, {ApplicationStatus.pending: 1})
+    await events.applications_changed(db, "application.created", [application.id])
     return application
 
 
+@traced
 async def list_applications(
-    db: AsyncSession, campaign_id: uuid.UUID, brand_id: uuid.UUID
-) -> list[dict]:
+    db: AsyncSession,
+    campaign_id: uuid.UUID,
+    brand_id: uuid.UUID,
+    status: ApplicationStatus | None = None,
+    sort_by: str = "created_at",
+    cursor: str | None = None,
+    limit: int = 50,
+) -> dict | None:
+    """One inbox page, best-first by ``sort_by`` with an application-id tiebreak.
+
+    Returns None if the campaign is not the brand's; raises ValueError on a
+    bad cursor. ``totals`` counts every status regardless of the filter.
+    """
     campaign_check = await db.execute(
-        select(Campaign).where(Campaign.id == campaign_id, Campaign.brand_id == brand_id)
+        select(Campaign.id).where(Campaign.id == campaign_id, Campaign.brand_id == brand_id)
     )
-    if not campaign_check.scalar_one_or_none():
-        raise ValueError("Campaign not found or not owned by you")
+    if not campaign_check.first():
+        return None
 
-    result = await db.execute(
-        select(CampaignApplication, InfluencerProfile.display_name, InfluencerProfile.avatar_url)
+    sort_column = APPLICANT_SORTS[sort_by]
+    query = (
+        select(
+            CampaignApplication,
+            InfluencerProfile.display_name,
+            InfluencerProfile.avatar_url,
+            InfluencerProfile.follower_count,
+            InfluencerProfile.engagement_rate,
+            InfluencerProfile.authenticity_score,
+        )
         .join(InfluencerProfile, CampaignApplication.influencer_id == InfluencerProfile.id)
         .where(CampaignApplication.campaign_id == campaign_id)
-        .order_by(CampaignApplication.created_at.desc())
     )
-    rows = result.all()
-    return [
-        {
-            "id": app.id,
-            "campaign_id": app.campaign_id,
-            "influencer_id": app.influencer_id,
-            "status": app.status.value,
-            "pitch": app.pitch,
-            "created_at": app.created_at,
-            "influencer_name": name,
-            "influencer_avatar": avatar,
-        }
-        for app, name, avatar in rows
-    ]
+    if status is not None:
+        query = query.where(CampaignApplication.status == status)
+    rows, next_cursor = await _application_page(db, query, sort_by, sort_column, cursor, limit)
+    return {
+        "items": [
+            {
+                **_application_dict(app),
+                "influencer_name": name,
+                "influencer_avatar": avatar,
+                "influencer_follower_count": followers,
+                "influencer_engagement_rate": engagement,
+                "influencer_authenticity_score": authenticity,
+            }
+            for app, name, avatar, followers, engagement, authenticity in rows
+        ],
+        "next_cursor": next_cursor,
+        "totals": await rollup_service.application_counts(db, campaign_id),
+    }
 
 
+@traced
 async def update_application_status(
     db: AsyncSession, campaign_id: uuid.UUID, application_id: uuid.UUID, brand_id: uuid.UUID, status: str
 ) -> CampaignApplication | None:
+    # Campaign row first, then the application: the same lock order as the
+    # bulk path. FOR NO KEY UPDATE leaves applies' foreign-key KEY SHARE locks alone.
     campaign_check = await db.execute(
-        select(Campaign).where(Campaign.id == campaign_id, Campaign.brand_id == brand_id)
+        select(Campaign.id)
+        .where(Campaign.id == campaign_id, Campaign.brand_id == brand_id)
+        .with_for_update(key_share=True)
     )
-    if not campaign_check.scalar_one_or_none():
+    if not campaign_check.first():
         return None
 
-    from app.models import ApplicationStatus
+    new_status = ApplicationStatus(status)
     result = await db.execute(
-        select(CampaignApplication).where(CampaignApplication.id == application_id)
+        select(CampaignApplication)
+        .where(CampaignApplication.id == application_id, CampaignApplication.campaign_id == campaign_id)
+        .with_for_update()
     )
     application = result.scalar_one_or_none()
     if not application:
         return None
-    application.status = ApplicationStatus(status)
+
+    delta = (new_status == ApplicationStatus.accepted) - (application.status == ApplicationStatus.accepted)
+    if delta > 0:
+        # Conditional increment: the WHERE clause refuses the accept that would
+        # exceed max_influencers.
+        reserved = await db.execute(
+            update(Campaign)
+            .where(
+                Campaign.id == campaign_id,
+                or_(Campaign.max_influencers.is_(None), Campaign.accepted_count < Campaign.max_influencers),
+            )
+            .values(accepted_count=Campaign.accepted_count + 1)
+            .returning(Campaign.id)
+        )
+        if not reserved.first():
+            raise ValueError("Campaign is full")
+    elif delta < 0:
+        await db.execute(
+            update(Campaign).where(Campaign.id == campaign_id).values(accepted_count=Campaign.accepted_count - 1)
+        )
+
+    changed = new_status != application.status
+    if changed:
+        await rollup_service.applications_moved(db, campaign_id, {application.status: -1, new_status: 1})
+    application.status = new_status
     await db.flush()
+    if changed:
+        await events.applications_changed(db, "application.status_changed", [application.id])
     return application
 
 
-async def get_influencer_applications(db: AsyncSession, influencer_id: uuid.UUID) -> list[dict]:
-    result = await db.execute(
+@traced
+async def bulk_update_application_status(
+    db: AsyncSession,
+    campaign_id: uuid.UUID,
+    brand_id: uuid.UUID,
+    status: str,
+    application_ids: list[uuid.UUID] | None = None,
+    filter_status: str | None = None,
+    auto_reject_remaining: bool = False,
+) -> dict | None:
+    """Set the status of many applications of one owned campaign with set-based UPDATEs.
+
+    The campaign row is locked for the duration so accepted_count stays exact
+    alongside concurrent single-application reviews, then the applications in
+    primary-key order. Accepts beyond max_influencers are skipped, oldest
+    applications first.
+    """
+    campaign = (await db.execute(
+        select(Campaign)
+        .where(Campaign.id == campaign_id, Campaign.brand_id == brand_id)
+        .with_for_update(key_share=True)
+    )).scalar_one_or_none()
+    if not campaign:
+        return None
+
+    new_status = ApplicationStatus(status)
+    targets = select(CampaignApplication.id, CampaignApplication.status, CampaignApplication.created_at).where(
+        CampaignApplication.campaign_id == campaign_id,
+        CampaignApplication.status != new_status,
+    )
+    if application_ids is not None:
+        targets = targets.where(CampaignApplication.id == any_(application_ids))
+    if filter_status is not None:
+        targets = targets.where(CampaignApplication.status == ApplicationStatus(filter_status))
+    rows = (await db.execute(targets.order_by(CampaignApplication.id).with_for_update())).all()
+
+    skipped = 0
+    if new_status == ApplicationStatus.accepted and campaign.max_influencers is not None:
+        remaining = max(0, campaign.max_influencers - campaign.accepted_count)
+        skipped = max(0, len(rows) - remaining)
+        rows = sorted(rows, key=lambda row: row.created_at)[:remaining]
+
+    ids = [row.id for row in rows]
+    if ids:
+        await db.execute(
+            update(CampaignApplication).where(CampaignApplication.id == any_(ids)).values(status=new_status)
+        )
+    if new_status == ApplicationStatus.accepted:
+        campaign.accepted_count += len(ids)
+    else:
+        campaign.accepted_count -= sum(1 for row in rows if row.status == ApplicationStatus.accepted)
+
+    auto_rejected_ids = []
+    if (
+        auto_reject_remaining
+        and campaign.max_influencers is not None
+        and campaign.accepted_count >= campaign.max_influencers
+    ):
+        result = await db.execute(
+            update(CampaignApplication)
+            .where(
+                CampaignApplication.campaign_id == campaign_id,
+                CampaignApplication.status == ApplicationStatus.pending,
+            )
+            .values(status=ApplicationStatus.rejected)
+            .returning(CampaignApplication.id)
+        )
+        auto_rejected_ids = list(result.scalars())
+    auto_rejected = len(auto_rejected_ids)
+
+    moved = Counter(row.status for row in rows)
+    changes = {status: -count for status, count in moved.items()}
+    changes[new_status] = changes.get(new_status, 0) + len(ids)
+    changes[ApplicationStatus.pending] = changes.get(ApplicationStatus.pending, 0) - auto_rejected
+    changes[ApplicationStatus.rejected] = changes.get(ApplicationStatus.rejected, 0) + auto_rejected
+    await rollup_service.applications_moved(db, campaign_id, changes)
+    await db.flush()
+    await events.applications_changed(db, "application.status_changed", ids + auto_rejected_ids)
+
+    return {
+        "updated": len(ids),
+        "skipped_over_capacity": skipped,
+        "auto_rejected": auto_rejected,
+        "accepted_count": campaign.accepted_count,
+        "max_influencers": campaign.max_influencers,
+    }
+
+
+@traced
+async def get_influencer_applications(
+    db: AsyncSession,
+    influencer_id: uuid.UUID,
+    status: ApplicationStatus | None = None,
+    cursor: str | None = None,
+    limit: int = 50,
+) -> dict:
+    """Newest-first page of the influencer's applications; raises ValueError on a bad cursor."""
+    query = (
         select(CampaignApplication, Campaign.title)
         .join(Campaign, CampaignApplication.campaign_id == Campaign.id)
         .where(CampaignApplication.influencer_id == influencer_id)
-        .order_by(CampaignApplication.created_at.desc())
     )
-    rows = result.all()
-    return [
-        {
-            "id": app.id,
-            "campaign_id": app.campaign_id,
-            "influencer_id": app.influencer_id,
-            "status": app.status.value,
-            "pitch": app.pitch,
-            "created_at": app.created_at,
-            "campaign_title": title,
-        }
-        for app, title in rows
-    ]
+    if status is not None:
+        query = query.where(CampaignApplication.status == status)
+    rows, next_cursor = await _application_page(
+        db, query, "created_at", CampaignApplication.created_at, cursor, limit
+    )
+    totals = dict.fromkeys(rollup_service.COUNTS, 0)
+    for application_status, count in await db.execute(
+        select(CampaignApplication.status, func.count())
+        .where(CampaignApplication.influencer_id == influencer_id)
+        .group_by(CampaignApplication.status)
+    ):
+        totals[application_status.value] = count
+    return {
+        "items": [{**_application_dict(app), "campaign_title": title} for app, title in rows],
+        "next_cursor": next_cursor,
+        "totals": totals,
+    }
@@ -0,0 +1,217 @@
+"""Campaign reach estimates from a precomputed influencer aggregate cube.
+
+The cube is rebuilt periodically with one grouped scan. It buckets influencers
+by category x platform x follower band x engagement band x authenticity band
+and keeps a count, follower sum and price histogram for each cell. For each
+(category, platform) pair it stores suffix sums over the three numeric
+dimensions. An estimate is then at most eight cell lookups, interpolated
+linearly inside the bands that straddle a threshold. It never touches
+influencer_profiles.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from bisect import bisect_right
+from datetime import datetime, timezone
+from decimal import Decimal
+from itertools import product
+from operator import add
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import async_session_factory
+from app.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+ANY = "*"
+
+FOLLOWER_BANDS = (0, 1_000, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000)
+ENGAGEMENT_BANDS = (0.0, 0.005, 0.01, 0.015, 0.02, 0.025, 0.03, 0.04, 0.05, 0.075, 0.10)
+AUTHENTICITY_BANDS = (0.0, 50.0, 60.0, 70.0, 80.0, 90.0)
+PRICE_BANDS = (0, 50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000)
+
+# Upper edge used for interpolation inside each open-ended top band.
+_TOP_EDGE = {FOLLOWER_BANDS: 50_000_000, ENGAGEMENT_BANDS: 0.25, AUTHENTICITY_BANDS: 100.0}
+
+
+def _sql_array(edges: tuple) -> str:
+    return "ARRAY[" + ",".join(str(e) for e in edges) + "]::float8[]"
+
+
+_CUBE_SQL = f"""
+SELECT c.category,
+       p.platform,
+       width_bucket(i.follower_count::float8, {_sql_array(FOLLOWER_BANDS)}) - 1 AS fb,
+       width_bucket(i.engagement_rate::float8, {_sql_array(ENGAGEMENT_BANDS)}) - 1 AS eb,
+       width_bucket(i.authenticity_score::float8, {_sql_array(AUTHENTICITY_BANDS)}) - 1 AS ab,
+       width_bucket(coalesce(i.price_per_post, -1)::float8, {_sql_array(PRICE_BANDS)}) - 1 AS pb,
+       count(*) AS n,
+       sum(i.follower_count) AS followers
+FROM influencer_profiles i
+CROSS JOIN LATERAL unnest(coalesce(i.categories, '{{}}'::varchar[]) || '{{{ANY}}}'::varchar[]) AS c(category)
+CROSS JOIN LATERAL (VALUES
+    ('any'),
+    (CASE WHEN i.instagram_handle IS NOT NULL THEN 'instagram' END),
+    (CASE WHEN i.tiktok_handle IS NOT NULL THEN 'tiktok' END),
+    (CASE WHEN i.youtube_handle IS NOT NULL THEN 'youtube' END)
+) AS p(platform)
+WHERE p.platform IS NOT NULL
+GROUP BY 1, 2, 3, 4, 5, 6
+"""
+
+_NF, _NE, _NA, _NP = len(FOLLOWER_BANDS), len(ENGAGEMENT_BANDS), len(AUTHENTICITY_BANDS), len(PRICE_BANDS)
+# Per cell: count, follower sum, then one counter per price band.
+_WIDTH = 2 + _NP
+
+
+def _offset(f: int, e: int, a: int) -> int:
+    # Suffix arrays carry one zero pad per dimension, hence the +1 strides.
+    return ((f * (_NE + 1) + e) * (_NA + 1) + a) * _WIDTH
+
+
+class ReachCube:
+    def __init__(self, rows, built_at: datetime):
+        self.built_at = built_at
+        cells: dict[tuple[str, str], list[int]] = {}
+        size = (_NF + 1) * (_NE + 1) * (_NA + 1) * _WIDTH
+        for category, platform, fb, eb, ab, pb, n, followers in rows:
+            arr = cells.setdefault((category, platform), [0] * size)
+            base = _offset(max(fb, 0), max(eb, 0), max(ab, 0))
+            arr[base] += n
+            arr[base + 1] += int(followers)
+            if pb >= 0:
+                arr[base + 2 + pb] += n
+        for arr in cells.values():
+            self._suffix_sum(arr)
+        self._cells = cells
+
+    @staticmethod
+    def _suffix_sum(arr: list[int]) -> None:
+        # One reverse running sum per dimension turns cell counts into
+        # "at or above this band" totals for every combination of thresholds.
+        for step in (_offset(1, 0, 0), _offset(0, 1, 0), _offset(0, 0, 1)):
+            for f in range(_NF - 1, -1, -1):
+                for e in range(_NE - 1, -1, -1):
+                    for a in range(_NA - 1, -1, -1):
+                        base = _offset(f, e, a)
+                        arr[base:base + _WIDTH] = map(add, arr[base:base + _WIDTH], arr[base + step:base + step + _WIDTH])
+
+    @property
+    def cell_count(self) -> int:
+        return len(self._cells)
+
+    def estimate(
+        self,
+        category: str | None,
+        platform: str | None,
+        min_followers: int | None,
+        min_engagement: float | None,
+        min_authenticity: float | None,
+    ) -> dict:
+        arr = self._cells.get((category or ANY, platform or "any"))
+        corners = [
+            _threshold(FOLLOWER_BANDS, min_followers),
+            _threshold(ENGAGEMENT_BANDS, min_engagement),
+            _threshold(AUTHENTICITY_BANDS, min_authenticity),
+        ]
+        totals = [0.0] * _WIDTH
+        if arr is not None:
+            for (f, wf), (e, we), (a, wa) in product(*corners):
+                weight = wf * we * wa
+                if weight == 0:
+                    continue
+                base = _offset(f, e, a)
+                for k in range(_WIDTH):
+                    totals[k] += weight * arr[base + k]
+
+        prices = totals[2:]
+        return {
+            "influencer_count": round(totals[0]),
+            "total_reach": round(totals[1]),
+            "priced_influencers": round(sum(prices)),
+            "price_p10": _quantile(prices, 0.10),
+            "price_p50": _quantile(prices, 0.50),
+            "price_p90": _quantile(prices, 0.90),
+            "approximate": any(len(c) > 1 for c in corners),
+            "built_at": self.built_at,
+        }
+
+
+def _threshold(edges: tuple, value: float | None) -> list[tuple[int, float]]:
+    """Suffix indices and weights giving the share of rows at or above value.
+
+    Exact when value falls on a band edge, otherwise it mixes the straddled
+    band with the next one, assuming rows spread evenly inside the band.
+    """
+    if value is None or value <= edges[0]:
+        return [(0, 1.0)]
+    i = bisect_right(edges, value) - 1
+    if edges[i] == value:
+        return [(i, 1.0)]
+    hi = edges[i + 1] if i + 1 < len(edges) else _TOP_EDGE[edges]
+    inside = max(0.0, min(1.0, (hi - value) / (hi - edges[i])))
+    return [(i, inside), (i + 1, 1.0 - inside)]
+
+
+def _quantile(histogram: list[float], q: float) -> Decimal | None:
+    total = sum(histogram)
+    if total <= 0:
+        return None
+    target = q * total
+    running = 0.0
+    for i, count in enumerate(histogram):
+        if count and running + count >= target:
+            lo = PRICE_BANDS[i]
+            hi = PRICE_BANDS[i + 1] if i + 1 < len(PRICE_BANDS) else lo * 2
+            return Decimal(str(round(lo + (hi - lo) * (target - running) / count, 2)))
+        running += count
+    return Decimal(PRICE_BANDS[-1])
+
+
+_cube: ReachCube | None = None
+_build_lock = asyncio.Lock()
+
+
+@traced
+async def refresh_cube() -> ReachCube:
+    global _cube
+    start = time.perf_counter()
+    async with async_session_factory() as session:
+        rows = (await session.execute(text(_CUBE_SQL))).all()
+    # Folding rows into suffix sums is pure Python; keep it off the event loop.
+    _cube = await asyncio.to_thread(ReachCube, rows, datetime.now(timezone.utc))
+    logger.info(f"Reach cube rebuilt: {len(rows)} cells in {time.perf_counter() - start:.2f}s")
+    return _cube
+
+
+async def get_cube() -> ReachCube:
+    if _cube is not None:
+        return _cube
+    async with _build_lock:
+        return _cube or await refresh_cube()
+
+
+async def refresh_periodically() -> None:
+    # The first build happens during startup warm-up.
+    while True:
+        await asyncio.sleep(settings.estimate_cube_refresh_seconds)
+        try:
+            await refresh_cube()
+        except Exception as e:
+            logger.warning(f"Reach cube refresh failed: {e}")
+
+
+@traced
+async def estimate_reach(
+    category: str | None = None,
+    platform: str | None = None,
+    min_followers: int | None = None,
+    min_engagement: float | None = None,
+    min_authenticity: float | None = None,
+) -> dict:
+    cube = await get_cube()
+    return cube.estimate(category, platform, min_followers, min_engagement, min_authenticity)
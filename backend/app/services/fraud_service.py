@@ -1,3 +1,6 @@
+from app.tracing import traced
+
+
 def calculate_authenticity_score(
     follower_count: int,
     avg_likes: int,
@@ -54,3 +57,11 @@ def calculate_authenticity_score(
     fake_pct = max(0, min(100, 100 - score))
 
     return round(score, 1), round(fake_pct, 1)
+
+
+@traced
+def calculate_authenticity_scores(
+    rows: list[tuple[int, int, int, float]],
+) -> list[tuple[float, float]]:
+    """Score a batch of (follower_count, avg_likes, avg_comments, engagement_rate) rows."""
+    return [calculate_authenticity_score(*row) for row in rows]
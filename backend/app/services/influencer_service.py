@@ -1,13 +1,187 @@
 from __future__ import annotations
 
+import asyncio
+import secrets
 import uuid
+from collections import Counter
+from typing import AsyncIterator, Iterable, Sequence
 
-from sqlalchemy import func, select
+from pydantic import ValidationError
+from sqlalchemy import Row, and_, any_, func, literal_column, or_, select, true
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import InfluencerProfile
+from app import snapshot
+from app.config import settings
+from app.database import async_session_factory
+from app.locations import normalize_city, normalize_country, parse_location
+from app.models import InfluencerProfile, Role, User
+from app.projections import FULL, Fieldset, load_options
+from app.schemas.influencer import InfluencerImportRow
+from app.services.auth_service import hash_password
+from app.services.fraud_service import calculate_authenticity_scores
+from app.tracing import traced
 
+PLATFORM_HANDLES = {
+    "instagram": InfluencerProfile.instagram_handle,
+    "tiktok": InfluencerProfile.tiktok_handle,
+    "youtube": InfluencerProfile.youtube_handle,
+}
 
+
+def _filter_predicates(
+    category: str | None = None,
+    min_followers: int | None = None,
+    max_followers: int | None = None,
+    min_engagement: float | None = None,
+    location: str | None = None,
+    platform: str | None = None,
+    min_authenticity: float | None = None,
+    q: str | None = None,
+    city: str | None = None,
+    country: str | list[str] | None = None,
+) -> dict[str, list]:
+    """WHERE clauses grouped by the facet they restrict (or their own name)."""
+    predicates: dict[str, list] = {}
+    if category:
+        predicates["category"] = [InfluencerProfile.categories.any(category)]
+    if min_followers is not None:
+        predicates.setdefault("follower_tier", []).append(InfluencerProfile.follower_count >= min_followers)
+    if max_followers is not None:
+        predicates.setdefault("follower_tier", []).append(InfluencerProfile.follower_count <= max_followers)
+    if min_engagement is not None:
+        predicates["engagement"] = [InfluencerProfile.engagement_rate >= min_engagement]
+    if location:
+        # Free text is parsed the same way stored locations are, so both sides
+        # meet on the indexed city/country columns.
+        parsed_city, parsed_country = parse_location(location)
+        city = city or parsed_city
+        if parsed_city is None:
+            country = country or parsed_country
+    if city:
+        predicates["location"] = [InfluencerProfile.location_city == normalize_city(city)]
+    if country:
+        codes = sorted({normalize_country(c) or c.upper() for c in ([country] if isinstance(country, str) else country)})
+        predicates["country"] = [
+            InfluencerProfile.location_country == codes[0] if len(codes) == 1
+            else InfluencerProfile.location_country.in_(codes)
+        ]
+    if platform in PLATFORM_HANDLES:
+        predicates["platform"] = [PLATFORM_HANDLES[platform].isnot(None)]
+    if min_authenticity is not None:
+        predicates["authenticity"] = [InfluencerProfile.authenticity_score >= min_authenticity]
+    if q:
+        predicates["text"] = [InfluencerProfile.search_vector.op("@@")(_tsquery(q))]
+    return predicates
+
+
+def _tsquery(q: str):
+    # Names and handles are indexed unstemmed, the bio stemmed; match either form.
+    return func.websearch_to_tsquery(literal_column("'simple'::regconfig"), q).op("||")(
+        func.websearch_to_tsquery(literal_column("'english'::regconfig"), q)
+    )
+
+
+def _sort_order(sort_by: str | None, q: str | None) -> list:
+    if q and sort_by in (None, "relevance"):
+        return [func.ts_rank(InfluencerProfile.search_vector, _tsquery(q)).desc(), InfluencerProfile.follower_count.desc()]
+    sort_column = getattr(InfluencerProfile, sort_by or "follower_count", InfluencerProfile.follower_count)
+    return [sort_column.desc()]
+
+
+def apply_filters(query, *args, **kwargs):
+    for clauses in _filter_predicates(*args, **kwargs).values():
+        query = query.where(*clauses)
+    return query
+
+
+FOLLOWER_TIERS = (("nano", 0), ("micro", 10_000), ("mid", 100_000), ("macro", 500_000), ("mega", 1_000_000))
+
+
+def _follower_tiers() -> dict[str, object]:
+    """The predicate of each follower tier."""
+    bounds = [*(low for _, low in FOLLOWER_TIERS[1:]), None]
+    followers = InfluencerProfile.follower_count
+    return {
+        name: and_(followers >= low, true() if high is None else followers < high)
+        for (name, low), high in zip(FOLLOWER_TIERS, bounds)
+    }
+
+
+def facet_query(**filters):
+    """The grouped scan behind :func:`facet_counts`: one row per country and category.
+
+    Each facet is counted under every active filter except its own, so picking
+    a value shows what the other values would yield. Filters that own no facet
+    go into WHERE; facet-owning filters move into per-aggregate FILTER clauses.
+    Tiers and platforms are fixed sets, so each value is its own aggregate; the
+    open-ended countries and categories are the GROUP BY, summed per facet
+    by the caller. A plain GROUP BY hashes and runs in parallel, where the planner
+    sorted GROUPING SETS on one process. Categories are unnested with
+    ordinality and the other facets count only the first (or missing) category
+    row, so multi-category profiles count once.
+    """
+    predicates = _filter_predicates(**filters)
+    owned = {name: predicates.pop(name, []) for name in ("category", "platform", "follower_tier", "country")}
+
+    def without(facet: str | None):
+        return and_(true(), *(c for name, clauses in owned.items() if name != facet for c in clauses))
+
+    categories = (
+        func.unnest(InfluencerProfile.categories)
+        .table_valued("category", with_ordinality="ord")
+        .render_derived()
+        .lateral("c")
+    )
+    once = or_(categories.c.ord.is_(None), categories.c.ord == 1)
+    tiers = _follower_tiers()
+    return (
+        select(
+            InfluencerProfile.location_country.label("country"),
+            categories.c.category,
+            func.count().filter(without("category")).label("category_count"),
+            func.count().filter(and_(once, without("country"))).label("country_count"),
+            *(
+                func.count().filter(and_(once, without("follower_tier"), tier)).label(f"tier_{name}")
+                for name, tier in tiers.items()
+            ),
+            *(
+                func.count().filter(and_(once, without("platform"), handle.isnot(None))).label(f"platform_{name}")
+                for name, handle in PLATFORM_HANDLES.items()
+            ),
+        )
+        .select_from(InfluencerProfile)
+        .outerjoin(categories, true())
+        .where(*(c for clauses in predicates.values() for c in clauses))
+        .group_by(InfluencerProfile.location_country, categories.c.category)
+    )
+
+
+@traced
+async def facet_counts(db: AsyncSession, **filters) -> dict[str, dict[str, int]]:
+    """Counts per category, platform, follower tier and country in one grouped scan."""
+    query = facet_query(**filters)
+    tiers = _follower_tiers()
+    category, country = Counter(), Counter()
+    tier_counts, platform_counts = Counter(), Counter()
+    for row in (await db.execute(query)).all():
+        if row.category is not None:
+            category[row.category] += row.category_count
+        if row.country is not None:
+            country[row.country] += row.country_count
+        for name in tiers:
+            tier_counts[name] += getattr(row, f"tier_{name}")
+        for name in PLATFORM_HANDLES:
+            platform_counts[name] += getattr(row, f"platform_{name}")
+    return {
+        "category": {name: count for name, count in category.most_common() if count},
+        "platform": {name: platform_counts[name] for name in PLATFORM_HANDLES},
+        "follower_tier": {name: tier_counts[name] for name in tiers},
+        "country": {name: count for name, count in country.most_common() if count},
+    }
+
+
+@traced
 async def list_influencers(
     db: AsyncSession,
     category: str | None = None,
@@ -16,54 +190,223 @@ async def list_influencers(
     min_engagement: float | None = None,
     location: str | None = None,
     platform: str | None = None,
-    sort_by: str = "follower_count",
+    sort_by: str | None = None,
     page: int = 1,
     limit: int = 20,
+    q: str | None = None,
+    country: list[str] | None = None,
+    fields: Fieldset = FULL,
 ) -> tuple[list[InfluencerProfile], int]:
-    query = select(InfluencerProfile)
+    """Filtered page of profiles; with ``q`` they default to ``ts_rank`` order.
 
-    if category:
-        query = query.where(InfluencerProfile.categories.any(category))
-    if min_followers is not None:
-        query = query.where(InfluencerProfile.follower_count >= min_followers)
-    if max_followers is not None:
-        query = query.where(InfluencerProfile.follower_count <= max_followers)
-    if min_engagement is not None:
-        query = query.where(InfluencerProfile.engagement_rate >= min_engagement)
-    if location:
-        query = query.where(InfluencerProfile.location.ilike(f"%{location}%"))
-    if platform:
-        if platform == "instagram":
-            query = query.where(InfluencerProfile.instagram_handle.isnot(None))
-        elif platform == "tiktok":
-            query = query.where(InfluencerProfile.tiktok_handle.isnot(None))
-        elif platform == "youtube":
-            query = query.where(InfluencerProfile.youtube_handle.isnot(None))
+    Without ``q`` the page is picked from the shared search snapshot when one
+    is mapped, and only the page's rows are read from Postgres. Only the
+    columns in ``fields`` are loaded.
+    """
+    if q is None and settings.snapshot_dir:
+        filters = {
+            "category": category, "min_followers": min_followers, "max_followers": max_followers,
+            "min_engagement": min_engagement, "location": location, "platform": platform, "country": country,
+        }
+        found = await asyncio.to_thread(snapshot.search, filters, sort_by, (page - 1) * limit, limit)
+        if found is not None:
+            ids, total = found
+            profiles, _ = await get_influencers_by_ids(db, ids, fields)
+            return profiles, total
+
+    query = apply_filters(
+        select(InfluencerProfile), category, min_followers, max_followers, min_engagement, location, platform,
+        q=q, country=country,
+    )
 
     count_query = select(func.count()).select_from(query.subquery())
     total_result = await db.execute(count_query)
     total = total_result.scalar()
 
-    sort_column = getattr(InfluencerProfile, sort_by, InfluencerProfile.follower_count)
-    query = query.order_by(sort_column.desc()).offset((page - 1) * limit).limit(limit)
+    query = (
+        query.options(*load_options(InfluencerProfile, fields))
+        .order_by(*_sort_order(sort_by, q))
+        .offset((page - 1) * limit)
+        .limit(limit)
+    )
 
     result = await db.execute(query)
     return result.scalars().all(), total
 
 
+async def stream_influencers(
+    columns: list[str],
+    category: str | None = None,
+    min_followers: int | None = None,
+    max_followers: int | None = None,
+    min_engagement: float | None = None,
+    location: str | None = None,
+    platform: str | None = None,
+    sort_by: str | None = None,
+    chunk_size: int = 1000,
+    q: str | None = None,
+    country: list[str] | None = None,
+) -> AsyncIterator[Sequence[Row]]:
+    """Yield filtered rows in chunks from a server-side cursor.
+
+    Opens its own session so the pooled connection is held only while the
+    cursor is being drained, and never by the request that started the export.
+    """
+    query = apply_filters(
+        select(*(InfluencerProfile.__table__.c[name] for name in columns)),
+        category, min_followers, max_followers, min_engagement, location, platform, q=q, country=country,
+    )
+    query = query.order_by(*_sort_order(sort_by, q), InfluencerProfile.id).execution_options(yield_per=chunk_size)
+
+    async with async_session_factory() as session:
+        result = await session.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+
+@traced
 async def get_influencer(db: AsyncSession, influencer_id: uuid.UUID) -> InfluencerProfile | None:
     result = await db.execute(select(InfluencerProfile).where(InfluencerProfile.id == influencer_id))
     return result.scalar_one_or_none()
 
 
+@traced
+async def get_influencers_by_ids(
+    db: AsyncSession, influencer_ids: list[uuid.UUID], fields: Fieldset = FULL
+) -> tuple[list[InfluencerProfile], list[uuid.UUID]]:
+    """Resolve many profiles in one query; returns them in input order plus the missing ids."""
+    result = await db.execute(
+        select(InfluencerProfile)
+        .options(*load_options(InfluencerProfile, fields))
+        .where(InfluencerProfile.id == any_(influencer_ids))
+    )
+    found = {p.id: p for p in result.scalars()}
+    return [found[i] for i in influencer_ids if i in found], [i for i in influencer_ids if i not in found]
+
+
+@traced
 async def get_influencer_by_user(db: AsyncSession, user_id: uuid.UUID) -> InfluencerProfile | None:
     result = await db.execute(select(InfluencerProfile).where(InfluencerProfile.user_id == user_id))
     return result.scalar_one_or_none()
 
 
+@traced
 async def update_influencer(db: AsyncSession, profile: InfluencerProfile, data: dict) -> InfluencerProfile:
     for key, value in data.items():
         if value is not None:
             setattr(profile, key, value)
     await db.flush()
     return profile
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors())
+
+
+async def _upsert_batch(
+    db: AsyncSession, batch: list[tuple[int, InfluencerImportRow]], password_hash: str
+) -> tuple[int, int, list[dict]]:
+    errors = []
+    user_stmt = insert(User).values([
+        {"id": uuid.uuid4(), "email": row.email, "password_hash": password_hash, "role": Role.influencer, "is_active": True}
+        for _, row in batch
+    ])
+    # DO UPDATE rather than DO NOTHING so RETURNING also yields existing users.
+    users = (await db.execute(
+        user_stmt.on_conflict_do_update(index_elements=[User.email], set_={"email": user_stmt.excluded.email})
+        .returning(User.id, User.email, User.role, literal_column("xmax = 0").label("inserted"))
+    )).all()
+    by_email = {u.email: u for u in users}
+
+    profiles = []
+    for line, row in batch:
+        user = by_email[row.email]
+        if user.role != Role.influencer:
+            errors.append({"row": line, "error": f"{row.email} is registered as a {user.role.value}"})
+            continue
+        profiles.append((user.id, row))
+
+    scores = calculate_authenticity_scores(
+        [(r.follower_count, r.avg_likes, r.avg_comments, r.engagement_rate) for _, r in profiles]
+    )
+    values = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            **row.model_dump(exclude={"email"}),
+            # Core inserts bypass the model's location validator.
+            **dict(zip(("location_city", "location_country"), parse_location(row.location))),
+            "authenticity_score": authenticity,
+            "fake_follower_pct": fake_pct,
+        }
+        for (user_id, row), (authenticity, fake_pct) in zip(profiles, scores)
+    ]
+    if values:
+        stmt = insert(InfluencerProfile).values(values)
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[InfluencerProfile.user_id],
+            set_={key: stmt.excluded[key] for key in values[0] if key not in ("id", "user_id")},
+        ))
+    return len(values), sum(1 for u in users if u.inserted), errors
+
+
+@traced
+async def import_influencers(db: AsyncSession, records: Iterable[dict | Exception], batch_size: int = 1000) -> dict:
+    """Upsert influencer users and profiles in batches, keyed by email.
+
+    Invalid rows (or parse errors passed in as exceptions) are reported and skipped. A batch the database rejects is
+    retried row by row inside savepoints so one bad row cannot sink the rest.
+    Imported accounts get an unusable password and must be claimed separately.
+    """
+    password_hash = hash_password(secrets.token_urlsafe(32))
+    received = upserted = created = 0
+    errors: list[dict] = []
+    batch: list[tuple[int, InfluencerImportRow]] = []
+    seen: set[str] = set()
+
+    async def flush() -> None:
+        nonlocal upserted, created
+        try:
+            async with db.begin_nested():
+                done, new_users, batch_errors = await _upsert_batch(db, batch, password_hash)
+        except Exception:
+            done, new_users, batch_errors = 0, 0, []
+            for item in batch:
+                try:
+                    async with db.begin_nested():
+                        row_done, row_new, row_errors = await _upsert_batch(db, [item], password_hash)
+                except Exception as e:
+                    batch_errors.append({"row": item[0], "error": str(getattr(e, "orig", e))})
+                    continue
+                done += row_done
+                new_users += row_new
+                batch_errors.extend(row_errors)
+        upserted += done
+        created += new_users
+        errors.extend(batch_errors)
+        batch.clear()
+        seen.clear()
+
+    for line, record in enumerate(records, start=1):
+        received += 1
+        if isinstance(record, Exception):
+            errors.append({"row": line, "error": str(record)})
+            continue
+        try:
+            row = InfluencerImportRow.model_validate(record)
+        except ValidationError as e:
+            errors.append({"row": line, "error": _validation_message(e)})
+            continue
+        row.email = row.email.strip()
+        if row.email in seen:
+            # ON CONFLICT cannot touch the same row twice in one statement.
+            await flush()
+        seen.add(row.email)
+        batch.append((line, row))
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    errors.sort(key=lambda e: e["row"])
+    return {"received": received, "upserted": upserted, "created_users": created, "errors": errors}
@@ -0,0 +1,204 @@
+"""Durable job queue on the ``jobs`` table.
+
+Producers call :func:`enqueue` inside their own transaction, so a job exists
+only if the work that asked for it committed. Workers claim ready rows with
+``FOR UPDATE SKIP LOCKED``, which lets any number of them poll one queue
+without blocking on each other. Failed jobs go back to ``queued`` with an
+exponential backoff until ``max_attempts`` is spent. A running job's worker
+renews its lock with :func:`heartbeat`, so only a dead worker's jobs expire.
+A worker records the outcome only while it still owns the run: if its lock
+expired and the job was requeued, the late result is dropped.
+"""
+from __future__ import annotations
+
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, NamedTuple
+
+from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Job, JobStatus
+from app.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+class Task(NamedTuple):
+    name: str
+    fn: Callable[[dict], Awaitable[None]]
+    queue: str
+    max_attempts: int
+
+
+class PeriodicTask(NamedTuple):
+    task: Task
+    every: timedelta
+
+
+TASKS: dict[str, Task] = {}
+PERIODIC: list[PeriodicTask] = []
+
+
+def task(name: str, queue: str = "default", max_attempts: int = 5, every: timedelta | None = None):
+    """Register an async ``fn(payload)`` as a job handler, optionally run on a period."""
+
+    def register(fn):
+        TASKS[name] = Task(name, fn, queue, max_attempts)
+        if every is not None:
+            PERIODIC.append(PeriodicTask(TASKS[name], every))
+        return fn
+
+    return register
+
+
+@traced
+async def enqueue(
+    db: AsyncSession,
+    task_name: str,
+    payload: dict | None = None,
+    run_at: datetime | None = None,
+    delay: timedelta | None = None,
+    unique_key: str | None = None,
+) -> uuid.UUID | None:
+    """Queue a job; returns its id, or None when ``unique_key`` already exists."""
+    definition = TASKS[task_name]
+    if run_at is None and delay is not None:
+        run_at = datetime.now(timezone.utc) + delay
+    values = {
+        "id": uuid.uuid4(),
+        "queue": definition.queue,
+        "task": task_name,
+        "payload": payload or {},
+        "status": JobStatus.queued,
+        "max_attempts": definition.max_attempts,
+        "unique_key": unique_key,
+    }
+    if run_at is not None:
+        values["run_at"] = run_at
+    result = await db.execute(
+        insert(Job).values(values).on_conflict_do_nothing(index_elements=[Job.unique_key]).returning(Job.id)
+    )
+    return result.scalar()
+
+
+async def claim(db: AsyncSession, queue: str, limit: int, worker_id: str) -> list[Job]:
+    # MATERIALIZED: as an IN subquery the planner may rescan the locking
+    # LIMIT once per outer row and claim far more than ``limit`` jobs.
+    ready = (
+        select(Job.id)
+        .where(Job.queue == queue, Job.status == JobStatus.queued, Job.run_at <= func.now())
+        .order_by(Job.run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .cte("ready")
+        .prefix_with("MATERIALIZED")
+    )
+    result = await db.execute(
+        update(Job)
+        .where(Job.id.in_(select(ready.c.id)))
+        .values(status=JobStatus.running, locked_at=func.now(), locked_by=worker_id, attempts=Job.attempts + 1)
+        .returning(Job)
+    )
+    return list(result.scalars())
+
+
+def backoff(attempts: int) -> timedelta:
+    """Exponential backoff with jitter, capped at JOB_BACKOFF_MAX_SECONDS."""
+    ceiling = min(settings.job_backoff_max_seconds, settings.job_backoff_base_seconds * 2 ** (attempts - 1))
+    return timedelta(seconds=random.uniform(ceiling / 2, ceiling))
+
+
+def _owned(job: Job):
+    # The claim that produced ``job``: recover_stale clears locked_by and a
+    # later claim bumps attempts, so either change means the run was lost.
+    return and_(
+        Job.id == job.id,
+        Job.status == JobStatus.running,
+        Job.locked_by == job.locked_by,
+        Job.attempts == job.attempts,
+    )
+
+
+async def heartbeat(db: AsyncSession, job: Job) -> bool:
+    """Renew a running job's lock; returns False if the claim was lost."""
+    result = await db.execute(update(Job).where(_owned(job)).values(locked_at=func.now()))
+    return bool(result.rowcount)
+
+
+async def complete(db: AsyncSession, job: Job) -> bool:
+    """Mark a claimed job succeeded; returns False if the claim was lost."""
+    result = await db.execute(
+        update(Job)
+        .where(_owned(job))
+        .values(status=JobStatus.succeeded, finished_at=func.now(), locked_at=None, last_error=None)
+    )
+    if not result.rowcount:
+        logger.warning(f"Job {job.id} attempt {job.attempts} finished after losing its lock; not recorded")
+    return bool(result.rowcount)
+
+
+async def fail(db: AsyncSession, job: Job, error: str) -> bool | None:
+    """Record a failure; returns True if the job will be retried, None if the claim was lost."""
+    retry = job.attempts < job.max_attempts
+    values = {"locked_at": None, "last_error": error[:4000]}
+    if retry:
+        values.update(status=JobStatus.queued, run_at=datetime.now(timezone.utc) + backoff(job.attempts))
+    else:
+        values.update(status=JobStatus.failed, finished_at=func.now())
+    result = await db.execute(update(Job).where(_owned(job)).values(**values))
+    if not result.rowcount:
+        logger.warning(f"Job {job.id} attempt {job.attempts} failed after losing its lock; not recorded")
+        return None
+    return retry
+
+
+async def recover_stale(db: AsyncSession) -> int:
+    """Requeue jobs whose worker died mid-run; the lost run still counts as an attempt."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.job_lock_timeout_seconds)
+    result = await db.execute(
+        update(Job)
+        .where(Job.status == JobStatus.running, Job.locked_at < cutoff)
+        .values(
+            status=JobStatus.queued,
+            run_at=func.now(),
+            locked_at=None,
+            locked_by=None,
+            last_error="lock expired",
+        )
+    )
+    return result.rowcount
+
+
+async def schedule_periodic(db: AsyncSession, now: datetime | None = None) -> int:
+    """Enqueue the current slot of every periodic task.
+
+    The slot number is part of the unique key, so each slot runs once no
+    matter how many workers are scheduling.
+    """
+    now = now or datetime.now(timezone.utc)
+    created = 0
+    for periodic in PERIODIC:
+        slot = int(now.timestamp() // periodic.every.total_seconds())
+        if await enqueue(db, periodic.task.name, unique_key=f"periodic:{periodic.task.name}:{slot}"):
+            created += 1
+    return created
+
+
+async def queue_depths(db: AsyncSession) -> dict[str, int]:
+    result = await db.execute(
+        select(Job.queue, func.count()).where(Job.status == JobStatus.queued).group_by(Job.queue)
+    )
+    return dict(result.all())
+
+
+async def prune_finished(db: AsyncSession, older_than: timedelta) -> int:
+    cutoff = datetime.now(timezone.utc) - older_than
+    result = await db.execute(
+        delete(Job).where(Job.status.in_([JobStatus.succeeded, JobStatus.failed]), Job.finished_at < cutoff)
+    )
+    return result.rowcount
@@ -0,0 +1,170 @@
+"""Per-category leaderboards precomputed into ``category_leaderboards``.
+
+The worker's refresh_leaderboards job rewrites the table every
+LEADERBOARD_REFRESH_SECONDS, and sooner after a profile edit that can move a
+board (:func:`profile_edited`). API processes keep each category's boards in
+memory for LEADERBOARD_CACHE_SECONDS, so a home screen costs no query at all
+between refreshes.
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import any_, delete, func, insert, literal, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import metrics
+from app.config import settings
+from app.models import CategoryLeaderboard, InfluencerProfile
+from app.schemas.influencer import InfluencerProfileResponse
+from app.services import job_service
+from app.tracing import traced
+
+# Composite: expected authentic engagements per post.
+METRICS = {
+    "followers": InfluencerProfile.follower_count,
+    "engagement": InfluencerProfile.engagement_rate,
+    "authenticity": InfluencerProfile.authenticity_score,
+    "composite": InfluencerProfile.follower_count
+    * InfluencerProfile.engagement_rate
+    * InfluencerProfile.authenticity_score
+    / 100.0,
+}
+RANKING_FIELDS = frozenset({"categories", "follower_count", "engagement_rate", "authenticity_score"})
+
+
+class Board:
+    __slots__ = ("refreshed_at", "entries")
+
+    def __init__(self):
+        self.refreshed_at: datetime | None = None
+        # metric -> [(rank, score, profile)] in rank order
+        self.entries: dict[str, list[tuple[int, float, InfluencerProfileResponse]]] = {}
+
+
+# Per-process cache: category -> (expires at, boards).
+_boards: dict[str, tuple[float, Board]] = {}
+
+
+def _score(profile: InfluencerProfile, metric: str) -> float:
+    if metric == "followers":
+        return profile.follower_count or 0
+    if metric == "engagement":
+        return profile.engagement_rate or 0.0
+    if metric == "authenticity":
+        return profile.authenticity_score or 0.0
+    return (profile.follower_count or 0) * (profile.engagement_rate or 0.0) * (profile.authenticity_score or 0.0) / 100.0
+
+
+@traced
+async def refresh(db: AsyncSession) -> int:
+    """Recompute every board in one transaction; returns the number of entries written."""
+    # EXCLUSIVE still admits readers but serializes concurrent refreshes.
+    await db.execute(text("LOCK TABLE category_leaderboards IN EXCLUSIVE MODE"))
+    await db.execute(delete(CategoryLeaderboard))
+    written = 0
+    for metric, expr in METRICS.items():
+        entries = select(
+            InfluencerProfile.id.label("influencer_id"),
+            InfluencerProfile.follower_count,
+            func.unnest(InfluencerProfile.categories).label("category"),
+            expr.label("score"),
+        ).subquery()
+        ranked = select(
+            entries.c.category,
+            func.row_number()
+            .over(
+                partition_by=entries.c.category,
+                order_by=(entries.c.score.desc(), entries.c.follower_count.desc(), entries.c.influencer_id),
+            )
+            .label("rank"),
+            entries.c.influencer_id,
+            entries.c.score,
+        ).subquery()
+        result = await db.execute(
+            insert(CategoryLeaderboard).from_select(
+                ["category", "metric", "rank", "influencer_id", "score"],
+                select(ranked.c.category, literal(metric), ranked.c.rank, ranked.c.influencer_id, ranked.c.score)
+                .where(ranked.c.rank <= settings.leaderboard_size),
+                include_defaults=False,
+            )
+        )
+        written += result.rowcount
+    return written
+
+
+async def profile_edited(db: AsyncSession, profile: InfluencerProfile, fields: set[str], old_categories: list[str]) -> bool:
+    """Schedule an early refresh if the edit can change a board; returns whether it did.
+
+    That is when the profile sits on a board of its old or new categories, or
+    now beats the last entry of a board (or a board with free places).
+    """
+    categories = set(profile.categories or ())
+    if not fields & RANKING_FIELDS or not categories | set(old_categories):
+        return False
+    boards = (
+        await db.execute(
+            select(
+                CategoryLeaderboard.category,
+                CategoryLeaderboard.metric,
+                func.count(),
+                func.min(CategoryLeaderboard.score),
+                func.bool_or(CategoryLeaderboard.influencer_id == profile.id),
+            )
+            .where(
+                or_(
+                    CategoryLeaderboard.category == any_(list(categories)),
+                    CategoryLeaderboard.influencer_id == profile.id,
+                )
+            )
+            .group_by(CategoryLeaderboard.category, CategoryLeaderboard.metric)
+        )
+    ).all()
+    significant = bool(categories - {category for category, *_ in boards}) or any(
+        on_board
+        or (category in categories and (count < settings.leaderboard_size or _score(profile, metric) > lowest))
+        for category, metric, count, lowest, on_board in boards
+    )
+    if significant:
+        # One job per debounce window however many edits land in it.
+        slot = int(time.time() // settings.leaderboard_debounce_seconds)
+        await job_service.enqueue(
+            db,
+            "refresh_leaderboards",
+            delay=timedelta(seconds=settings.leaderboard_debounce_seconds),
+            unique_key=f"leaderboards:{slot}",
+        )
+    return significant
+
+
+async def _load(db: AsyncSession, category: str) -> Board:
+    board = Board()
+    rows = await db.execute(
+        select(CategoryLeaderboard, InfluencerProfile)
+        .join(InfluencerProfile, InfluencerProfile.id == CategoryLeaderboard.influencer_id)
+        .where(CategoryLeaderboard.category == category)
+        .order_by(CategoryLeaderboard.metric, CategoryLeaderboard.rank)
+    )
+    for entry, profile in rows:
+        board.refreshed_at = entry.refreshed_at
+        board.entries.setdefault(entry.metric, []).append(
+            (entry.rank, entry.score, InfluencerProfileResponse.model_validate(profile))
+        )
+    return board
+
+
+@traced
+async def leaderboard(db: AsyncSession, category: str, metric: str, limit: int) -> tuple[datetime | None, list]:
+    """Top ``limit`` (rank, score, profile) entries; the profiles are shared, copy before mutating."""
+    cached = _boards.get(category)
+    if cached and cached[0] > time.monotonic():
+        metrics.CACHE_REQUESTS.inc("leaderboards", "hit")
+        board = cached[1]
+    else:
+        metrics.CACHE_REQUESTS.inc("leaderboards", "miss")
+        board = await _load(db, category)
+        if board.entries:
+            # Unknown categories aren't cached, so arbitrary names can't grow the cache.
+            _boards[category] = (time.monotonic() + settings.leaderboard_cache_seconds, board)
+    return board.refreshed_at, board.entries.get(metric, [])[:limit]
@@ -0,0 +1,140 @@
+"""In-memory index of active campaigns for the influencer matching feed.
+
+Campaigns are bucketed by (category, platform), where ``None`` stands for "any
+category". Each bucket keeps its campaigns sorted by min_followers, so the
+candidates for a profile are a bisected prefix that is then filtered on
+engagement and end date. The index is rebuilt periodically and patched in place
+when this process creates or updates a campaign; other workers catch up on
+their next rebuild.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from bisect import bisect_right, insort
+from datetime import date
+from typing import NamedTuple
+
+from sqlalchemy import any_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_factory
+from app.models import Campaign, CampaignApplication, CampaignStatus, InfluencerProfile
+from app.services.campaign_service import get_campaigns_by_ids
+from app.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+PLATFORMS = ("instagram", "tiktok", "youtube")
+
+
+class _Entry(NamedTuple):
+    min_followers: int
+    min_engagement: float
+    campaign_id: uuid.UUID
+    end_date: date | None
+
+
+class CampaignIndex:
+    def __init__(self):
+        self._buckets: dict[tuple[str | None, str], list[_Entry]] = {}
+        self._keys: dict[uuid.UUID, tuple[str | None, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def upsert(self, campaign: Campaign) -> None:
+        self.discard(campaign.id)
+        if campaign.status != CampaignStatus.active:
+            return
+        key = (campaign.category, campaign.platform.value)
+        insort(
+            self._buckets.setdefault(key, []),
+            _Entry(campaign.min_followers or 0, campaign.min_engagement_rate or 0.0, campaign.id, campaign.end_date),
+        )
+        self._keys[campaign.id] = key
+
+    def discard(self, campaign_id: uuid.UUID) -> None:
+        key = self._keys.pop(campaign_id, None)
+        if key is not None:
+            bucket = self._buckets[key]
+            bucket[:] = [e for e in bucket if e.campaign_id != campaign_id]
+
+    def match(self, profile: InfluencerProfile) -> set[uuid.UUID]:
+        platforms = ["any"] + [p for p in PLATFORMS if getattr(profile, f"{p}_handle")]
+        categories = [None, *(profile.categories or [])]
+        today = date.today()
+        # Entries sort by min_followers first; any tuple starting above the
+        # follower count bisects past every entry the profile satisfies.
+        bound = (profile.follower_count, float("inf"))
+        matched: set[uuid.UUID] = set()
+        for category in categories:
+            for platform in platforms:
+                bucket = self._buckets.get((category, platform))
+                if not bucket:
+                    continue
+                for entry in bucket[:bisect_right(bucket, bound)]:
+                    if entry.min_engagement <= profile.engagement_rate and (
+                        entry.end_date is None or entry.end_date >= today
+                    ):
+                        matched.add(entry.campaign_id)
+        return matched
+
+
+_index = CampaignIndex()
+_loaded = False
+
+
+@traced
+async def rebuild_index() -> CampaignIndex:
+    global _index, _loaded
+    async with async_session_factory() as session:
+        result = await session.execute(select(Campaign).where(Campaign.status == CampaignStatus.active))
+        index = CampaignIndex()
+        for campaign in result.scalars():
+            index.upsert(campaign)
+    _index, _loaded = index, True
+    logger.info(f"Campaign matching index rebuilt: {len(index)} active campaigns")
+    return index
+
+
+async def rebuild_periodically() -> None:
+    # The first build happens during startup warm-up.
+    while True:
+        await asyncio.sleep(settings.matching_index_refresh_seconds)
+        try:
+            await rebuild_index()
+        except Exception as e:
+            logger.warning(f"Campaign matching index rebuild failed: {e}")
+
+
+def campaign_changed(campaign: Campaign) -> None:
+    """Patch the index after a campaign is created or updated in this process."""
+    _index.upsert(campaign)
+
+
+@traced
+async def matching_campaigns(db: AsyncSession, profile: InfluencerProfile, limit: int = 50) -> list[dict]:
+    if not _loaded:
+        await rebuild_index()
+    candidates = _index.match(profile)
+    if not candidates:
+        return []
+    applied = await db.execute(
+        select(CampaignApplication.campaign_id).where(
+            CampaignApplication.influencer_id == profile.id,
+            CampaignApplication.campaign_id == any_(list(candidates)),
+        )
+    )
+    candidates.difference_update(applied.scalars())
+    items, _ = await get_campaigns_by_ids(db, list(candidates))
+    # Capacity moves with every acceptance, so it is checked on the fresh rows.
+    items = [
+        c for c in items
+        if c["status"] == CampaignStatus.active.value
+        and (c["max_influencers"] is None or c["accepted_count"] < c["max_influencers"])
+    ]
+    items.sort(key=lambda c: c["created_at"], reverse=True)
+    return items[:limit]
@@ -0,0 +1,176 @@
+"""Brand dashboard served from ``campaign_rollups``.
+
+Campaign and application writes adjust the rollup in their own transaction
+(:func:`campaign_written`, :func:`applications_moved`), so opening the
+dashboard is one indexed read by brand_id. :func:`reconcile` recounts from
+``campaign_applications`` to repair drift, e.g. from rows written by seeds or
+by hand.
+"""
+from __future__ import annotations
+
+import random
+import uuid
+from datetime import date
+
+from sqlalchemy import any_, case, func, literal, select, true, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ApplicationStatus, Campaign, CampaignApplication, CampaignRollup
+from app.tracing import traced
+
+ROLLUP_SHARDS = 8
+COUNTS = tuple(status.value for status in ApplicationStatus)
+ATTRIBUTES = ("title", "status", "budget", "price_per_influencer", "end_date")
+
+
+def _upsert_campaigns(*where):
+    """Create every shard of the matching campaigns and refresh the copied fields.
+
+    On existing rows this takes their locks, which :func:`reconcile` relies on.
+    """
+    shards = func.generate_series(0, ROLLUP_SHARDS - 1).table_valued("shard").render_derived()
+    rows = (
+        select(
+            Campaign.id,
+            shards.c.shard,
+            Campaign.brand_id,
+            *(case((shards.c.shard == 0, getattr(Campaign, name))) for name in ATTRIBUTES),
+        )
+        .select_from(Campaign)
+        .join(shards, true())
+        .where(*where)
+        .order_by(Campaign.id, shards.c.shard)
+    )
+    stmt = insert(CampaignRollup).from_select(
+        ["campaign_id", "shard", "brand_id", *ATTRIBUTES], rows, include_defaults=False
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[CampaignRollup.campaign_id, CampaignRollup.shard],
+        set_={name: stmt.excluded[name] for name in ("brand_id", *ATTRIBUTES)} | {"updated_at": func.now()},
+    )
+
+
+async def campaign_written(db: AsyncSession, campaign_id: uuid.UUID) -> None:
+    await db.execute(_upsert_campaigns(Campaign.id == campaign_id))
+
+
+async def applications_moved(db: AsyncSession, campaign_id: uuid.UUID, changes: dict[ApplicationStatus, int]) -> None:
+    """Add ``changes`` (status -> delta) to one random shard of the campaign's rollup."""
+    deltas = {status.value: delta for status, delta in changes.items() if delta}
+    if not deltas:
+        return
+    rows = select(
+        Campaign.id,
+        literal(random.randrange(ROLLUP_SHARDS)),
+        Campaign.brand_id,
+        *(literal(delta) for delta in deltas.values()),
+    ).where(Campaign.id == campaign_id)
+    stmt = insert(CampaignRollup).from_select(
+        ["campaign_id", "shard", "brand_id", *deltas], rows, include_defaults=False
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CampaignRollup.campaign_id, CampaignRollup.shard],
+            set_={name: getattr(CampaignRollup, name) + stmt.excluded[name] for name in deltas},
+        )
+    )
+
+
+async def application_counts(db: AsyncSession, campaign_id: uuid.UUID) -> dict[str, int]:
+    """Per-status application totals of one campaign, summed across its shards."""
+    row = (
+        await db.execute(
+            select(*(func.coalesce(func.sum(getattr(CampaignRollup, name)), 0) for name in COUNTS))
+            .where(CampaignRollup.campaign_id == campaign_id)
+        )
+    ).one()
+    return dict(zip(COUNTS, row))
+
+
+@traced
+async def dashboard(db: AsyncSession, brand_id: uuid.UUID) -> dict:
+    rows = (await db.execute(select(CampaignRollup).where(CampaignRollup.brand_id == brand_id))).scalars()
+    campaigns: dict[uuid.UUID, dict] = {}
+    for row in rows:
+        entry = campaigns.setdefault(row.campaign_id, {"campaign_id": row.campaign_id, **dict.fromkeys(COUNTS, 0)})
+        for name in COUNTS:
+            entry[name] += getattr(row, name)
+        if row.shard == 0:
+            entry.update({name: getattr(row, name) for name in ATTRIBUTES})
+
+    today = date.today()
+    items = []
+    for entry in campaigns.values():
+        accepted, decided = entry["accepted"], entry["accepted"] + entry["rejected"]
+        price, budget = entry.get("price_per_influencer"), entry.get("budget")
+        committed = accepted * price if price is not None else None
+        end_date = entry.get("end_date")
+        items.append({
+            "campaign_id": entry["campaign_id"],
+            "title": entry.get("title"),
+            "status": entry["status"].value if entry.get("status") else None,
+            "applications": {name: entry[name] for name in COUNTS},
+            "total_applications": sum(entry[name] for name in COUNTS),
+            "acceptance_rate": accepted / decided if decided else None,
+            "budget": budget,
+            "price_per_influencer": price,
+            "committed_spend": committed,
+            "budget_remaining": budget - committed if budget is not None and committed is not None else None,
+            "end_date": end_date,
+            "days_remaining": max(0, (end_date - today).days) if end_date else None,
+        })
+    # Soonest deadlines first; open-ended campaigns last.
+    items.sort(key=lambda c: (c["days_remaining"] is None, c["days_remaining"] or 0, c["title"] or ""))
+
+    totals = {name: sum(c["applications"][name] for c in items) for name in COUNTS}
+    decided = totals["accepted"] + totals["rejected"]
+    return {
+        "campaigns": items,
+        "applications": totals,
+        "acceptance_rate": totals["accepted"] / decided if decided else None,
+        "committed_spend": sum(c["committed_spend"] for c in items if c["committed_spend"] is not None),
+        "budget": sum(c["budget"] for c in items if c["budget"] is not None),
+    }
+
+
+@traced
+async def reconcile(db: AsyncSession, campaign_ids: list[uuid.UUID]) -> int:
+    """Recount the given campaigns from their applications; returns how many had drifted.
+
+    The upsert first locks every shard row of the batch, so writers that
+    commit during the recount wait and then apply their deltas on top of it.
+    """
+    await db.execute(_upsert_campaigns(Campaign.id == any_(campaign_ids)))
+    current = {
+        row[0]: tuple(row[1:])
+        for row in await db.execute(
+            select(CampaignRollup.campaign_id, *(func.sum(getattr(CampaignRollup, name)) for name in COUNTS))
+            .where(CampaignRollup.campaign_id == any_(campaign_ids))
+            .group_by(CampaignRollup.campaign_id)
+        )
+    }
+    exact = {campaign_id: dict.fromkeys(COUNTS, 0) for campaign_id in campaign_ids}
+    for campaign_id, status, count in await db.execute(
+        select(CampaignApplication.campaign_id, CampaignApplication.status, func.count())
+        .where(CampaignApplication.campaign_id == any_(campaign_ids))
+        .group_by(CampaignApplication.campaign_id, CampaignApplication.status)
+    ):
+        exact[campaign_id][status.value] = count
+
+    drifted = [
+        campaign_id for campaign_id, counts in exact.items()
+        if campaign_id in current and current[campaign_id] != tuple(counts[name] for name in COUNTS)
+    ]
+    if drifted:
+        await db.execute(
+            update(CampaignRollup)
+            .where(CampaignRollup.campaign_id == any_(drifted), CampaignRollup.shard != 0)
+            .values(dict.fromkeys(COUNTS, 0))
+        )
+        # ORM bulk UPDATE by primary key: one executemany for the batch.
+        await db.execute(
+            update(CampaignRollup),
+            [{"campaign_id": campaign_id, "shard": 0, **exact[campaign_id]} for campaign_id in drifted],
+        )
+    return len(drifted)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import any_, delete, event, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import metrics
+from app.config import settings
+from app.models import InfluencerProfile, Role, saved_influencers
+from app.pagination import decode_cursor, encode_cursor
+from app.projections import FULL, Fieldset, load_options
+from app.services.brand_service import get_brand_id
+from app.tracing import traced
+
+# Per-process cache. Saved sets are patched in place once a write made through
+# this process commits, and expire after SAVED_CACHE_TTL_SECONDS so writes from
+# other workers show up eventually.
+_saved_sets: dict[uuid.UUID, tuple[float, frozenset[uuid.UUID]]] = {}
+
+
+@traced
+async def get_saved_ids(db: AsyncSession, brand_id: uuid.UUID) -> frozenset[uuid.UUID]:
+    cached = _saved_sets.get(brand_id)
+    if cached and cached[0] > time.monotonic():
+        metrics.CACHE_REQUESTS.inc("saved_ids", "hit")
+        return cached[1]
+    metrics.CACHE_REQUESTS.inc("saved_ids", "miss")
+    result = await db.execute(
+        select(saved_influencers.c.influencer_id).where(saved_influencers.c.brand_id == brand_id)
+    )
+    ids = frozenset(result.scalars())
+    # Not while this transaction has uncommitted saved-set writes, which a rollback would undo.
+    if "saved_cache_patches" not in db.sync_session.info:
+        _saved_sets[brand_id] = (time.monotonic() + settings.saved_cache_ttl_seconds, ids)
+    return ids
+
+
+async def saved_ids_for_user(db: AsyncSession, user_id: uuid.UUID, role: str) -> frozenset[uuid.UUID] | None:
+    """Saved set of a brand user, or None for anyone else."""
+    if role != Role.brand.value:
+        return None
+    brand_id = await get_brand_id(db, user_id)
+    if brand_id is None:
+        return None
+    return await get_saved_ids(db, brand_id)
+
+
+async def saved_ids_for_token(db: AsyncSession, payload: dict | None) -> frozenset[uuid.UUID] | None:
+    if not payload:
+        return None
+    return await saved_ids_for_user(db, uuid.UUID(payload["sub"]), payload.get("role"))
+
+
+def _patch_cache(
+    db: AsyncSession, brand_id: uuid.UUID, added: set[uuid.UUID] = frozenset(), removed: set[uuid.UUID] = frozenset()
+) -> None:
+    """Queue a cache patch that is applied only if ``db``'s transaction commits."""
+    db.sync_session.info.setdefault("saved_cache_patches", []).append((brand_id, added, removed))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_cache_patches(session: Session) -> None:
+    for brand_id, added, removed in session.info.pop("saved_cache_patches", ()):
+        cached = _saved_sets.get(brand_id)
+        if cached:
+            _saved_sets[brand_id] = (cached[0], (cached[1] | added) - removed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_cache_patches(session: Session) -> None:
+    session.info.pop("saved_cache_patches", None)
+
+
+@traced
+async def save_influencers(db: AsyncSession, brand_id: uuid.UUID, influencer_ids: list[uuid.UUID]) -> int:
+    """Save many influencers in one statement; unknown or already-saved ids are skipped."""
+    result = await db.execute(
+        insert(saved_influencers)
+        .from_select(
+            ["brand_id", "influencer_id"],
+            select(literal(brand_id, UUID(as_uuid=True)), InfluencerProfile.id).where(
+                InfluencerProfile.id == any_(influencer_ids)
+            ),
+        )
+        .on_conflict_do_nothing()
+        .returning(saved_influencers.c.influencer_id)
+    )
+    added = set(result.scalars())
+    _patch_cache(db, brand_id, added=added)
+    return len(added)
+
+
+@traced
+async def unsave_influencers(db: AsyncSession, brand_id: uuid.UUID, influencer_ids: list[uuid.UUID]) -> int:
+    result = await db.execute(
+        delete(saved_influencers)
+        .where(
+            saved_influencers.c.brand_id == brand_id,
+            saved_influencers.c.influencer_id == any_(influencer_ids),
+        )
+        .returning(saved_influencers.c.influencer_id)
+    )
+    removed = set(result.scalars())
+    _patch_cache(db, brand_id, removed=removed)
+    return len(removed)
+
+
+@traced
+async def list_saved(
+    db: AsyncSession, brand_id: uuid.UUID, cursor: str | None = None, limit: int = 50, fields: Fieldset = FULL
+) -> tuple[list[InfluencerProfile], str | None]:
+    """Newest-first page of saved influencers using a (created_at, influencer_id) keyset."""
+    query = (
+        select(InfluencerProfile, saved_influencers.c.created_at)
+        .options(*load_options(InfluencerProfile, fields))
+        .join(saved_influencers, saved_influencers.c.influencer_id == InfluencerProfile.id)
+        .where(saved_influencers.c.brand_id == brand_id)
+    )
+    if cursor:
+        created_at, influencer_id = decode_cursor(cursor, datetime.fromisoformat, uuid.UUID)
+        query = query.where(
+            tuple_(saved_influencers.c.created_at, saved_influencers.c.influencer_id)
+            < tuple_(created_at, influencer_id)
+        )
+    query = query.order_by(
+        saved_influencers.c.created_at.desc(), saved_influencers.c.influencer_id.desc()
+    ).limit(limit + 1)
+    rows = (await db.execute(query)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last, created_at = rows[-1]
+        next_cursor = encode_cursor([created_at.isoformat(), str(last.id)])
+    return [profile for profile, _ in rows], next_cursor
+
+
+def mark_saved(items: list, saved_ids: frozenset[uuid.UUID] | None) -> list:
+    """Set is_saved on serialized profiles; leaves it unset for non-brand callers."""
+    if saved_ids is not None:
+        for item in items:
+            item.is_saved = item.id in saved_ids
+    return items
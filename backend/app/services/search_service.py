@@ -1,72 +1,216 @@
+"""Natural-language search and campaign recommendations.
+
+Both are coalesced: identical calls that arrive while one is already running
+wait for it instead of repeating the same SQL and LLM work (singleflight).
+The shared execution runs in its own task with its own session, so a caller
+that disconnects or times out cancels only its own wait; the execution is
+cancelled only once nobody is waiting for it any more.
+
+With SPECULATIVE_SEARCH on, natural search starts the SQL for the rule-based
+interpretation while the LLM interprets the query. When both agree the
+already-running result is used; otherwise it is discarded.
+"""
 from __future__ import annotations
 
+import asyncio
+import json
+import time
 import uuid
+from typing import Any, Awaitable, Callable
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app import metrics
+from app.config import settings
+from app.database import async_session_factory
 from app.models import Campaign, InfluencerProfile
-from app.services.ai_service import interpret_search_query, recommend_influencers_for_campaign
-
-
-async def natural_search(db: AsyncSession, query: str) -> dict:
-    filters = await interpret_search_query(query)
-
-    stmt = select(InfluencerProfile)
-
-    if filters.get("category"):
-        stmt = stmt.where(InfluencerProfile.categories.any(filters["category"]))
-    if filters.get("min_followers"):
-        stmt = stmt.where(InfluencerProfile.follower_count >= filters["min_followers"])
-    if filters.get("max_followers"):
-        stmt = stmt.where(InfluencerProfile.follower_count <= filters["max_followers"])
-    if filters.get("min_engagement"):
-        stmt = stmt.where(InfluencerProfile.engagement_rate >= filters["min_engagement"])
-    if filters.get("location"):
-        stmt = stmt.where(InfluencerProfile.location.ilike(f"%{filters['location']}%"))
-    if filters.get("platform") == "instagram":
-        stmt = stmt.where(InfluencerProfile.instagram_handle.isnot(None))
-    elif filters.get("platform") == "tiktok":
-        stmt = stmt.where(InfluencerProfile.tiktok_handle.isnot(None))
-    elif filters.get("platform") == "youtube":
-        stmt = stmt.where(InfluencerProfile.youtube_handle.isnot(None))
-    if filters.get("min_authenticity"):
-        stmt = stmt.where(InfluencerProfile.authenticity_score >= filters["min_authenticity"])
-
-    count_q = select(func.count()).select_from(stmt.subquery())
-    total = (await db.execute(count_q)).scalar()
-
-    stmt = stmt.order_by(InfluencerProfile.follower_count.desc()).limit(20)
-    result = await db.execute(stmt)
-    influencers = result.scalars().all()
+from app.locations import normalize_city, normalize_country
+from app.projections import FULL, Fieldset, load_options
+from app.services.ai_service import interpret_search_query, mock_interpret, recommend_influencers_for_campaign
+from app.services.influencer_service import apply_filters, facet_counts
+from app.tracing import traced
 
-    return {
-        "query": query,
-        "interpreted_filters": filters,
-        "results": influencers,
-        "total": total,
-    }
+
+def _text(value: Any) -> str | None:
+    return str(value).strip() or None if value else None
+
+
+def _countries(value: Any) -> str | list[str] | None:
+    if not value:
+        return None
+    codes = sorted({normalize_country(c) or str(c).upper() for c in ([value] if isinstance(value, str) else value)})
+    return codes[0] if len(codes) == 1 else codes
 
 
-async def get_recommendations(db: AsyncSession, campaign_id: uuid.UUID) -> dict:
-    campaign_result = await db.execute(select(Campaign).where(Campaign.id == campaign_id))
-    campaign = campaign_result.scalar_one_or_none()
-    if not campaign:
-        raise ValueError("Campaign not found")
+def _search_filters(filters: dict) -> dict:
+    """The interpreter's filters in the exact form the SQL runs with.
+
+    Interpreters spell values as they like ("Fashion", "Instagram"); stored
+    categories and platform names are lowercase. Free-text location keeps its
+    case, which parse_location reads ("LA" the city, "la" not a country).
+    """
+    category, platform = _text(filters.get("category")), _text(filters.get("platform"))
+    return {
+        "category": category and category.lower(),
+        "min_followers": filters.get("min_followers") or None,
+        "max_followers": filters.get("max_followers") or None,
+        "min_engagement": filters.get("min_engagement") or None,
+        "location": _text(filters.get("location")),
+        "city": normalize_city(_text(filters.get("city"))),
+        "country": _countries(filters.get("country")),
+        "platform": platform and platform.lower(),
+        "min_authenticity": filters.get("min_authenticity") or None,
+    }
 
-    stmt = select(InfluencerProfile)
-    if campaign.category:
-        stmt = stmt.where(InfluencerProfile.categories.any(campaign.category))
-    if campaign.min_followers:
-        stmt = stmt.where(InfluencerProfile.follower_count >= campaign.min_followers)
-    if campaign.min_engagement_rate:
-        stmt = stmt.where(InfluencerProfile.engagement_rate >= campaign.min_engagement_rate)
 
-    stmt = stmt.where(InfluencerProfile.authenticity_score >= 70)
-    stmt = stmt.order_by(InfluencerProfile.engagement_rate.desc()).limit(10)
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
 
-    result = await db.execute(stmt)
-    influencers = result.scalars().all()
+_flights: dict[tuple, _Flight] = {}
+
+
+async def _coalesce(operation: str, key: Any, fn: Callable[[], Awaitable[Any]]) -> Any:
+    """Run ``fn`` once for all concurrent callers with the same ``(operation, key)``.
+
+    Raises TimeoutError if the shared call takes longer than SINGLEFLIGHT_TIMEOUT_SECONDS.
+    """
+    flight_key = (operation, key)
+    flight = _flights.get(flight_key)
+    if flight is None:
+        flight = _flights[flight_key] = _Flight(asyncio.create_task(fn()))
+        flight.task.add_done_callback(lambda _: _land(flight_key, flight))
+        metrics.COALESCED_CALLS.inc(operation, "leader")
+    else:
+        metrics.COALESCED_CALLS.inc(operation, "follower")
+    flight.waiters += 1
+    try:
+        return await asyncio.wait_for(asyncio.shield(flight.task), settings.singleflight_timeout_seconds)
+    except asyncio.TimeoutError:
+        metrics.COALESCE_TIMEOUTS.inc(operation)
+        raise
+    finally:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            _land(flight_key, flight)
+            flight.task.cancel()
+
+
+def _land(flight_key: tuple, flight: _Flight) -> None:
+    # Later callers start a fresh flight rather than joining a finished or cancelled one.
+    if _flights.get(flight_key) is flight:
+        del _flights[flight_key]
+
+
+def _filters_key(filters: dict) -> str:
+    """Key of the :func:`_search_filters` output exactly as it runs: equal keys, equal rows."""
+    return json.dumps({name: value for name, value in filters.items() if value is not None}, sort_keys=True)
+
+
+def _normalize_query(query: str) -> str:
+    # Whitespace only: the interpreters read case ("US" the country, "us" the pronoun).
+    return " ".join(query.split())
+
+
+async def _run_filters(filters: dict, facets: bool, fields: Fieldset) -> dict:
+    async with async_session_factory() as db:
+        stmt = apply_filters(select(InfluencerProfile), **filters)
+
+        count_q = select(func.count()).select_from(stmt.subquery())
+        total = (await db.execute(count_q)).scalar()
+
+        stmt = (
+            stmt.options(*load_options(InfluencerProfile, fields))
+            .order_by(InfluencerProfile.follower_count.desc())
+            .limit(20)
+        )
+        result = await db.execute(stmt)
+        influencers = result.scalars().all()
+
+        return {
+            "results": influencers,
+            "total": total,
+            "facets": await facet_counts(db, **filters) if facets else None,
+        }
+
+
+async def _search(search_filters: dict, facets: bool, fields: Fieldset) -> dict:
+    key = (_filters_key(search_filters), facets, fields.fields)
+    return await _coalesce("natural_search", key, lambda: _run_filters(search_filters, facets, fields))
+
+
+async def _timed(awaitable: Awaitable[Any]) -> tuple[Any, float]:
+    result = await awaitable
+    return result, time.perf_counter()
+
+
+async def _speculative_search(query: str, key: str, facets: bool, fields: Fieldset) -> tuple[dict, dict]:
+    start = time.perf_counter()
+    guess = _search_filters(mock_interpret(query))
+    speculative = asyncio.create_task(_timed(_search(guess, facets, fields)))
+    try:
+        filters = await _coalesce("interpret", key, lambda: interpret_search_query(query))
+    except BaseException:
+        speculative.cancel()
+        raise
+    interpreted = time.perf_counter()
+    search_filters = _search_filters(filters)
+    # Only the filters that actually run decide a hit, so the rows always match interpreted_filters.
+    if search_filters == guess:
+        found, finished = await speculative
+        metrics.SPECULATIVE_SEARCHES.inc("hit")
+        # Sequential would have started the SQL only now; the overlap is what was saved.
+        metrics.SPECULATIVE_SAVED_SECONDS.observe(min(finished, interpreted) - start)
+        return filters, found
+    speculative.cancel()
+    metrics.SPECULATIVE_SEARCHES.inc("miss")
+    return filters, await _search(search_filters, facets, fields)
+
+
+@traced
+async def natural_search(query: str, facets: bool = False, fields: Fieldset = FULL) -> dict:
+    """Interpret ``query`` and run it; interpretation is shared per normalized query
+    text and the SQL per normalized filter set, so differently worded queries
+    that mean the same thing still share one execution."""
+    start = time.perf_counter()
+    key = _normalize_query(query)
+    # Without an API key the interpretation is the rule-based one, so there is nothing to race.
+    if settings.speculative_search and settings.openai_api_key:
+        filters, found = await _speculative_search(query, key, facets, fields)
+        mode = "speculative"
+    else:
+        filters = await _coalesce("interpret", key, lambda: interpret_search_query(query))
+        found = await _search(_search_filters(filters), facets, fields)
+        mode = "sequential"
+    metrics.NATURAL_SEARCH_DURATION.observe(time.perf_counter() - start, mode)
+    return {"query": query, "interpreted_filters": filters, **found}
+
+
+async def _recommend(campaign_id: uuid.UUID) -> dict:
+    async with async_session_factory() as db:
+        campaign_result = await db.execute(select(Campaign).where(Campaign.id == campaign_id))
+        campaign = campaign_result.scalar_one_or_none()
+        if not campaign:
+            raise ValueError("Campaign not found")
+
+        stmt = select(InfluencerProfile)
+        if campaign.category:
+            stmt = stmt.where(InfluencerProfile.categories.any(campaign.category))
+        if campaign.min_followers:
+            stmt = stmt.where(InfluencerProfile.follower_count >= campaign.min_followers)
+        if campaign.min_engagement_rate:
+            stmt = stmt.where(InfluencerProfile.engagement_rate >= campaign.min_engagement_rate)
+
+        stmt = stmt.where(InfluencerProfile.authenticity_score >= 70)
+        stmt = stmt.order_by(InfluencerProfile.engagement_rate.desc()).limit(10)
+
+        result = await db.execute(stmt)
+        influencers = result.scalars().all()
 
     reasoning = await recommend_influencers_for_campaign(
         campaign_title=campaign.title,
@@ -79,3 +223,8 @@ async def get_recommendations(db: AsyncSession, campaign_id: uuid.UUID) -> dict:
         "recommendations": influencers,
         "reasoning": reasoning,
     }
+
+
+@traced
+async def get_recommendations(campaign_id: uuid.UUID) -> dict:
+    return await _coalesce("recommendations", campaign_id, lambda: _recommend(campaign_id))
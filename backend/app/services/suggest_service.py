@@ -0,0 +1,239 @@
+"""Typeahead over influencer names and handles from an in-memory sorted array.
+
+Every profile contributes a few lowercase keys (full display name, each later
+word of it, and each handle without ``@``). The keys live in one sorted list
+with a parallel list of profile ids, so a prefix is a contiguous range found
+by two bisects. Prefixes of up to ``SHORT_PREFIX`` characters can span a large
+share of the table; their best-followed profiles are precomputed at build
+time, so every lookup touches either a tiny range or a ready-made list.
+
+The big arrays are never edited in place. A profile edit empties the old
+slot (a tombstone lookups skip) and files the new keys in a small sorted
+delta that lookups merge in; the next rebuild folds both away.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import sys
+import time
+import uuid
+from bisect import bisect_left, insort
+from itertools import groupby
+from typing import NamedTuple
+
+from sqlalchemy import select
+
+from app import metrics
+from app.config import settings
+from app.database import async_session_factory
+from app.models import InfluencerProfile
+from app.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+SHORT_PREFIX = 3
+# Short-prefix lists keep spare entries so removals rarely leave them short of
+# a full page before the next rebuild.
+TOP_K = 20
+HANDLES = ("instagram_handle", "tiktok_handle", "youtube_handle")
+
+
+class _Profile(NamedTuple):
+    id: uuid.UUID
+    display_name: str
+    avatar_url: str | None
+    keys: tuple[str, ...]
+    handles: tuple[str | None, ...]
+
+
+def normalize(text: str) -> str:
+    return text.strip().lstrip("@").lower()
+
+
+def _keys(display_name: str, handles: tuple[str | None, ...]) -> tuple[str, ...]:
+    name = normalize(display_name or "")
+    words = name.split()
+    keys = {name, *(" ".join(words[i:]) for i in range(1, len(words)))}
+    keys.update(normalize(h) for h in handles if h)
+    keys.discard("")
+    return tuple(sorted(keys))
+
+
+class SuggestIndex:
+    """Profiles are addressed by integer slot: hashing and ranking ints stays in C."""
+
+    def __init__(self, rows):
+        self._profiles: list[_Profile | None] = []
+        self._followers: list[int] = []
+        self._slots: dict[uuid.UUID, int] = {}
+        entries: list[tuple[str, int]] = []
+        for profile_id, display_name, avatar_url, follower_count, *handles in rows:
+            slot = self._add(profile_id, display_name, avatar_url, follower_count, handles)
+            entries.extend((key, slot) for key in self._profiles[slot].keys)
+        entries.sort()
+        self._keys = [key for key, _ in entries]
+        self._entry_slots = [slot for _, slot in entries]
+        self._delta: list[tuple[str, int]] = []
+        self._top = self._build_top()
+
+    def _add(self, profile_id, display_name, avatar_url, follower_count, handles) -> int:
+        handles = tuple(handles)
+        self._slots[profile_id] = slot = len(self._profiles)
+        self._profiles.append(_Profile(profile_id, display_name, avatar_url, _keys(display_name, handles), handles))
+        self._followers.append(follower_count or 0)
+        return slot
+
+    def _rank(self, slots, k: int = TOP_K) -> list[int]:
+        live = {slot for slot in slots if self._profiles[slot] is not None}
+        return heapq.nlargest(k, live, key=self._followers.__getitem__)
+
+    def _build_top(self) -> dict[str, list[int]]:
+        # Keys are sorted, so each SHORT_PREFIX group is one contiguous run;
+        # rank each run once and merge the winners up into shorter prefixes.
+        groups: dict[str, list[int]] = {}
+        start = 0
+        for group, run in groupby(self._keys, key=lambda key: key[:SHORT_PREFIX]):
+            end = start + sum(1 for _ in run)
+            groups[group] = self._rank(self._entry_slots[start:end])
+            start = end
+        merged: dict[str, list[int]] = {}
+        for group, slots in groups.items():
+            for length in range(1, len(group) + 1):
+                merged.setdefault(group[:length], []).extend(slots)
+        return {prefix: self._rank(slots) for prefix, slots in merged.items()}
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._delta)
+
+    def memory_bytes(self) -> int:
+        """Approximate footprint: containers, keys and per-profile records."""
+        containers = (self._keys, self._entry_slots, self._delta, self._profiles, self._followers, self._slots)
+        size = sum(sys.getsizeof(c) for c in containers)
+        size += sum(sys.getsizeof(k) for k in self._keys)
+        size += sum(sys.getsizeof(entry) + sys.getsizeof(entry[0]) for entry in self._delta)
+        size += sum(sys.getsizeof(p) + sys.getsizeof(p.keys) + sys.getsizeof(p.id) for p in self._profiles if p)
+        size += sys.getsizeof(self._top) + sum(sys.getsizeof(slots) for slots in self._top.values())
+        return size
+
+    def suggest(self, prefix: str, limit: int) -> list[dict]:
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        if len(prefix) <= SHORT_PREFIX:
+            slots = [slot for slot in self._top.get(prefix, ()) if self._profiles[slot] is not None][:limit]
+        else:
+            lo = bisect_left(self._keys, prefix)
+            hi = bisect_left(self._keys, prefix + "\uffff", lo)
+            delta_lo = bisect_left(self._delta, (prefix,))
+            delta_hi = bisect_left(self._delta, (prefix + "\uffff",), delta_lo)
+            edited = (slot for _, slot in self._delta[delta_lo:delta_hi])
+            slots = self._rank([*self._entry_slots[lo:hi], *edited], limit)
+        return [self._suggestion(slot, prefix) for slot in slots]
+
+    def _suggestion(self, slot: int, prefix: str) -> dict:
+        profile = self._profiles[slot]
+        handle = next((h for h in profile.handles if h and normalize(h).startswith(prefix)), None)
+        return {
+            "id": profile.id,
+            "display_name": profile.display_name,
+            "matched_handle": handle,
+            "avatar_url": profile.avatar_url,
+            "follower_count": self._followers[slot],
+        }
+
+    def remove(self, profile_id: uuid.UUID) -> None:
+        # Its key entries stay behind as tombstones; lookups skip empty slots.
+        slot = self._slots.pop(profile_id, None)
+        if slot is not None:
+            self._profiles[slot] = None
+
+    def upsert(self, profile_id: uuid.UUID, display_name: str, avatar_url: str | None, follower_count: int, handles) -> None:
+        # The old slot is left empty rather than reused; rebuilds compact it.
+        self.remove(profile_id)
+        slot = self._add(profile_id, display_name, avatar_url, follower_count, handles)
+        for key in self._profiles[slot].keys:
+            insort(self._delta, (key, slot))
+            for length in range(1, min(len(key), SHORT_PREFIX) + 1):
+                prefix = key[:length]
+                self._top[prefix] = self._rank([*self._top.get(prefix, ()), slot])
+
+
+_index: SuggestIndex | None = None
+_build_lock = asyncio.Lock()
+# One buffer per rebuild in flight: edits it may have read too early to see.
+_pending: list[list[tuple]] = []
+
+
+def _report(index: SuggestIndex) -> None:
+    metrics.INMEMORY_INDEX_ENTRIES.set(len(index), "suggest")
+    metrics.INMEMORY_INDEX_BYTES.set(index.memory_bytes(), "suggest")
+
+
+@traced
+async def rebuild_index() -> SuggestIndex:
+    global _index
+    start = time.perf_counter()
+    edits: list[tuple] = []
+    _pending.append(edits)
+    try:
+        async with async_session_factory() as session:
+            rows = (
+                await session.execute(
+                    select(
+                        InfluencerProfile.id,
+                        InfluencerProfile.display_name,
+                        InfluencerProfile.avatar_url,
+                        InfluencerProfile.follower_count,
+                        *(getattr(InfluencerProfile, h) for h in HANDLES),
+                    )
+                )
+            ).all()
+        # Sorting a few million keys is CPU-bound; keep it off the event loop.
+        index = await asyncio.to_thread(SuggestIndex, rows)
+        await asyncio.to_thread(_report, index)
+    finally:
+        _pending.remove(edits)
+    # Replay and swap with no await in between, so no edit can slip past both.
+    for edit in edits:
+        index.upsert(*edit)
+    _index = index
+    logger.info(f"Suggest index rebuilt: {len(index)} keys in {time.perf_counter() - start:.2f}s")
+    return index
+
+
+async def rebuild_periodically() -> None:
+    # The first build happens during startup warm-up.
+    while True:
+        await asyncio.sleep(settings.suggest_index_refresh_seconds)
+        try:
+            await rebuild_index()
+        except Exception as e:
+            logger.warning(f"Suggest index rebuild failed: {e}")
+
+
+def profile_changed(profile: InfluencerProfile) -> None:
+    """Patch the index after a profile is edited in this process."""
+    edit = (
+        profile.id,
+        profile.display_name,
+        profile.avatar_url,
+        profile.follower_count,
+        tuple(getattr(profile, h) for h in HANDLES),
+    )
+    for edits in _pending:
+        edits.append(edit)
+    if _index is None:
+        return
+    _index.upsert(*edit)
+    metrics.INMEMORY_INDEX_ENTRIES.set(len(_index), "suggest")
+
+
+@traced
+async def suggest(prefix: str, limit: int = 10) -> list[dict]:
+    index = _index
+    if index is None:
+        async with _build_lock:
+            index = _index or await rebuild_index()
+    return index.suggest(prefix, limit)
@@ -0,0 +1,291 @@
+"""Versioned, memory-mapped columnar snapshot of the searchable influencer fields.
+
+``python -m app.snapshot`` (or the ``build_search_snapshot`` job) writes one
+``.npy`` file per column into ``SNAPSHOT_DIR/<version>/``, then repoints
+``SNAPSHOT_DIR/CURRENT`` with an atomic rename. API workers map the current
+version read-only, so N workers share a single copy in the page cache. They
+re-read ``CURRENT`` at most every SNAPSHOT_CHECK_SECONDS and swap to a new
+version without a restart. Old versions are removed after a few rebuilds; a
+worker still mapping one keeps its pages until it swaps, because unlinking does
+not invalidate an open mapping. The builder and the API workers must see the
+same SNAPSHOT_DIR: one host, or a volume shared between containers.
+
+Filtering is a boolean mask over the columns; sorting walks a row order
+precomputed per sortable column, so a page costs a few milliseconds at a
+million profiles and only the page's ids go back to Postgres for full rows.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import select
+
+from app import metrics
+from app.config import settings
+from app.database import async_session_factory
+from app.locations import normalize_city, normalize_country, parse_location
+from app.models import InfluencerProfile
+from app.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+CURRENT = "CURRENT"
+VERSION_FORMAT = "%Y%m%dT%H%M%S%fZ"
+ORDER_BLOCK = 65_536
+PLATFORM_BITS = {"instagram": 1, "tiktok": 2, "youtube": 4}
+SORTABLE = ("follower_count", "engagement_rate", "authenticity_score", "price_per_post")
+# Filters a snapshot can answer; anything else (e.g. full-text q) goes to SQL.
+SUPPORTED_FILTERS = {
+    "category", "min_followers", "max_followers", "min_engagement", "location", "platform",
+    "min_authenticity", "city", "country",
+}
+
+
+def _category_rows(codes: np.ndarray, rows: np.ndarray, count: int) -> dict[str, np.ndarray]:
+    """Inverted index: the rows of category ``c`` are ``category_rows[offsets[c]:offsets[c + 1]]``."""
+    order = np.argsort(codes, kind="stable")
+    return {
+        "category_rows": rows[order],
+        "category_offsets": np.searchsorted(codes[order], np.arange(count + 1)).astype(np.int64),
+    }
+
+
+def _sort_orders(columns: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Row numbers by each sortable column descending, NULLs (NaN) first as with Postgres DESC."""
+    orders = {}
+    for name in SORTABLE:
+        keys = np.nan_to_num(-columns[name].astype(np.float64), nan=-np.inf)
+        orders[f"order_{name}"] = np.argsort(keys, kind="stable").astype(np.int32)
+    return orders
+
+
+def _write_version(root: str, version: str, columns: dict[str, np.ndarray], dictionaries: dict) -> None:
+    columns = {**columns, **_sort_orders(columns)}
+    tmp = os.path.join(root, f".{version}.tmp")
+    os.makedirs(tmp, exist_ok=True)
+    for name, array in columns.items():
+        np.save(os.path.join(tmp, f"{name}.npy"), array, allow_pickle=False)
+    with open(os.path.join(tmp, "dictionaries.json"), "w") as f:
+        json.dump(dictionaries, f)
+    os.replace(tmp, os.path.join(root, version))
+    pointer = os.path.join(root, f".{CURRENT}.tmp")
+    with open(pointer, "w") as f:
+        f.write(version)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(pointer, os.path.join(root, CURRENT))
+    _prune(root, keep=settings.snapshot_keep_versions)
+
+
+@traced
+async def build(chunk_size: int = 10_000) -> str:
+    """Write a new snapshot version from the database and make it current."""
+    version = datetime.now(timezone.utc).strftime(VERSION_FORMAT)
+    start = time.perf_counter()
+
+    ids, followers, engagement, authenticity, price = [], [], [], [], []
+    platforms, countries, cities, cat_codes, cat_rows = [], [], [], [], []
+    country_codes: dict[str, int] = {}
+    city_codes: dict[str, int] = {}
+    category_codes: dict[str, int] = {}
+    query = select(
+        InfluencerProfile.id,
+        InfluencerProfile.follower_count,
+        InfluencerProfile.engagement_rate,
+        InfluencerProfile.authenticity_score,
+        InfluencerProfile.price_per_post,
+        InfluencerProfile.instagram_handle.isnot(None),
+        InfluencerProfile.tiktok_handle.isnot(None),
+        InfluencerProfile.youtube_handle.isnot(None),
+        InfluencerProfile.location_country,
+        InfluencerProfile.location_city,
+        InfluencerProfile.categories,
+    ).execution_options(yield_per=chunk_size)
+
+    nan = float("nan")
+    async with async_session_factory() as session:
+        result = await session.stream(query)
+        async for rows in result.partitions():
+            for row in rows:
+                ids.append(row[0].bytes)
+                followers.append(row[1] or 0)
+                # NULL floats become NaN: every comparison with them is false, as in SQL.
+                engagement.append(nan if row[2] is None else row[2])
+                authenticity.append(nan if row[3] is None else row[3])
+                price.append(nan if row[4] is None else float(row[4]))
+                platforms.append(row[5] | row[6] << 1 | row[7] << 2)
+                countries.append(country_codes.setdefault(row[8], len(country_codes)) if row[8] else -1)
+                cities.append(city_codes.setdefault(row[9], len(city_codes)) if row[9] else -1)
+                for category in row[10] or ():
+                    cat_codes.append(category_codes.setdefault(category, len(category_codes)))
+                    cat_rows.append(len(ids) - 1)
+
+    columns = {
+        # Raw 16-byte void, not "S16", which would strip trailing NUL bytes.
+        "id": np.frombuffer(b"".join(ids), dtype="V16"),
+        "follower_count": np.array(followers, dtype=np.int64),
+        "engagement_rate": np.array(engagement, dtype=np.float64),
+        "authenticity_score": np.array(authenticity, dtype=np.float64),
+        "price_per_post": np.array(price, dtype=np.float64),
+        "platforms": np.array(platforms, dtype=np.uint8),
+        "country": np.array(countries, dtype=np.int16),
+        "city": np.array(cities, dtype=np.int32),
+        **_category_rows(np.array(cat_codes, dtype=np.int32), np.array(cat_rows, dtype=np.int32), len(category_codes)),
+    }
+    dictionaries = {"countries": list(country_codes), "cities": list(city_codes), "categories": list(category_codes)}
+    await asyncio.to_thread(_write_version, settings.snapshot_dir, version, columns, dictionaries)
+    logger.info(f"Search snapshot {version}: {len(ids)} profiles in {time.perf_counter() - start:.2f}s")
+    return version
+
+
+def _prune(root: str, keep: int) -> None:
+    versions = sorted(name for name in os.listdir(root) if not name.startswith(".") and name != CURRENT)
+    for name in versions[:-keep]:
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+class Snapshot:
+    def __init__(self, directory: str, version: str):
+        self.version = version
+        path = os.path.join(directory, version)
+        self.columns = {
+            name[:-4]: np.load(os.path.join(path, name), mmap_mode="r", allow_pickle=False)
+            for name in os.listdir(path)
+            if name.endswith(".npy")
+        }
+        with open(os.path.join(path, "dictionaries.json")) as f:
+            dictionaries = json.load(f)
+        self.country_codes = {country: code for code, country in enumerate(dictionaries["countries"])}
+        self.city_codes = {city: code for code, city in enumerate(dictionaries["cities"])}
+        self.category_codes = {cat: code for code, cat in enumerate(dictionaries["categories"])}
+        self.built_at = datetime.strptime(version, VERSION_FORMAT).replace(tzinfo=timezone.utc)
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns.values())
+
+    def _has_category(self, category: str) -> np.ndarray:
+        mask = np.zeros(len(self), dtype=bool)
+        code = self.category_codes.get(category)
+        if code is not None:
+            offsets = self.columns["category_offsets"]
+            mask[self.columns["category_rows"][offsets[code]:offsets[code + 1]]] = True
+        return mask
+
+    def _mask(self, filters: dict) -> np.ndarray:
+        c = self.columns
+        mask = np.ones(len(self), dtype=bool)
+        city, country = filters.get("city"), filters.get("country")
+        if filters.get("location"):
+            # Same resolution as influencer_service._filter_predicates.
+            parsed_city, parsed_country = parse_location(filters["location"])
+            city = city or parsed_city
+            if parsed_city is None:
+                country = country or parsed_country
+        if filters.get("category"):
+            mask &= self._has_category(filters["category"])
+        if filters.get("min_followers") is not None:
+            mask &= c["follower_count"] >= filters["min_followers"]
+        if filters.get("max_followers") is not None:
+            mask &= c["follower_count"] <= filters["max_followers"]
+        if filters.get("min_engagement") is not None:
+            mask &= c["engagement_rate"] >= float(filters["min_engagement"])
+        if filters.get("min_authenticity") is not None:
+            mask &= c["authenticity_score"] >= float(filters["min_authenticity"])
+        if filters.get("platform") in PLATFORM_BITS:
+            mask &= (c["platforms"] & PLATFORM_BITS[filters["platform"]]) != 0
+        if city:
+            mask &= c["city"] == self.city_codes.get(normalize_city(city), -2)
+        if country:
+            codes = [country] if isinstance(country, str) else country
+            wanted = {self.country_codes.get(normalize_country(x) or x.upper(), -2) for x in codes}
+            in_countries = np.zeros(len(self), dtype=bool)
+            for code in wanted:
+                in_countries |= c["country"] == code
+            mask &= in_countries
+        return mask
+
+    def search(self, filters: dict, sort_by: str | None, offset: int, limit: int) -> tuple[list[uuid.UUID], int]:
+        """Ids of one page of matches, best first, and the total match count."""
+        mask = self._mask(filters)
+        total = int(np.count_nonzero(mask))
+        end = min(offset + limit, total)
+        if offset >= end:
+            return [], total
+        # Walk the prebuilt sort order a block at a time and stop once the page is covered.
+        order = self.columns[f"order_{sort_by or 'follower_count'}"]
+        hits, found = [], 0
+        for start in range(0, len(order), ORDER_BLOCK):
+            block = order[start:start + ORDER_BLOCK]
+            block = block[mask[block]]
+            hits.append(block)
+            found += len(block)
+            if found >= end:
+                break
+        page = np.concatenate(hits)[offset:end]
+        return [uuid.UUID(bytes=b.tobytes()) for b in self.columns["id"][page]], total
+
+
+_snapshot: Snapshot | None = None
+_checked_at = 0.0
+
+
+def _read_pointer() -> str | None:
+    try:
+        with open(os.path.join(settings.snapshot_dir, CURRENT)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def current() -> Snapshot | None:
+    """The mapped snapshot, swapped to the newest version at most every SNAPSHOT_CHECK_SECONDS."""
+    global _snapshot, _checked_at
+    if not settings.snapshot_dir:
+        return None
+    now = time.monotonic()
+    if _snapshot is not None and now - _checked_at < settings.snapshot_check_seconds:
+        return _snapshot
+    _checked_at = now
+    version = _read_pointer()
+    if version and (_snapshot is None or _snapshot.version != version):
+        try:
+            _snapshot = Snapshot(settings.snapshot_dir, version)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Loading search snapshot {version} failed: {e}")
+        else:
+            metrics.INMEMORY_INDEX_ENTRIES.set(len(_snapshot), "snapshot")
+            metrics.INMEMORY_INDEX_BYTES.set(_snapshot.nbytes, "snapshot")
+            logger.info(f"Mapped search snapshot {version} ({len(_snapshot)} profiles)")
+    return _snapshot
+
+
+def search(filters: dict, sort_by: str | None, offset: int, limit: int) -> tuple[list[uuid.UUID], int] | None:
+    """Answer from the snapshot, or None when it is disabled, missing, too old or can't express the query."""
+    if sort_by not in (None, *SORTABLE) or any(v for k, v in filters.items() if k not in SUPPORTED_FILTERS):
+        return None
+    snapshot = current()
+    if snapshot is None:
+        return None
+    if (datetime.now(timezone.utc) - snapshot.built_at).total_seconds() > settings.snapshot_max_age_seconds:
+        return None
+    return snapshot.search(filters, sort_by, offset, limit)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if not settings.snapshot_dir:
+        raise SystemExit("SNAPSHOT_DIR is not set")
+    os.makedirs(settings.snapshot_dir, exist_ok=True)
+    asyncio.run(build())
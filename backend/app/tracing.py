@@ -0,0 +1,178 @@
+"""Opt-in OpenTelemetry tracing.
+
+Tracing stays off unless TRACING_EXPORTER is set to ``console``, ``file`` or ``otlp``.
+While it is off, ``@traced`` costs one global lookup per call and no SQL hooks or
+middleware are installed. Sampling is parent-based with TRACING_SAMPLE_RATIO for
+root spans, so a low ratio keeps production overhead negligible.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from typing import Any
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_tracer = None
+
+
+def traced(fn):
+    """Wrap a service function in a span named ``<module>.<function>``."""
+    name = f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+    if asyncio.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            if _tracer is None:
+                return await fn(*args, **kwargs)
+            with _tracer.start_as_current_span(name):
+                return await fn(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _tracer is None:
+            return fn(*args, **kwargs)
+        with _tracer.start_as_current_span(name):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def set_attributes(attributes: dict[str, Any]) -> None:
+    """Attach attributes to the current span, if tracing is enabled."""
+    if _tracer is None:
+        return
+    from opentelemetry import trace
+
+    trace.get_current_span().set_attributes(attributes)
+
+
+def _build_exporter():
+    exporter = settings.tracing_exporter
+    if exporter == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter()
+    if exporter == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        # ConsoleSpanExporter writes through a formatter to any text stream;
+        # one JSON document per line keeps the file greppable.
+        return ConsoleSpanExporter(
+            out=open(settings.tracing_file_path, "a", buffering=1),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint or None)
+    raise ValueError(f"Unknown TRACING_EXPORTER: {exporter}")
+
+
+def _instrument_engine(tracer) -> None:
+    from opentelemetry import trace
+    from sqlalchemy import event
+
+    from app.database import engine
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = tracer.start_span(
+            statement.lstrip().split(" ", 1)[0].upper() or "SQL",
+            kind=trace.SpanKind.CLIENT,
+            attributes={
+                "db.system": "postgresql",
+                "db.statement": statement[:2000],
+                "db.executemany": executemany,
+            },
+        )
+        context._otel_span = span
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_otel_span", None)
+        if span is not None:
+            span.end()
+            context._otel_span = None
+
+    def handle_error(exception_context):
+        span = getattr(exception_context.execution_context, "_otel_span", None)
+        if span is not None:
+            span.record_exception(exception_context.original_exception)
+            span.set_status(trace.Status(trace.StatusCode.ERROR))
+            span.end()
+            exception_context.execution_context._otel_span = None
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
+
+
+def setup_tracing(application=None) -> bool:
+    """Install the tracer provider, SQL hooks and (given an app) the route middleware."""
+    global _tracer
+    if not settings.tracing_exporter or _tracer is not None:
+        return _tracer is not None
+
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(_build_exporter()))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("app")
+
+    _instrument_engine(_tracer)
+    if application is not None:
+        application.add_middleware(TracingMiddleware)
+    logger.info(
+        f"Tracing enabled: exporter={settings.tracing_exporter} ratio={settings.tracing_sample_ratio}"
+    )
+    return True
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span per request, named by route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _tracer is None:
+            await self.app(scope, receive, send)
+            return
+
+        from opentelemetry import propagate, trace
+
+        carrier = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with _tracer.start_as_current_span(
+            scope["method"],
+            context=propagate.extract(carrier),
+            kind=trace.SpanKind.SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    span.update_name(f"{scope['method']} {route}")
+                    span.set_attribute("http.route", route)
+                span.set_attribute("http.response.status_code", status_code)
+                if status_code >= 500:
+                    span.set_status(trace.Status(trace.StatusCode.ERROR))
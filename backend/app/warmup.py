@@ -0,0 +1,123 @@
+"""Startup warm-up: open pool connections and prime the in-process indexes,
+then mark the process ready.
+
+Each pooled connection runs the hot list, search, facet and campaign
+queries narrowed to ``WHERE false``: Postgres plans them without reading a
+row, while asyncpg still introspects every column type (enums, arrays,
+tsvector) that real requests need on that connection. The lifespan runs
+:func:`run` in the background, so ``/health`` answers immediately while
+``/ready`` fails until it finishes.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from sqlalchemy import false, select, text
+
+from app import metrics, snapshot
+from app.config import settings
+from app.database import engine
+from app.models import BrandProfile, Campaign, CampaignStatus, InfluencerProfile
+from app.services import estimate_service, matching_service, suggest_service
+from app.services.influencer_service import apply_filters, facet_query
+
+logger = logging.getLogger(__name__)
+
+ready = False
+phases: dict[str, float] = {}
+
+
+def _record(phase: str, start: float) -> None:
+    phases[phase] = round(time.perf_counter() - start, 3)
+    metrics.STARTUP_PHASE_SECONDS.set(phases[phase], phase)
+
+
+def _hot_statements() -> list:
+    campaigns = (
+        select(Campaign, BrandProfile.company_name)
+        .join(BrandProfile, Campaign.brand_id == BrandProfile.id)
+        .where(Campaign.status == CampaignStatus.active)
+        .order_by(Campaign.created_at.desc())
+    )
+    queries = [
+        select(InfluencerProfile).order_by(InfluencerProfile.follower_count.desc()),
+        apply_filters(select(InfluencerProfile), q="warmup", country=["US"]),
+        facet_query(),
+        campaigns,
+    ]
+    return [query.where(false()) for query in queries]
+
+
+async def _warm_connection(conn) -> None:
+    for statement in _hot_statements():
+        await conn.execute(statement)
+    await conn.rollback()
+
+
+async def warm_pool(count: int) -> None:
+    """Open ``count`` pooled connections at once and run the hot statements on each."""
+    connections = []
+    try:
+        for _ in range(count):
+            conn = await engine.connect()
+            connections.append(conn)
+        await asyncio.gather(*(_warm_connection(conn) for conn in connections))
+    finally:
+        for conn in connections:
+            await conn.close()
+
+
+async def prime_caches() -> None:
+    results = await asyncio.gather(
+        estimate_service.refresh_cube(),
+        matching_service.rebuild_index(),
+        suggest_service.rebuild_index(),
+        asyncio.to_thread(snapshot.current),
+        return_exceptions=True,
+    )
+    for name, result in zip(("reach cube", "matching index", "suggest index", "search snapshot"), results):
+        if isinstance(result, Exception):
+            # Each of these also builds lazily on first use.
+            logger.warning(f"Priming the {name} failed: {result}")
+
+
+async def run() -> None:
+    global ready
+    start = time.perf_counter()
+    count = min(settings.warmup_connections, settings.db_pool_size)
+    delay = 1.0
+    phase_start = time.perf_counter()
+    while True:
+        try:
+            await warm_pool(count)
+            break
+        except Exception as e:
+            logger.warning(f"Warming the connection pool failed, retrying in {delay:.0f}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+    _record("pool", phase_start)
+
+    phase_start = time.perf_counter()
+    await prime_caches()
+    _record("caches", phase_start)
+
+    _record("warmup", start)
+    ready = True
+    metrics.APP_READY.set(1)
+    logger.info(f"Warm-up finished: {phases}")
+
+
+async def check() -> bool:
+    """Ready once warm-up is done and Postgres answers within READY_CHECK_TIMEOUT_SECONDS."""
+    if not ready:
+        return False
+    try:
+        async with asyncio.timeout(settings.ready_check_timeout_seconds):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.warning(f"Readiness check failed: {e}")
+        return False
+    return True
@@ -0,0 +1,184 @@
+"""Job worker: ``python -m app.worker [--queues default=4,maintenance=1]``.
+
+Each queue gets its own poll loop that never holds more than the queue's
+concurrency limit of claimed jobs. A housekeeping loop enqueues periodic
+tasks, requeues jobs whose worker died and publishes queue depths. SIGTERM or
+SIGINT stops claiming and gives running jobs WORKER_SHUTDOWN_TIMEOUT_SECONDS
+to finish; anything still running then is recovered by the stale-lock sweep.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+import traceback
+from datetime import datetime, timezone
+
+from app import jobs, metrics, tracing  # noqa: F401  (importing jobs registers the handlers)
+from app.config import settings
+from app.database import async_session_factory
+from app.models import Job
+from app.services import job_service
+
+logger = logging.getLogger("app.worker")
+
+
+def parse_queues(spec: str) -> dict[str, int]:
+    queues = {}
+    for part in spec.split(","):
+        name, _, concurrency = part.strip().partition("=")
+        if name:
+            queues[name] = max(1, int(concurrency or 1))
+    return queues
+
+
+class Worker:
+    def __init__(self, queues: dict[str, int]):
+        self.queues = queues
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = asyncio.Event()
+        self._running: dict[str, set[asyncio.Task]] = {queue: set() for queue in queues}
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stop)
+
+        logger.info(f"Worker {self.worker_id} started: {self.queues}")
+        background = [
+            asyncio.create_task(metrics.monitor_event_loop()),
+            asyncio.create_task(self._housekeeping()),
+        ]
+        pollers = [asyncio.create_task(self._poll(queue, limit)) for queue, limit in self.queues.items()]
+
+        await self._stopping.wait()
+        logger.info("Shutting down: waiting for running jobs")
+        for task in pollers:
+            task.cancel()
+        running = [task for tasks in self._running.values() for task in tasks]
+        if running:
+            _, pending = await asyncio.wait(running, timeout=settings.worker_shutdown_timeout_seconds)
+            for task in pending:
+                task.cancel()
+        for task in background:
+            task.cancel()
+        metrics.write_snapshot()
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _poll(self, queue: str, concurrency: int) -> None:
+        running = self._running[queue]
+        while not self._stopping.is_set():
+            free = concurrency - len(running)
+            if free <= 0:
+                await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                continue
+            try:
+                async with async_session_factory() as session:
+                    claimed = await job_service.claim(session, queue, free, self.worker_id)
+                    await session.commit()
+            except Exception as e:
+                logger.warning(f"Claiming from {queue} failed: {e}")
+                await self._sleep(settings.job_poll_interval_seconds)
+                continue
+            if not claimed:
+                await self._sleep(settings.job_poll_interval_seconds)
+                continue
+            now = datetime.now(timezone.utc)
+            for job in claimed:
+                metrics.JOB_START_DELAY.observe((now - job.run_at).total_seconds(), queue)
+                task = asyncio.create_task(self._execute(job))
+                running.add(task)
+                task.add_done_callback(running.discard)
+            metrics.JOBS_RUNNING.set(len(running), queue)
+
+    async def _heartbeat(self, job: Job) -> None:
+        # A third of the timeout: two renewals can fail before the lock expires.
+        while True:
+            await asyncio.sleep(settings.job_lock_timeout_seconds / 3)
+            try:
+                async with async_session_factory() as session:
+                    owned = await job_service.heartbeat(session, job)
+                    await session.commit()
+            except Exception as e:
+                logger.warning(f"Renewing the lock of job {job.id} failed: {e}")
+                continue
+            if not owned:
+                logger.warning(f"Job {job.id} attempt {job.attempts} lost its lock while running")
+                return
+
+    async def _execute(self, job: Job) -> None:
+        definition = job_service.TASKS.get(job.task)
+        start = time.perf_counter()
+        outcome = "succeeded"
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            if definition is None:
+                raise LookupError(f"Unknown task {job.task!r}")
+            try:
+                await definition.fn(job.payload)
+            finally:
+                # Stop renewing before the outcome lands, or a late renewal reads as a lost lock.
+                heartbeat.cancel()
+        except Exception as e:
+            logger.warning(f"Job {job.id} ({job.task}) attempt {job.attempts} failed: {e}")
+            async with async_session_factory() as session:
+                retried = await job_service.fail(session, job, "".join(traceback.format_exception(e)))
+                await session.commit()
+            outcome = "lost" if retried is None else "retried" if retried else "failed"
+        else:
+            async with async_session_factory() as session:
+                if not await job_service.complete(session, job):
+                    outcome = "lost"
+                await session.commit()
+        finally:
+            heartbeat.cancel()
+            metrics.JOB_DURATION.observe(time.perf_counter() - start, job.queue, job.task)
+            metrics.JOBS_PROCESSED.inc(job.queue, job.task, outcome)
+            metrics.JOBS_RUNNING.set(len(self._running[job.queue]) - 1, job.queue)
+
+    async def _housekeeping(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                async with async_session_factory() as session:
+                    scheduled = await job_service.schedule_periodic(session)
+                    recovered = await job_service.recover_stale(session)
+                    depths = await job_service.queue_depths(session)
+                    await session.commit()
+                if recovered:
+                    logger.warning(f"Requeued {recovered} jobs with expired locks")
+                if scheduled:
+                    logger.info(f"Scheduled {scheduled} periodic jobs")
+                for queue in self.queues:
+                    metrics.JOB_QUEUE_DEPTH.set(depths.get(queue, 0), queue)
+            except Exception as e:
+                logger.warning(f"Worker housekeeping failed: {e}")
+            await self._sleep(settings.job_housekeeping_interval_seconds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background jobs from the Postgres queue.")
+    parser.add_argument(
+        "--queues",
+        default=settings.worker_queues,
+        help="Comma-separated queue=concurrency pairs (default: WORKER_QUEUES)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    tracing.setup_tracing()
+    asyncio.run(Worker(parse_queues(args.queues)).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Minimal rows for tests; callers commit (or not) themselves."""
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import BrandProfile, Campaign, CampaignStatus, InfluencerProfile, Platform, Role, User
+
+
+async def _user(db: AsyncSession, role: Role) -> User:
+    user = User(id=uuid.uuid4(), email=f"test-{uuid.uuid4().hex}@example.com", password_hash="!", role=role)
+    db.add(user)
+    await db.flush()
+    return user
+
+
+async def create_brand(db: AsyncSession, **fields) -> BrandProfile:
+    user = await _user(db, Role.brand)
+    brand = BrandProfile(id=uuid.uuid4(), user_id=user.id, company_name=fields.pop("company_name", "Test Brand"), **fields)
+    db.add(brand)
+    await db.flush()
+    return brand
+
+
+async def create_influencer(db: AsyncSession, **fields) -> InfluencerProfile:
+    user = await _user(db, Role.influencer)
+    values = {"display_name": "Test Creator", "follower_count": 50000, "engagement_rate": 4.0, **fields}
+    profile = InfluencerProfile(id=uuid.uuid4(), user_id=user.id, **values)
+    db.add(profile)
+    await db.flush()
+    return profile
+
+
+async def create_campaign(db: AsyncSession, brand: BrandProfile, **fields) -> Campaign:
+    values = {"title": "Test Campaign", "platform": Platform.instagram, "status": CampaignStatus.active, **fields}
+    campaign = Campaign(id=uuid.uuid4(), brand_id=brand.id, **values)
+    db.add(campaign)
+    await db.flush()
+    return campaign
@@ -0,0 +1,33 @@
+import pytest
+
+from app import admission
+
+
+@pytest.fixture
+def route_class(monkeypatch):
+    rc = admission.RouteClass("test", admission.Limits(per_minute=0, burst=2, concurrency=1))
+    monkeypatch.setitem(admission._classes, "test", rc)
+    monkeypatch.setattr(admission, "overload_reason", lambda: None)
+    return rc
+
+
+def test_concurrency_rejection_does_not_spend_a_token(route_class):
+    assert admission.acquire("test", "user") is None
+    for _ in range(3):
+        assert admission.acquire("test", "user") == admission.Rejection(503, "concurrency", 1)
+    admission.release("test")
+
+    # The burst of two covers exactly the two admitted requests.
+    assert admission.acquire("test", "user") is None
+    admission.release("test")
+    assert admission.acquire("test", "user").reason == "rate_limited"
+    assert route_class.in_flight == 0
+
+
+def test_rate_limit_is_per_key(route_class):
+    for _ in range(2):
+        assert admission.acquire("test", "a") is None
+        admission.release("test")
+    assert admission.acquire("test", "a").status_code == 429
+    assert admission.acquire("test", "b") is None
+    admission.release("test")
@@ -0,0 +1,51 @@
+import uuid
+
+import pytest
+
+from app.models import CampaignApplication
+from app.pagination import encode_cursor
+from app.services import campaign_service
+from tests.factories import create_brand, create_campaign, create_influencer
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [123, str(uuid.uuid4())],
+        ["2026-10-19T00:00:00+00:00", 123],
+        [None, str(uuid.uuid4())],
+        [["x"], {"y": 1}],
+        ["2026-10-19T00:00:00+00:00"],
+    ],
+)
+async def test_influencer_applications_reject_tampered_cursor(values):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        await campaign_service.get_influencer_applications(None, uuid.uuid4(), cursor=encode_cursor(values))
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("sort_by", ["created_at", "follower_count", "engagement_rate"])
+async def test_inbox_pages_through_every_application_once(db, sort_by):
+    brand = await create_brand(db)
+    campaign = await create_campaign(db, brand)
+    applications = []
+    for i in range(9):
+        # Ties on every sort key, so the id tiebreak decides page boundaries.
+        influencer = await create_influencer(db, follower_count=10_000 * (i % 3), engagement_rate=0.01 * (i % 2))
+        application = CampaignApplication(id=uuid.uuid4(), campaign_id=campaign.id, influencer_id=influencer.id)
+        db.add(application)
+        applications.append(application)
+    await db.flush()
+
+    seen, cursor = [], None
+    while True:
+        page = await campaign_service.list_applications(
+            db, campaign.id, brand.id, sort_by=sort_by, cursor=cursor, limit=2
+        )
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(a.id for a in applications)
+    assert len(seen) == len(set(seen))
@@ -0,0 +1,149 @@
+"""Capacity accounting under concurrent applies and reviews against one hot campaign."""
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import ApplicationStatus, Campaign, CampaignApplication, Platform
+from app.services import campaign_service, rollup_service
+from tests.conftest import TEST_DATABASE_URL
+from tests.factories import create_brand, create_campaign, create_influencer
+
+pytestmark = pytest.mark.db
+
+APPLICANTS = 300
+CAPACITY = 10
+
+
+@pytest.fixture
+async def pooled_factory():
+    # Hundreds of tasks share a pool well under Postgres's max_connections.
+    engine = create_async_engine(TEST_DATABASE_URL, pool_size=40, max_overflow=0)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def hot_campaign(session_factory, committed_users):
+    async with session_factory() as db:
+        brand = await create_brand(db)
+        campaign = await create_campaign(db, brand, platform=Platform.any, max_influencers=CAPACITY)
+        influencers = [await create_influencer(db) for _ in range(APPLICANTS)]
+        committed_users.extend([brand.user_id, *(p.user_id for p in influencers)])
+        await db.commit()
+    return brand.id, campaign.id, [p.id for p in influencers]
+
+
+async def _apply(factory, campaign_id, influencer_id) -> str:
+    async with factory() as db:
+        try:
+            await campaign_service.apply_to_campaign(db, campaign_id, influencer_id)
+        except ValueError as e:
+            return str(e)
+        await db.commit()
+        return "applied"
+
+
+async def _review(factory, brand_id, campaign_id, application_id, status) -> str:
+    async with factory() as db:
+        try:
+            await campaign_service.update_application_status(db, campaign_id, application_id, brand_id, status)
+        except ValueError as e:
+            return str(e)
+        await db.commit()
+        return status
+
+
+async def _state(factory, campaign_id) -> tuple[int, dict[ApplicationStatus, int], dict[str, int]]:
+    async with factory() as db:
+        accepted_count = (await db.execute(
+            select(Campaign.accepted_count).where(Campaign.id == campaign_id)
+        )).scalar_one()
+        by_status = dict((await db.execute(
+            select(CampaignApplication.status, func.count())
+            .where(CampaignApplication.campaign_id == campaign_id)
+            .group_by(CampaignApplication.status)
+        )).all())
+        return accepted_count, by_status, await rollup_service.application_counts(db, campaign_id)
+
+
+async def test_concurrent_double_tap_applies_create_one_application_each(pooled_factory, hot_campaign):
+    _, campaign_id, influencer_ids = hot_campaign
+
+    start = time.perf_counter()
+    # Every influencer taps twice; both requests race.
+    outcomes = await asyncio.gather(*(
+        _apply(pooled_factory, campaign_id, influencer_id) for influencer_id in influencer_ids for _ in range(2)
+    ))
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(outcomes)} concurrent applies in {elapsed:.2f}s ({len(outcomes) / elapsed:.0f}/s)")
+
+    assert outcomes.count("applied") == APPLICANTS
+    assert outcomes.count("Already applied to this campaign") == APPLICANTS
+    _, by_status, rollup = await _state(pooled_factory, campaign_id)
+    assert by_status == {ApplicationStatus.pending: APPLICANTS}
+    assert rollup["pending"] == APPLICANTS
+
+
+async def test_concurrent_accepts_never_exceed_capacity(pooled_factory, hot_campaign, committed_users):
+    brand_id, campaign_id, influencer_ids = hot_campaign
+    await asyncio.gather(*(_apply(pooled_factory, campaign_id, i) for i in influencer_ids))
+    async with pooled_factory() as db:
+        application_ids = (await db.execute(
+            select(CampaignApplication.id).where(CampaignApplication.campaign_id == campaign_id)
+        )).scalars().all()
+
+    outcomes = await asyncio.gather(*(
+        _review(pooled_factory, brand_id, campaign_id, application_id, "accepted") for application_id in application_ids
+    ))
+
+    assert outcomes.count("accepted") == CAPACITY
+    assert outcomes.count("Campaign is full") == APPLICANTS - CAPACITY
+    accepted_count, by_status, rollup = await _state(pooled_factory, campaign_id)
+    assert accepted_count == by_status[ApplicationStatus.accepted] == CAPACITY
+    assert rollup["accepted"] == CAPACITY
+    # A full campaign takes no new applications.
+    async with pooled_factory() as db:
+        late = await create_influencer(db)
+        committed_users.append(late.user_id)
+        await db.commit()
+    assert await _apply(pooled_factory, campaign_id, late.id) == "Campaign is full"
+
+
+async def _bulk(factory, brand_id, campaign_id, status, application_ids, auto_reject=False) -> None:
+    async with factory() as db:
+        await campaign_service.bulk_update_application_status(
+            db, campaign_id, brand_id, status, application_ids=application_ids, auto_reject_remaining=auto_reject
+        )
+        await db.commit()
+
+
+async def test_bulk_and_single_reviews_race_without_deadlock(pooled_factory, hot_campaign):
+    brand_id, campaign_id, influencer_ids = hot_campaign
+    await asyncio.gather(*(_apply(pooled_factory, campaign_id, i) for i in influencer_ids))
+    async with pooled_factory() as db:
+        application_ids = (await db.execute(
+            select(CampaignApplication.id).where(CampaignApplication.campaign_id == campaign_id)
+        )).scalars().all()
+
+    for round_ in range(5):
+        # Bulk calls over overlapping, differently ordered sets race single reviews of the same rows.
+        chunk = application_ids[round_ * 40:(round_ + 1) * 40]
+        tasks = [
+            _bulk(pooled_factory, brand_id, campaign_id, "accepted", chunk),
+            _bulk(pooled_factory, brand_id, campaign_id, "rejected", chunk[::-1]),
+            _bulk(pooled_factory, brand_id, campaign_id, "accepted", chunk[10:] + chunk[:10], auto_reject=True),
+            *(
+                _review(pooled_factory, brand_id, campaign_id, application_id, status)
+                for application_id in chunk
+                for status in ("accepted", "rejected", "pending")
+            ),
+        ]
+        # A deadlock would surface as DBAPIError from gather.
+        await asyncio.gather(*tasks)
+
+        accepted_count, by_status, rollup = await _state(pooled_factory, campaign_id)
+        assert accepted_count == by_status.get(ApplicationStatus.accepted, 0) <= CAPACITY
+        assert rollup == {status.value: by_status.get(status, 0) for status in ApplicationStatus}
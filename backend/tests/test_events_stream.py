@@ -0,0 +1,62 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import ClientDisconnect
+
+from app import events
+from app.config import settings
+from app.routers.events import stream_events
+
+SCOPE = {"type": "http", "asgi": {"spec_version": "2.4"}}
+
+
+@pytest.fixture
+def user_id():
+    user_id = str(uuid.uuid4())
+    yield user_id
+    for subscription in list(events._subscriptions.get(user_id, ())):
+        events.unsubscribe(subscription)
+
+
+async def _receive():
+    return {"type": "http.disconnect"}
+
+
+async def test_stream_over_capacity_is_refused_with_503(monkeypatch, user_id):
+    monkeypatch.setattr(settings, "events_max_streams_per_user", 1)
+    await stream_events({"sub": user_id})
+
+    with pytest.raises(HTTPException) as refused:
+        await stream_events({"sub": user_id})
+    assert refused.value.status_code == 503
+    assert "Retry-After" in refused.value.headers
+    assert len(events._subscriptions[user_id]) == 1
+
+
+async def test_subscription_is_released_when_the_response_never_starts(user_id):
+    response = await stream_events({"sub": user_id})
+    assert user_id in events._subscriptions
+
+    async def send(message):
+        raise OSError("client went away")
+
+    with pytest.raises(ClientDisconnect):
+        await response(SCOPE, _receive, send)
+    assert user_id not in events._subscriptions
+
+
+async def test_stream_delivers_events_then_releases_the_subscription(user_id):
+    response = await stream_events({"sub": user_id})
+    subscription = response.subscription
+    subscription.queue.put_nowait(("application.created", '{"id": 1}'))
+    subscription.queue.put_nowait(None)
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await response(SCOPE, _receive, send)
+    body = b"".join(message.get("body", b"") for message in sent).decode()
+    assert body == f'retry: {settings.events_retry_ms}\n\nevent: application.created\ndata: {{"id": 1}}\n\n'
+    assert user_id not in events._subscriptions
@@ -0,0 +1,55 @@
+import pytest
+
+from app.services import influencer_service
+from tests.factories import create_influencer
+
+pytestmark = pytest.mark.db
+
+# min_authenticity isolates these rows from anything else in the database.
+ISOLATE = {"min_authenticity": 99.9}
+
+
+@pytest.fixture
+async def profiles(db):
+    rows = [
+        ({"fashion", "beauty"}, 5_000, "US", "ig"),
+        ({"fashion"}, 50_000, "US", "tt"),
+        ({"tech"}, 250_000, "GB", "ig"),
+        ({"tech", "gaming"}, 2_000_000, "DE", "yt"),
+        (set(), 800_000, None, None),
+    ]
+    for categories, followers, country, platform in rows:
+        await create_influencer(
+            db,
+            categories=sorted(categories) or None,
+            follower_count=followers,
+            location=f"Somewhere, {country}" if country else None,
+            instagram_handle="h" if platform == "ig" else None,
+            tiktok_handle="h" if platform == "tt" else None,
+            youtube_handle="h" if platform == "yt" else None,
+            authenticity_score=99.95,
+        )
+    return db
+
+
+async def test_unfiltered_counts_each_profile_once_per_facet(profiles):
+    facets = await influencer_service.facet_counts(profiles, **ISOLATE)
+
+    assert facets["category"] == {"fashion": 2, "tech": 2, "beauty": 1, "gaming": 1}
+    assert facets["platform"] == {"instagram": 2, "tiktok": 1, "youtube": 1}
+    assert facets["follower_tier"] == {"nano": 1, "micro": 1, "mid": 1, "macro": 1, "mega": 1}
+    assert facets["country"] == {"US": 2, "GB": 1, "DE": 1}
+
+
+async def test_each_facet_ignores_its_own_filter(profiles):
+    facets = await influencer_service.facet_counts(
+        profiles, category="fashion", country="US", platform="instagram", **ISOLATE
+    )
+
+    # Other categories under country=US and platform=instagram: only the first profile.
+    assert facets["category"] == {"fashion": 1, "beauty": 1}
+    # Platforms under fashion and US: the first two profiles.
+    assert facets["platform"] == {"instagram": 1, "tiktok": 1, "youtube": 0}
+    # Countries under fashion and instagram.
+    assert facets["country"] == {"US": 1}
+    assert facets["follower_tier"] == {"nano": 1, "micro": 0, "mid": 0, "macro": 0, "mega": 0}
@@ -0,0 +1,60 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.models import InfluencerProfile, User
+from app.services.influencer_service import import_influencers
+
+pytestmark = pytest.mark.db
+
+
+def _record(email: str, **overrides) -> dict:
+    return {"email": email, "display_name": "Import Test", "follower_count": 12000, "engagement_rate": 3.1, **overrides}
+
+
+async def test_bad_row_does_not_drop_the_rest_of_its_batch(db):
+    tag = uuid.uuid4().hex[:8]
+    emails = [f"import-{tag}-{i}@example.com" for i in range(3)]
+    records = [
+        _record(emails[0]),
+        # Valid for the schema but too long for the column, so only the database rejects it.
+        _record(emails[1], display_name="x" * 150),
+        _record(emails[2], location="Austin, US"),
+    ]
+
+    result = await import_influencers(db, records, batch_size=10)
+
+    assert result["received"] == 3
+    assert result["upserted"] == 2
+    assert result["created_users"] == 2
+    assert [e["row"] for e in result["errors"]] == [2]
+    imported = (await db.execute(
+        select(User.email, InfluencerProfile.location_country)
+        .join(InfluencerProfile, InfluencerProfile.user_id == User.id)
+        .where(User.email.in_(emails))
+    )).all()
+    assert sorted(imported) == [(emails[0], None), (emails[2], "US")]
+
+
+async def test_reimport_updates_in_place(db):
+    email = f"import-{uuid.uuid4().hex[:8]}@example.com"
+    await import_influencers(db, [_record(email)])
+
+    result = await import_influencers(db, [_record(email, follower_count=50000)])
+
+    assert (result["upserted"], result["created_users"]) == (1, 0)
+    followers = (await db.execute(
+        select(InfluencerProfile.follower_count).join(User).where(User.email == email)
+    )).scalar_one()
+    assert followers == 50000
+
+
+async def test_parse_and_validation_errors_are_reported_by_row(db):
+    email = f"import-{uuid.uuid4().hex[:8]}@example.com"
+    records = [ValueError("line 1: bad JSON"), {"display_name": "No email"}, _record(email)]
+
+    result = await import_influencers(db, records)
+
+    assert result["upserted"] == 1
+    assert [e["row"] for e in result["errors"]] == [1, 2]
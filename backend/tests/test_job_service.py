@@ -0,0 +1,136 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, select, text, update
+
+from app import worker
+from app.config import settings
+from app.models import Job, JobStatus
+from app.services import job_service
+
+pytestmark = pytest.mark.db
+
+QUEUE = "tests"
+
+
+@job_service.task("tests.noop", queue=QUEUE)
+async def noop(payload: dict) -> None:
+    pass
+
+
+@job_service.task("tests.sleep", queue=QUEUE)
+async def sleep(payload: dict) -> None:
+    await asyncio.sleep(payload["seconds"])
+
+
+@pytest.fixture
+async def jobs(session_factory):
+    async def purge():
+        async with session_factory() as session:
+            await session.execute(delete(Job).where(Job.queue == QUEUE))
+            await session.commit()
+
+    await purge()
+    yield session_factory
+    await purge()
+
+
+async def _enqueue(factory, count: int) -> None:
+    async with factory() as session:
+        for i in range(count):
+            await job_service.enqueue(session, "tests.noop", {"i": i})
+        await session.commit()
+
+
+async def _status(factory, job_id):
+    async with factory() as session:
+        return (await session.execute(select(Job.status, Job.locked_by).where(Job.id == job_id))).one()
+
+
+async def test_claims_skip_rows_locked_by_another_worker(jobs):
+    await _enqueue(jobs, 10)
+    async with jobs() as first, jobs() as second:
+        # The first claim is still uncommitted: its rows are skipped, not waited on.
+        mine = await job_service.claim(first, QUEUE, 4, "worker-a")
+        theirs = await job_service.claim(second, QUEUE, 10, "worker-b")
+        await first.commit()
+        await second.commit()
+
+    assert len(mine) == 4 and len(theirs) == 6
+    assert not {job.id for job in mine} & {job.id for job in theirs}
+    assert {job.attempts for job in mine + theirs} == {1}
+
+
+async def test_claim_never_exceeds_its_limit_whatever_the_plan(jobs):
+    await _enqueue(jobs, 10)
+    async with jobs() as session:
+        # Steer the planner to a nested-loop semi join that rescans the subquery per row.
+        for setting in ("enable_hashjoin", "enable_mergejoin", "enable_material", "enable_hashagg", "enable_sort"):
+            await session.execute(text(f"SET LOCAL {setting} = off"))
+        claimed = await job_service.claim(session, QUEUE, 4, "worker-a")
+        await session.commit()
+    assert len(claimed) == 4
+
+
+async def test_late_result_of_a_lost_claim_is_dropped(jobs):
+    await _enqueue(jobs, 1)
+    async with jobs() as session:
+        [stale] = await job_service.claim(session, QUEUE, 1, "worker-a")
+        await session.commit()
+    async with jobs() as session:
+        await session.execute(
+            update(Job).where(Job.id == stale.id).values(locked_at=datetime.now(timezone.utc) - timedelta(days=1))
+        )
+        assert await job_service.recover_stale(session) >= 1
+        await session.commit()
+    async with jobs() as session:
+        [current] = await job_service.claim(session, QUEUE, 1, "worker-b")
+        await session.commit()
+    assert current.id == stale.id and current.attempts == 2
+
+    async with jobs() as session:
+        assert await job_service.complete(session, stale) is False
+        assert await job_service.fail(session, stale, "boom") is None
+        await session.commit()
+    assert await _status(jobs, stale.id) == (JobStatus.running, "worker-b")
+
+    async with jobs() as session:
+        assert await job_service.complete(session, current) is True
+        await session.commit()
+    assert (await _status(jobs, stale.id)).status == JobStatus.succeeded
+
+
+async def test_failure_is_recorded_by_the_owning_worker(jobs):
+    await _enqueue(jobs, 1)
+    async with jobs() as session:
+        [job] = await job_service.claim(session, QUEUE, 1, "worker-a")
+        await session.commit()
+    async with jobs() as session:
+        assert await job_service.fail(session, job, "boom") is True
+        await session.commit()
+    assert await _status(jobs, job.id) == (JobStatus.queued, "worker-a")
+
+
+async def test_heartbeat_keeps_a_long_job_from_being_recovered(monkeypatch, jobs):
+    monkeypatch.setattr(settings, "job_lock_timeout_seconds", 0.3)
+    monkeypatch.setattr(worker, "async_session_factory", jobs)
+    async with jobs() as session:
+        await job_service.enqueue(session, "tests.sleep", {"seconds": 1.2})
+        await session.commit()
+    runner = worker.Worker({QUEUE: 1})
+    async with jobs() as session:
+        [job] = await job_service.claim(session, QUEUE, 1, runner.worker_id)
+        await session.commit()
+
+    running = asyncio.create_task(runner._execute(job))
+    recovered = 0
+    while not running.done():
+        await asyncio.sleep(0.1)
+        async with jobs() as session:
+            recovered += await job_service.recover_stale(session)
+            await session.commit()
+    await running
+
+    assert recovered == 0
+    assert await _status(jobs, job.id) == (JobStatus.succeeded, runner.worker_id)
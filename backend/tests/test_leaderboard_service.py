@@ -0,0 +1,98 @@
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from app import jobs  # noqa: F401  (registers refresh_leaderboards)
+from app.config import settings
+from app.models import CategoryLeaderboard, Job
+from app.services import leaderboard_service
+from tests.factories import create_influencer
+
+pytestmark = pytest.mark.db
+
+# One slot for the whole test run, so every enqueue below lands in it.
+DEBOUNCE = 10**9
+SLOT_KEY = "leaderboards:1"
+
+
+@pytest.fixture
+async def board(db, monkeypatch):
+    """A fresh category whose boards hold the top two of three profiles."""
+    monkeypatch.setattr(settings, "leaderboard_size", 2)
+    monkeypatch.setattr(settings, "leaderboard_debounce_seconds", DEBOUNCE)
+    category = f"test-{uuid.uuid4().hex[:8]}"
+    top, second, last = [
+        await create_influencer(
+            db, categories=[category], follower_count=followers, engagement_rate=rate, authenticity_score=score
+        )
+        for followers, rate, score in ((100_000, 6.0, 90.0), (50_000, 5.0, 80.0), (10_000, 1.0, 50.0))
+    ]
+    await leaderboard_service.refresh(db)
+    return category, top, second, last
+
+
+async def _edited(db, profile, old_categories=None, **changes) -> bool:
+    for name, value in changes.items():
+        setattr(profile, name, value)
+    return await leaderboard_service.profile_edited(
+        db, profile, set(changes), old_categories if old_categories is not None else list(profile.categories)
+    )
+
+
+async def _refreshes(db) -> int:
+    return await db.scalar(select(func.count()).where(Job.unique_key == SLOT_KEY))
+
+
+async def test_board_holds_the_top_profiles(db, board):
+    category, top, second, last = board
+    ranked = await db.scalars(
+        select(CategoryLeaderboard.influencer_id)
+        .where(CategoryLeaderboard.category == category, CategoryLeaderboard.metric == "followers")
+        .order_by(CategoryLeaderboard.rank)
+    )
+    assert list(ranked) == [top.id, second.id]
+
+
+async def test_edits_that_cannot_move_a_board_schedule_nothing(db, board):
+    _, _, _, last = board
+    assert not await _edited(db, last, bio="New bio")
+    assert not await _edited(db, last, follower_count=20_000, engagement_rate=2.0)
+    assert await _refreshes(db) == 0
+
+
+async def test_edit_of_a_profile_on_the_board_is_significant(db, board):
+    _, _, second, _ = board
+    assert await _edited(db, second, follower_count=49_000)
+
+
+async def test_beating_the_lowest_entry_is_significant(db, board):
+    _, _, _, last = board
+    assert await _edited(db, last, engagement_rate=5.5)
+
+
+async def test_joining_a_board_with_free_places_is_significant(db, board):
+    category, _, _, last = board
+    other = f"{category}-b"
+    # Its one entry outranks ``last`` on every metric; only the free place lets it in.
+    await create_influencer(
+        db, categories=[other], follower_count=1_000_000, engagement_rate=9.0, authenticity_score=99.0
+    )
+    await leaderboard_service.refresh(db)
+    assert await _edited(db, last, old_categories=[category], categories=[category, other])
+
+
+async def test_category_changes_are_significant(db, board):
+    category, top, _, last = board
+    # Into a category with no board yet, and off the boards the profile held.
+    assert await _edited(db, last, old_categories=[category], categories=[f"{category}-new"])
+    assert await _edited(db, top, old_categories=[category], categories=[f"{category}-new"])
+
+
+async def test_significant_edits_share_one_debounced_refresh(db, board):
+    _, top, second, _ = board
+    assert await _edited(db, top, follower_count=200_000)
+    assert await _edited(db, second, follower_count=60_000)
+    assert await _refreshes(db) == 1
+    job = await db.scalar(select(Job).where(Job.unique_key == SLOT_KEY))
+    assert job.task == "refresh_leaderboards"
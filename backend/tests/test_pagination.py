@@ -0,0 +1,39 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.pagination import decode_cursor, encode_cursor
+
+
+def test_round_trip_with_parsers():
+    created_at = datetime(2026, 10, 19, 12, 30, 1, 123456, tzinfo=timezone.utc)
+    key = uuid.uuid4()
+
+    cursor = encode_cursor([created_at.isoformat(), str(key)])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == [created_at.isoformat(), str(key)]
+    assert decode_cursor(cursor, datetime.fromisoformat, uuid.UUID) == [created_at, key]
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [123, 456],
+        [None, None],
+        [["2026-10-19"], {"id": 1}],
+        ["2026-10-19T00:00:00+00:00", "not-a-uuid"],
+        ["2026-10-19T00:00:00+00:00"],
+        ["2026-10-19T00:00:00+00:00", str(uuid.uuid4()), "extra"],
+    ],
+)
+def test_tampered_values_raise_value_error(values):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(encode_cursor(values), datetime.fromisoformat, uuid.UUID)
+
+
+@pytest.mark.parametrize("cursor", ["", "!!!", "bm90IGpzb24", encode_cursor({"a": 1}), encode_cursor("x")])
+def test_malformed_cursors_raise_value_error(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
@@ -0,0 +1,72 @@
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, Response
+
+from app.dependencies import influencer_fields
+from app.projections import FULL, INFLUENCER_PROJECTIONS, parse_fields, respond, serialize
+from app.schemas.influencer import InfluencerListResponse, InfluencerProfileResponse
+
+MODEL = InfluencerProfileResponse
+
+
+def _request():
+    return SimpleNamespace(state=SimpleNamespace())
+
+
+@pytest.mark.parametrize("spec", ["nope", "card,nope", "display_name,password_hash"])
+def test_unknown_field_is_rejected_with_400(spec):
+    with pytest.raises(ValueError, match="Unknown field"):
+        parse_fields(spec, MODEL, INFLUENCER_PROJECTIONS)
+    with pytest.raises(HTTPException) as rejected:
+        influencer_fields(_request(), fields=spec)
+    assert rejected.value.status_code == 400
+
+
+def test_projection_names_and_fields_in_model_order():
+    card = parse_fields("card", MODEL, INFLUENCER_PROJECTIONS)
+    assert card.name == "card"
+    assert set(card.fields) == set(INFLUENCER_PROJECTIONS["card"])
+    assert list(card.fields) == [f for f in MODEL.model_fields if f in card.fields]
+
+    custom = parse_fields(" card , bio ", MODEL, INFLUENCER_PROJECTIONS)
+    assert custom.name == "custom"
+    assert set(custom.fields) == {*INFLUENCER_PROJECTIONS["card"], "bio"}
+
+    # The key always comes along.
+    assert parse_fields("display_name", MODEL, INFLUENCER_PROJECTIONS).fields == ("id", "display_name")
+
+
+EVERY_FIELD = ",".join(MODEL.model_fields)
+
+
+@pytest.mark.parametrize("spec", [None, "", "full", "card,full", EVERY_FIELD, f"card,{EVERY_FIELD}"])
+def test_every_field_collapses_to_full(spec):
+    assert parse_fields(spec, MODEL, INFLUENCER_PROJECTIONS) is FULL
+
+
+def test_partial_envelope_holds_only_the_requested_keys():
+    fields = parse_fields("display_name,follower_count", MODEL, INFLUENCER_PROJECTIONS)
+    source = {"id": uuid.uuid4(), "user_id": uuid.uuid4(), "display_name": "Ana", "follower_count": 12, "bio": "hi"}
+    response = respond(
+        InfluencerListResponse, fields, items=[serialize(MODEL, source, fields)], total=1, page=1, limit=20, facets=None
+    )
+
+    assert isinstance(response, Response)
+    body = json.loads(response.body)
+    assert body == {
+        "items": [{"id": str(source["id"]), "display_name": "Ana", "follower_count": 12}],
+        "total": 1,
+        "page": 1,
+        "limit": 20,
+        "facets": None,
+    }
+
+
+def test_full_fieldset_returns_the_envelope_model():
+    source = {"id": uuid.uuid4(), "user_id": uuid.uuid4(), "display_name": "Ana"}
+    envelope = respond(InfluencerListResponse, FULL, items=[serialize(MODEL, source, FULL)], total=1, page=1, limit=20)
+    assert isinstance(envelope, InfluencerListResponse)
+    assert envelope.items[0].bio is None
@@ -0,0 +1,63 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import ApplicationStatus, CampaignApplication, CampaignRollup
+from app.services import rollup_service
+from tests.factories import create_brand, create_campaign, create_influencer
+
+pytestmark = pytest.mark.db
+
+
+async def _applications(db, campaign, statuses):
+    for status in statuses:
+        influencer = await create_influencer(db)
+        db.add(CampaignApplication(
+            id=uuid.uuid4(), campaign_id=campaign.id, influencer_id=influencer.id, status=status
+        ))
+    await db.flush()
+
+
+async def test_deltas_spread_over_shards_sum_to_the_totals(db):
+    brand = await create_brand(db)
+    campaign = await create_campaign(
+        db, brand, title="Spring drop", budget=Decimal("1000"), price_per_influencer=Decimal("100")
+    )
+    await rollup_service.campaign_written(db, campaign.id)
+    shards = await db.scalar(select(func.count()).where(CampaignRollup.campaign_id == campaign.id))
+    assert shards == rollup_service.ROLLUP_SHARDS
+
+    for _ in range(40):
+        await rollup_service.applications_moved(db, campaign.id, {ApplicationStatus.pending: 1})
+    for _ in range(6):
+        await rollup_service.applications_moved(
+            db, campaign.id, {ApplicationStatus.pending: -1, ApplicationStatus.accepted: 1}
+        )
+    await rollup_service.applications_moved(
+        db, campaign.id, {ApplicationStatus.pending: -2, ApplicationStatus.rejected: 2}
+    )
+
+    assert await rollup_service.application_counts(db, campaign.id) == {"pending": 32, "accepted": 6, "rejected": 2}
+    dashboard = await rollup_service.dashboard(db, brand.id)
+    [entry] = dashboard["campaigns"]
+    assert entry["title"] == "Spring drop"
+    assert entry["total_applications"] == 40
+    assert entry["acceptance_rate"] == 6 / 8
+    assert entry["committed_spend"] == Decimal("600")
+    assert entry["budget_remaining"] == Decimal("400")
+    assert dashboard["applications"] == {"pending": 32, "accepted": 6, "rejected": 2}
+
+
+async def test_reconcile_repairs_drift_and_then_finds_none(db):
+    brand = await create_brand(db)
+    campaign = await create_campaign(db, brand)
+    await rollup_service.campaign_written(db, campaign.id)
+    # Rows written behind the rollup's back, plus a delta that never happened.
+    await _applications(db, campaign, [ApplicationStatus.pending] * 3 + [ApplicationStatus.accepted])
+    await rollup_service.applications_moved(db, campaign.id, {ApplicationStatus.rejected: 5})
+
+    assert await rollup_service.reconcile(db, [campaign.id]) == 1
+    assert await rollup_service.application_counts(db, campaign.id) == {"pending": 3, "accepted": 1, "rejected": 0}
+    assert await rollup_service.reconcile(db, [campaign.id]) == 0
@@ -0,0 +1,66 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.models import saved_influencers
+from app.pagination import encode_cursor
+from app.services import saved_service
+from tests.factories import create_brand, create_influencer
+
+
+@pytest.mark.parametrize("values", [[1, 2], [None, "x"], [["a"], {"b": 1}]])
+async def test_list_saved_rejects_tampered_cursor(values):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        await saved_service.list_saved(None, uuid.uuid4(), encode_cursor(values))
+
+
+@pytest.mark.db
+async def test_list_saved_pages_through_every_item_once(db):
+    brand = await create_brand(db)
+    influencers = [await create_influencer(db) for _ in range(7)]
+    # Three share a timestamp so the id tiebreak is exercised.
+    await db.execute(insert(saved_influencers), [
+        {"brand_id": brand.id, "influencer_id": p.id, "created_at": datetime(2026, 10, 10 + min(i, 3), tzinfo=timezone.utc)}
+        for i, p in enumerate(influencers)
+    ])
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = await saved_service.list_saved(db, brand.id, cursor, limit=2)
+        seen.extend(p.id for p in page)
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(p.id for p in influencers)
+    assert len(seen) == len(set(seen))
+
+
+@pytest.mark.db
+async def test_cache_is_patched_only_when_the_write_commits(session_factory, committed_users):
+    async with session_factory() as db:
+        brand = await create_brand(db)
+        influencer = await create_influencer(db)
+        committed_users.extend([brand.user_id, influencer.user_id])
+        brand_id, influencer_id = brand.id, influencer.id
+        await db.commit()
+        assert await saved_service.get_saved_ids(db, brand_id) == frozenset()
+
+        await saved_service.save_influencers(db, brand_id, [influencer_id])
+        await db.rollback()
+        assert saved_service._saved_sets[brand_id][1] == frozenset()
+
+        await saved_service.save_influencers(db, brand_id, [influencer_id])
+        # Re-reading inside the uncommitted transaction must not cache its writes either.
+        assert await saved_service.get_saved_ids(db, brand_id) == frozenset()
+        saved_service._saved_sets.pop(brand_id)
+        assert await saved_service.get_saved_ids(db, brand_id) == {influencer_id}
+        assert brand_id not in saved_service._saved_sets
+        await db.commit()
+        assert await saved_service.get_saved_ids(db, brand_id) == {influencer_id}
+        assert saved_service._saved_sets[brand_id][1] == {influencer_id}
+
+        await saved_service.unsave_influencers(db, brand_id, [influencer_id])
+        await db.commit()
+    assert saved_service._saved_sets[brand_id][1] == frozenset()
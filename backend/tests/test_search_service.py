@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.projections import FULL
+from app.services import search_service
+from app.services.ai_service import mock_interpret
+
+EMPTY = {"results": [], "total": 0, "facets": None}
+
+
+@pytest.fixture
+def searches(monkeypatch):
+    """Filters each SQL search ran with; no database involved."""
+    ran = []
+
+    async def search(filters, facets, fields):
+        ran.append(filters)
+        return EMPTY
+
+    monkeypatch.setattr(search_service, "_search", search)
+    return ran
+
+
+@pytest.mark.parametrize(
+    "query, country",
+    [
+        ("Fashion influencers in the US", "US"),
+        ("fashion  influencers in the   UK", "GB"),
+        ("tech creators who can help us grow", None),
+    ],
+)
+async def test_natural_search_reads_country_codes_from_the_original_query(monkeypatch, searches, query, country):
+    monkeypatch.setattr(settings, "openai_api_key", "")
+    response = await search_service.natural_search(query)
+
+    assert response["query"] == query
+    assert response["interpreted_filters"].get("country") == country
+    assert searches[0].get("country") == country
+
+
+async def test_speculative_search_sends_the_original_query_to_both_interpreters(monkeypatch, searches):
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(settings, "speculative_search", True)
+    received = []
+
+    async def interpret(query):
+        received.append(query)
+        return mock_interpret(query)
+
+    monkeypatch.setattr(search_service, "interpret_search_query", interpret)
+    response = await search_service.natural_search("Beauty creators in the US")
+
+    assert received == ["Beauty creators in the US"]
+    assert response["interpreted_filters"]["country"] == "US"
+    # The rule-based guess agreed, so its search was used and nothing ran twice.
+    assert len(searches) == 1
+    assert (searches[0]["category"], searches[0]["country"]) == ("beauty", "US")
+
+
+@pytest.mark.parametrize(
+    "interpreted, runs",
+    [
+        # Case only: both run category = 'beauty', exactly what sequential mode would run.
+        ({"category": "Beauty", "country": "US"}, [{"category": "beauty", "country": "US"}]),
+        (
+            {"category": "beauty", "country": "US", "platform": "Instagram"},
+            [{"category": "beauty", "country": "US"}, {"category": "beauty", "country": "US", "platform": "instagram"}],
+        ),
+    ],
+)
+async def test_speculative_hit_compares_the_filters_that_run(monkeypatch, searches, interpreted, runs):
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(settings, "speculative_search", True)
+
+    async def interpret(query):
+        return interpreted
+
+    monkeypatch.setattr(search_service, "interpret_search_query", interpret)
+    response = await search_service.natural_search("Beauty creators in the US")
+
+    assert response["interpreted_filters"] == interpreted
+    assert [{k: v for k, v in f.items() if v is not None} for f in searches] == runs
+    assert searches[-1] == search_service._search_filters(interpreted)
+
+
+@pytest.fixture
+def executions(monkeypatch):
+    """Filters each shared SQL execution ran with; every execution waits for ``release``."""
+    ran, release = [], asyncio.Event()
+
+    async def run(filters, facets, fields):
+        ran.append(filters)
+        await release.wait()
+        return {**EMPTY, "total": len(ran)}
+
+    monkeypatch.setattr(search_service, "_run_filters", run)
+    return ran, release
+
+
+async def test_case_variants_share_sql_only_when_they_run_the_same_filters(executions):
+    ran, release = executions
+    variants = [
+        {"category": "Fashion", "platform": "Instagram", "location": "LA"},
+        {"category": "fashion", "platform": "instagram", "location": "LA"},
+        {"category": "fashion", "platform": "instagram", "location": "la"},
+    ]
+    searches = [
+        asyncio.create_task(search_service._search(search_service._search_filters(v), False, FULL)) for v in variants
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    totals = [found["total"] for found in await asyncio.gather(*searches)]
+
+    # "LA" the city and "la" are different searches; "Fashion" and "fashion" are one.
+    assert [(f["category"], f["platform"], f["location"]) for f in ran] == [
+        ("fashion", "instagram", "LA"),
+        ("fashion", "instagram", "la"),
+    ]
+    assert totals == [1, 1, 2]
+
+
+def test_case_variants_are_not_coalesced():
+    assert search_service._normalize_query("  in the   US ") == "in the US"
+    assert search_service._normalize_query("in the us") != search_service._normalize_query("in the US")
+
+
+async def test_coalesce_runs_once_for_concurrent_callers():
+    calls = 0
+    release = asyncio.Event()
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    waiters = [asyncio.create_task(search_service._coalesce("test", "key", work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [1] * 5
+    assert calls == 1
+    assert ("test", "key") not in search_service._flights
+    # A later call starts a new flight.
+    assert await search_service._coalesce("test", "key", work) == 2
+
+
+async def test_coalesced_call_is_cancelled_when_every_waiter_leaves():
+    started, cancelled = asyncio.Event(), asyncio.Event()
+
+    async def work():
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiters = [asyncio.create_task(search_service._coalesce("test", "slow", work)) for _ in range(2)]
+    await started.wait()
+    waiters[0].cancel()
+    await asyncio.sleep(0)
+    assert not cancelled.is_set()
+
+    waiters[1].cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert ("test", "slow") not in search_service._flights
@@ -0,0 +1,69 @@
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from app import snapshot
+from app.config import settings
+from app.models import InfluencerProfile
+from app.services.influencer_service import apply_filters
+from tests.factories import create_influencer
+
+# Values straddling thresholds that float32 cannot represent exactly.
+ENGAGEMENT = [0.0299999999, 0.03, 0.0300000001, 0.029999999329447746, float("nan")]
+AUTHENTICITY = [71.29999, 71.3, 71.30001, 71.30000305175781, float("nan")]
+THRESHOLDS = [{"min_engagement": 0.03}, {"min_authenticity": 71.3}, {"min_engagement": 0.03, "min_authenticity": 71.3}]
+
+
+def _load(directory, columns: dict[str, np.ndarray]) -> snapshot.Snapshot:
+    version = "20261019T000000000000Z"
+    snapshot._write_version(str(directory), version, columns, {"countries": [], "cities": [], "categories": []})
+    return snapshot.Snapshot(str(directory), version)
+
+
+@pytest.mark.parametrize("filters", THRESHOLDS)
+def test_threshold_filters_compare_like_sql_doubles(tmp_path, monkeypatch, filters):
+    monkeypatch.setattr(settings, "snapshot_keep_versions", 1)
+    count = len(ENGAGEMENT)
+    snap = _load(tmp_path, {
+        "id": np.frombuffer(b"".join(uuid.uuid4().bytes for _ in range(count)), dtype="V16"),
+        "follower_count": np.zeros(count, dtype=np.int64),
+        "engagement_rate": np.array(ENGAGEMENT, dtype=np.float64),
+        "authenticity_score": np.array(AUTHENTICITY, dtype=np.float64),
+        "price_per_post": np.full(count, np.nan),
+        "platforms": np.zeros(count, dtype=np.uint8),
+        "country": np.full(count, -1, dtype=np.int16),
+        "city": np.full(count, -1, dtype=np.int32),
+        "category_rows": np.zeros(0, dtype=np.int32),
+        "category_offsets": np.zeros(1, dtype=np.int64),
+    })
+
+    # Python floats are IEEE doubles, like Postgres double precision; NaN stands in for NULL.
+    expected = [
+        e >= filters.get("min_engagement", -np.inf) and a >= filters.get("min_authenticity", -np.inf)
+        for e, a in zip(ENGAGEMENT, AUTHENTICITY)
+    ]
+    assert snap._mask(filters).tolist() == expected
+
+
+@pytest.mark.db
+async def test_snapshot_matches_sql_at_threshold_boundaries(session_factory, committed_users, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "snapshot_dir", str(tmp_path))
+    category = f"parity-{uuid.uuid4().hex}"
+    async with session_factory() as db:
+        for engagement, authenticity in zip(ENGAGEMENT[:-1], AUTHENTICITY[:-1]):
+            profile = await create_influencer(
+                db, categories=[category], engagement_rate=engagement, authenticity_score=authenticity
+            )
+            committed_users.append(profile.user_id)
+        await db.commit()
+
+    snap = snapshot.Snapshot(str(tmp_path), await snapshot.build())
+    async with session_factory() as db:
+        for filters in THRESHOLDS:
+            filters = {"category": category, **filters}
+            ids, _ = snap.search(filters, None, 0, 100)
+            sql = (await db.execute(apply_filters(select(InfluencerProfile.id), **filters))).scalars().all()
+            assert sorted(ids) == sorted(sql)
+            assert sql
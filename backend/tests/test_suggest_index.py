@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import uuid
+
+import pytest
+
+from app.models import InfluencerProfile
+from app.services import suggest_service
+from app.services.suggest_service import SuggestIndex
+
+ANNA, ANNIKA, BOB = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+ROWS = [
+    (ANNA, "Anna Stone", None, 5_000, "@annastyle", None, None),
+    (ANNIKA, "Annika Berg", "a.png", 90_000, None, "annika.fit", None),
+    (BOB, "Bob Annerson", None, 40_000, None, None, "bobcooks"),
+]
+
+
+def _ids(index, prefix, limit=10):
+    return [s["id"] for s in index.suggest(prefix, limit)]
+
+
+@pytest.mark.parametrize(
+    "prefix, expected",
+    [("ann", [ANNIKA, BOB, ANNA]), ("  @ANN", [ANNIKA, BOB, ANNA]), ("anne", [BOB]), ("annas", [ANNA])],
+)
+def test_prefix_matches_names_later_words_and_handles(prefix, expected):
+    assert _ids(SuggestIndex(ROWS), prefix) == expected
+
+
+def test_suggestions_are_ranked_by_followers_and_name_the_matched_handle():
+    index = SuggestIndex(ROWS)
+    annika, _, anna = index.suggest("ann", 10)
+    assert (annika["id"], annika["matched_handle"], annika["follower_count"]) == (ANNIKA, "annika.fit", 90_000)
+    assert (anna["id"], anna["matched_handle"]) == (ANNA, "@annastyle")
+    assert _ids(index, "ann", limit=1) == [ANNIKA]
+    assert _ids(index, "bobc") == [BOB]
+    assert _ids(index, "zed") == [] and _ids(index, "   ") == []
+
+
+def test_upsert_and_remove_are_seen_by_short_and_long_prefixes():
+    index = SuggestIndex(ROWS)
+    index.upsert(ANNA, "Zara Stone", None, 500_000, ("@zarastyle", None, None))
+    assert _ids(index, "ann") == [ANNIKA, BOB]
+    assert _ids(index, "annas") == []
+    assert _ids(index, "zar") == [ANNA] and _ids(index, "zarast") == [ANNA]
+    assert _ids(index, "sto") == [ANNA] and _ids(index, "stone") == [ANNA]
+
+    index.upsert(BOB, "Bob Annerson", None, 1_000_000, (None, None, "bobcooks"))
+    assert _ids(index, "ann") == [BOB, ANNIKA] and _ids(index, "anne") == [BOB]
+
+    index.remove(BOB)
+    index.remove(uuid.uuid4())
+    assert _ids(index, "ann") == [ANNIKA] and _ids(index, "anne") == []
+    assert _ids(index, "bobcooks") == []
+
+
+@pytest.mark.db
+async def test_edit_made_during_a_rebuild_survives_the_swap(monkeypatch, session_factory):
+    monkeypatch.setattr(suggest_service, "async_session_factory", session_factory)
+    monkeypatch.setattr(suggest_service, "_index", SuggestIndex(ROWS))
+    reporting, release = threading.Event(), threading.Event()
+
+    def report(index):
+        reporting.set()
+        release.wait(5)
+
+    monkeypatch.setattr(suggest_service, "_report", report)
+    rebuild = asyncio.create_task(suggest_service.rebuild_index())
+    while not reporting.is_set():
+        await asyncio.sleep(0.01)
+
+    name = f"Edited {uuid.uuid4().hex}"
+    profile = InfluencerProfile(
+        id=uuid.uuid4(), display_name=name, avatar_url=None, follower_count=10,
+        instagram_handle=None, tiktok_handle=None, youtube_handle=None,
+    )
+    suggest_service.profile_changed(profile)
+    release.set()
+    index = await rebuild
+
+    assert suggest_service._index is index
+    assert _ids(index, name) == [profile.id]
+    assert suggest_service._pending == []
@@ -1,4 +1,4 @@
-import React from 'react';
+import React, { useState } from 'react';
 import { View, Text, StyleSheet, ScrollView, ActivityIndicator, TouchableOpacity, Image } from 'react-native';
 import { useLocalSearchParams, useRouter } from 'expo-router';
 import { Ionicons } from '@expo/vector-icons';
@@ -7,12 +7,26 @@ import { Card } from '../../../src/components/ui/Card';
 import { Badge } from '../../../src/components/ui/Badge';
 import { Button } from '../../../src/components/ui/Button';
 import { useCampaign, useApplications, useUpdateApplicationStatus } from '../../../src/hooks/useApi';
+import type { ApplicantSort } from '../../../src/types/api';
 import { colors, fontSize, spacing } from '../../../src/theme';
 
+const STATUS_TABS = ['all', 'pending', 'accepted', 'rejected'] as const;
+const SORTS: { key: ApplicantSort; label: string }[] = [
+  { key: 'created_at', label: 'Newest' },
+  { key: 'follower_count', label: 'Followers' },
+  { key: 'engagement_rate', label: 'Engagement' },
+  { key: 'authenticity_score', label: 'Authenticity' },
+];
+
 export default function CampaignDetailScreen() {
   const { id } = useLocalSearchParams<{ id: string }>();
   const { data: campaign, isLoading } = useCampaign(id);
-  const { data: applications } = useApplications(id);
+  const [statusTab, setStatusTab] = useState<(typeof STATUS_TABS)[number]>('all');
+  const [sortBy, setSortBy] = useState<ApplicantSort>('created_at');
+  const inbox = useApplications(id, statusTab === 'all' ? undefined : statusTab, sortBy);
+  const applications = inbox.data?.pages.flatMap((page) => page.items) ?? [];
+  const totals = inbox.data?.pages[0]?.totals ?? {};
+  const totalCount = Object.values(totals).reduce((sum, n) => sum + n, 0);
   const updateStatus = useUpdateApplicationStatus();
   const router = useRouter();
 
@@ -60,8 +74,24 @@ export default function CampaignDetailScreen() {
           )}
 
           <Card style={styles.section}>
-            <Text style={styles.sectionTitle}>Applications ({applications?.length || 0})</Text>
-            {(!applications || applications.length === 0) ? (
+            <Text style={styles.sectionTitle}>Applications ({totalCount})</Text>
+            <View style={styles.chips}>
+              {STATUS_TABS.map((tab) => (
+                <TouchableOpacity key={tab} onPress={() => setStatusTab(tab)} style={[styles.chip, statusTab === tab && styles.chipActive]}>
+                  <Text style={[styles.chipText, statusTab === tab && styles.chipTextActive]}>
+                    {tab} ({tab === 'all' ? totalCount : totals[tab] ?? 0})
+                  </Text>
+                </TouchableOpacity>
+              ))}
+            </View>
+            <View style={styles.chips}>
+              {SORTS.map((sort) => (
+                <TouchableOpacity key={sort.key} onPress={() => setSortBy(sort.key)} style={[styles.chip, sortBy === sort.key && styles.chipActive]}>
+                  <Text style={[styles.chipText, sortBy === sort.key && styles.chipTextActive]}>{sort.label}</Text>
+                </TouchableOpacity>
+              ))}
+            </View>
+            {applications.length === 0 ? (
               <Text style={styles.emptyText}>No applications yet</Text>
             ) : (
               applications.map((app) => (
@@ -87,6 +117,15 @@ export default function CampaignDetailScreen() {
                 </View>
               ))
             )}
+            {inbox.hasNextPage && (
+              <Button
+                title="Load more"
+                variant="outline"
+                size="sm"
+                loading={inbox.isFetchingNextPage}
+                onPress={() => inbox.fetchNextPage()}
+              />
+            )}
           </Card>
         </View>
       </ScrollView>
@@ -109,6 +148,11 @@ const styles = StyleSheet.create({
   metaLabel: { fontSize: fontSize.xs, color: colors.textSecondary },
   metaValue: { fontSize: fontSize.md, fontWeight: '600', color: colors.text, marginTop: 2 },
   emptyText: { color: colors.textSecondary, fontStyle: 'italic' },
+  chips: { flexDirection: 'row', flexWrap: 'wrap', gap: spacing.xs, marginBottom: spacing.sm },
+  chip: { paddingHorizontal: spacing.sm, paddingVertical: spacing.xs, borderRadius: 12, borderWidth: 1, borderColor: colors.border },
+  chipActive: { backgroundColor: colors.primary, borderColor: colors.primary },
+  chipText: { fontSize: fontSize.xs, color: colors.textSecondary },
+  chipTextActive: { color: '#fff', fontWeight: '600' },
   appCard: { borderBottomWidth: 1, borderColor: colors.border, paddingVertical: spacing.md },
   appHeader: { flexDirection: 'row', alignItems: 'center', gap: spacing.md },
   appAvatar: { width: 40, height: 40, borderRadius: 20, backgroundColor: colors.border },
@@ -53,7 +53,7 @@ export default function BrandDashboard() {
           </View>
           <View style={styles.statDivider} />
           <View style={styles.statCard}>
-            <Text style={styles.statNumber}>{saved?.length || 0}</Text>
+            <Text style={styles.statNumber}>{saved?.total || 0}</Text>
             <Text style={styles.statLabel}>saved</Text>
           </View>
         </View>
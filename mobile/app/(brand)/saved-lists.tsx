@@ -23,10 +23,10 @@ export default function SavedListsScreen() {
     <SafeAreaView style={styles.safe}>
       <View style={styles.header}>
         <Text style={styles.title}>Saved Creators</Text>
-        <Text style={styles.count}>{data?.length || 0} saved</Text>
+        <Text style={styles.count}>{data?.total || 0} saved</Text>
       </View>
       <FlatList
-        data={data || []}
+        data={data?.items || []}
         keyExtractor={(item) => item.id}
         renderItem={({ item }) => (
           <InfluencerCard
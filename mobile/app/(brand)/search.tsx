@@ -5,7 +5,7 @@ import { Ionicons } from '@expo/vector-icons';
 import { SafeAreaView } from 'react-native-safe-area-context';
 import { InfluencerCard } from '../../src/components/InfluencerCard';
 import { FilterSheet } from '../../src/components/FilterSheet';
-import { useInfluencers, useNaturalSearch, useSaveInfluencer, useSavedInfluencers } from '../../src/hooks/useApi';
+import { useInfluencers, useNaturalSearch, useSaveInfluencer } from '../../src/hooks/useApi';
 import { colors, fontSize, spacing, borderRadius } from '../../src/theme';
 
 export default function SearchScreen() {
@@ -16,8 +16,6 @@ export default function SearchScreen() {
   const { data, isLoading } = useInfluencers(filters);
   const nlSearch = useNaturalSearch();
   const saveInfluencer = useSaveInfluencer();
-  const { data: savedList } = useSavedInfluencers();
-  const savedIds = new Set(savedList?.map((i) => i.id) || []);
 
   const handleNLSearch = () => {
     if (!nlQuery.trim()) return;
@@ -67,7 +65,7 @@ export default function SearchScreen() {
               influencer={item}
               onPress={() => router.push(`/(brand)/influencer/${item.id}`)}
               onSave={() => saveInfluencer.mutate(item.id)}
-              isSaved={savedIds.has(item.id)}
+              isSaved={!!item.is_saved}
             />
           )}
           contentContainerStyle={styles.list}
@@ -1,9 +1,12 @@
 import { Tabs } from 'expo-router';
 import { Ionicons } from '@expo/vector-icons';
 import { Platform } from 'react-native';
+import { useApplicationEvents } from '../../src/hooks/useEvents';
 import { tokens } from '../../src/theme';
 
 export default function InfluencerLayout() {
+  useApplicationEvents();
+
   return (
     <Tabs screenOptions={{
       tabBarActiveTintColor: tokens.color.tabActive,
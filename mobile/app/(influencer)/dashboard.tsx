@@ -24,11 +24,14 @@ function getTimeOfDay() {
 export default function InfluencerDashboard() {
   const { profile, logout } = useAuth();
   const inf = profile as InfluencerProfile | null;
-  const { data: applications } = useMyApplications();
+  const { data: myApplications } = useMyApplications();
+  const applications = myApplications?.items;
+  const totals = myApplications?.totals ?? {};
   const router = useRouter();
 
-  const pending = applications?.filter((a) => a.status === 'pending').length || 0;
-  const accepted = applications?.filter((a) => a.status === 'accepted').length || 0;
+  const pending = totals.pending || 0;
+  const accepted = totals.accepted || 0;
+  const total = Object.values(totals).reduce((sum, n) => sum + n, 0);
 
   return (
     <SafeAreaView style={styles.safe}>
@@ -84,7 +87,7 @@ export default function InfluencerDashboard() {
             <Text style={styles.appLabel}>accepted</Text>
           </View>
           <View style={styles.appStat}>
-            <Text style={styles.appNumber}>{applications?.length || 0}</Text>
+            <Text style={styles.appNumber}>{total}</Text>
             <Text style={styles.appLabel}>total</Text>
           </View>
         </View>
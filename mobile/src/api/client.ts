@@ -2,7 +2,7 @@ import axios from 'axios';
 import { Platform } from 'react-native';
 import { getItem, setItem, deleteItem } from './storage';
 
-const BASE_URL = Platform.OS === 'android'
+export const BASE_URL = Platform.OS === 'android'
   ? 'http://10.0.2.2:8000'
   : 'http://localhost:8000';
 
@@ -4,10 +4,10 @@ import { Ionicons } from '@expo/vector-icons';
 import { Card } from './ui/Card';
 import { Badge } from './ui/Badge';
 import { colors, fontSize, spacing } from '../theme';
-import type { Campaign } from '../types/api';
+import type { CampaignCardData } from '../types/api';
 
 interface CampaignCardProps {
-  campaign: Campaign;
+  campaign: CampaignCardData;
   onPress: () => void;
 }
 
@@ -5,10 +5,10 @@ import { Card } from './ui/Card';
 import { Badge } from './ui/Badge';
 import { AuthenticityBadge } from './AuthenticityBadge';
 import { colors, fontSize, spacing, borderRadius } from '../theme';
-import type { InfluencerProfile } from '../types/api';
+import type { InfluencerCardData } from '../types/api';
 
 interface InfluencerCardProps {
-  influencer: InfluencerProfile;
+  influencer: InfluencerCardData;
   onPress: () => void;
   onSave?: () => void;
   isSaved?: boolean;
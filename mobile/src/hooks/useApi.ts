@@ -1,26 +1,49 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useInfiniteQuery, useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import api from '../api/client';
 import type {
   InfluencerProfile,
+  InfluencerCardData,
   Campaign,
+  CampaignCardData,
   Application,
+  ApplicantSort,
+  ApplicationPage,
   PaginatedResponse,
   NaturalSearchResponse,
+  SavedInfluencerPage,
+  InfluencerSuggestion,
+  BrandDashboard,
+  Leaderboard,
+  LeaderboardMetric,
 } from '../types/api';
 
 export function useInfluencers(params?: Record<string, any>) {
   return useQuery({
     queryKey: ['influencers', params],
     queryFn: async () => {
-      const { data } = await api.get<PaginatedResponse<InfluencerProfile>>(
+      const { data } = await api.get<PaginatedResponse<InfluencerCardData>>(
         '/api/v1/influencers',
-        { params }
+        { params: { ...params, fields: 'card' } }
       );
       return data;
     },
   });
 }
 
+export function useInfluencerSuggestions(prefix: string) {
+  return useQuery({
+    queryKey: ['influencer-suggest', prefix],
+    queryFn: async () => {
+      const { data } = await api.get<InfluencerSuggestion[]>('/api/v1/influencers/suggest', {
+        params: { prefix },
+      });
+      return data;
+    },
+    enabled: prefix.trim().length > 0,
+    staleTime: 60_000,
+  });
+}
+
 export function useInfluencer(id: string) {
   return useQuery({
     queryKey: ['influencer', id],
@@ -36,9 +59,9 @@ export function useCampaigns(params?: Record<string, any>) {
   return useQuery({
     queryKey: ['campaigns', params],
     queryFn: async () => {
-      const { data } = await api.get<PaginatedResponse<Campaign>>(
+      const { data } = await api.get<PaginatedResponse<CampaignCardData>>(
         '/api/v1/campaigns',
-        { params }
+        { params: { ...params, fields: 'card' } }
       );
       return data;
     },
@@ -49,7 +72,9 @@ export function useMyCampaigns() {
   return useQuery({
     queryKey: ['my-campaigns'],
     queryFn: async () => {
-      const { data } = await api.get<PaginatedResponse<Campaign>>('/api/v1/campaigns/mine');
+      const { data } = await api.get<PaginatedResponse<CampaignCardData>>('/api/v1/campaigns/mine', {
+        params: { fields: 'card' },
+      });
       return data;
     },
   });
@@ -66,13 +91,17 @@ export function useCampaign(id: string) {
   });
 }
 
-export function useApplications(campaignId: string) {
-  return useQuery({
-    queryKey: ['applications', campaignId],
-    queryFn: async () => {
-      const { data } = await api.get<Application[]>(`/api/v1/campaigns/${campaignId}/applications`);
+export function useApplications(campaignId: string, status?: string, sortBy: ApplicantSort = 'created_at') {
+  return useInfiniteQuery({
+    queryKey: ['applications', campaignId, status ?? null, sortBy],
+    queryFn: async ({ pageParam }) => {
+      const { data } = await api.get<ApplicationPage>(`/api/v1/campaigns/${campaignId}/applications`, {
+        params: { status, sort_by: sortBy, cursor: pageParam ?? undefined },
+      });
       return data;
     },
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.next_cursor,
     enabled: !!campaignId,
   });
 }
@@ -81,9 +110,26 @@ export function useMyApplications() {
   return useQuery({
     queryKey: ['my-applications'],
     queryFn: async () => {
-      const { data } = await api.get<Application[]>('/api/v1/influencers/me/applications');
+      const { data } = await api.get<ApplicationPage>('/api/v1/influencers/me/applications', {
+        params: { limit: 20 },
+      });
+      return data;
+    },
+  });
+}
+
+export function useLeaderboard(category: string, metric: LeaderboardMetric = 'composite', limit = 10) {
+  return useQuery({
+    queryKey: ['leaderboard', category, metric, limit],
+    queryFn: async () => {
+      const { data } = await api.get<Leaderboard>(
+        `/api/v1/influencers/leaderboards/${encodeURIComponent(category)}`,
+        { params: { metric, limit } }
+      );
       return data;
     },
+    enabled: !!category,
+    staleTime: 60_000,
   });
 }
 
@@ -91,7 +137,19 @@ export function useSavedInfluencers() {
   return useQuery({
     queryKey: ['saved-influencers'],
     queryFn: async () => {
-      const { data } = await api.get<InfluencerProfile[]>('/api/v1/brands/me/saved');
+      const { data } = await api.get<SavedInfluencerPage>('/api/v1/brands/me/saved', {
+        params: { limit: 200, fields: 'card' },
+      });
+      return data;
+    },
+  });
+}
+
+export function useBrandDashboard() {
+  return useQuery({
+    queryKey: ['brand-dashboard'],
+    queryFn: async () => {
+      const { data } = await api.get<BrandDashboard>('/api/v1/brands/me/dashboard');
       return data;
     },
   });
@@ -137,7 +195,10 @@ export function useUpdateApplicationStatus() {
       );
       return data;
     },
-    onSuccess: (_, vars) => qc.invalidateQueries({ queryKey: ['applications', vars.campaignId] }),
+    onSuccess: (_, vars) => {
+      qc.invalidateQueries({ queryKey: ['applications', vars.campaignId] });
+      qc.invalidateQueries({ queryKey: ['brand-dashboard'] });
+    },
   });
 }
 
@@ -147,7 +208,10 @@ export function useSaveInfluencer() {
     mutationFn: async (influencerId: string) => {
       await api.post(`/api/v1/brands/me/saved/${influencerId}`);
     },
-    onSuccess: () => qc.invalidateQueries({ queryKey: ['saved-influencers'] }),
+    onSuccess: () => {
+      qc.invalidateQueries({ queryKey: ['saved-influencers'] });
+      qc.invalidateQueries({ queryKey: ['influencers'] });
+    },
   });
 }
 
@@ -157,14 +221,21 @@ export function useUnsaveInfluencer() {
     mutationFn: async (influencerId: string) => {
       await api.delete(`/api/v1/brands/me/saved/${influencerId}`);
     },
-    onSuccess: () => qc.invalidateQueries({ queryKey: ['saved-influencers'] }),
+    onSuccess: () => {
+      qc.invalidateQueries({ queryKey: ['saved-influencers'] });
+      qc.invalidateQueries({ queryKey: ['influencers'] });
+    },
   });
 }
 
 export function useNaturalSearch() {
   return useMutation({
     mutationFn: async (query: string) => {
-      const { data } = await api.post<NaturalSearchResponse>('/api/v1/search/natural', { query });
+      const { data } = await api.post<NaturalSearchResponse>(
+        '/api/v1/search/natural',
+        { query },
+        { params: { fields: 'card' } }
+      );
       return data;
     },
   });
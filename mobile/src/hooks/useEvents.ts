@@ -0,0 +1,65 @@
+import { useEffect } from 'react';
+import { useQueryClient } from '@tanstack/react-query';
+import { BASE_URL } from '../api/client';
+import { getItem } from '../api/storage';
+
+const APPLICATION_QUERIES = ['applications', 'my-applications', 'brand-dashboard'];
+
+/**
+ * Keeps application lists fresh from the server-sent event stream instead of
+ * polling. React Native has no EventSource, so this reads the stream through
+ * XMLHttpRequest progress events and reconnects when it ends.
+ */
+export function useApplicationEvents() {
+  const qc = useQueryClient();
+
+  useEffect(() => {
+    let xhr: XMLHttpRequest | null = null;
+    let timer: ReturnType<typeof setTimeout> | null = null;
+    let stopped = false;
+    let retryMs = 5000;
+
+    const refresh = () => {
+      for (const key of APPLICATION_QUERIES) qc.invalidateQueries({ queryKey: [key] });
+    };
+
+    const connect = async () => {
+      const token = await getItem('access_token');
+      if (stopped) return;
+      if (!token) {
+        timer = setTimeout(connect, retryMs);
+        return;
+      }
+      let seen = 0;
+      let buffer = '';
+      xhr = new XMLHttpRequest();
+      xhr.open('GET', `${BASE_URL}/api/v1/events`);
+      xhr.setRequestHeader('Authorization', `Bearer ${token}`);
+      xhr.setRequestHeader('Accept', 'text/event-stream');
+      xhr.onprogress = () => {
+        buffer += xhr!.responseText.slice(seen);
+        seen = xhr!.responseText.length;
+        const frames = buffer.split('\n\n');
+        buffer = frames.pop() ?? '';
+        for (const frame of frames) {
+          const retry = frame.match(/^retry: (\d+)$/m);
+          if (retry) retryMs = Number(retry[1]);
+          if (/^event: /m.test(frame)) refresh();
+        }
+      };
+      xhr.onloadend = () => {
+        if (!stopped) timer = setTimeout(connect, retryMs);
+      };
+      xhr.send();
+      // Anything that happened while disconnected.
+      refresh();
+    };
+
+    connect();
+    return () => {
+      stopped = true;
+      if (timer) clearTimeout(timer);
+      xhr?.abort();
+    };
+  }, [qc]);
+}
@@ -27,7 +27,10 @@ export interface InfluencerProfile {
   fake_follower_pct: number;
   price_per_post: number | null;
   location: string | null;
+  location_city?: string | null;
+  location_country?: string | null;
   is_verified: boolean;
+  is_saved?: boolean | null;
 }
 
 export interface BrandProfile {
@@ -61,6 +64,35 @@ export interface Campaign {
   application_count: number | null;
 }
 
+// What the list endpoints return with fields=card.
+export type InfluencerCardData = Pick<
+  InfluencerProfile,
+  | 'id'
+  | 'display_name'
+  | 'avatar_url'
+  | 'is_verified'
+  | 'location'
+  | 'follower_count'
+  | 'engagement_rate'
+  | 'authenticity_score'
+  | 'categories'
+  | 'price_per_post'
+  | 'is_saved'
+>;
+
+export type CampaignCardData = Pick<
+  Campaign,
+  | 'id'
+  | 'title'
+  | 'brand_name'
+  | 'status'
+  | 'platform'
+  | 'description'
+  | 'budget'
+  | 'category'
+  | 'application_count'
+>;
+
 export interface Application {
   id: string;
   campaign_id: string;
@@ -70,9 +102,43 @@ export interface Application {
   created_at: string;
   influencer_name?: string | null;
   influencer_avatar?: string | null;
+  influencer_follower_count?: number | null;
+  influencer_engagement_rate?: number | null;
+  influencer_authenticity_score?: number | null;
   campaign_title?: string | null;
 }
 
+export type ApplicantSort = 'created_at' | 'follower_count' | 'engagement_rate' | 'authenticity_score';
+
+export interface ApplicationPage {
+  items: Application[];
+  next_cursor: string | null;
+  totals: Record<string, number>;
+}
+
+export interface DashboardCampaign {
+  campaign_id: string;
+  title: string | null;
+  status: string | null;
+  applications: Record<string, number>;
+  total_applications: number;
+  acceptance_rate: number | null;
+  budget: number | null;
+  price_per_influencer: number | null;
+  committed_spend: number | null;
+  budget_remaining: number | null;
+  end_date: string | null;
+  days_remaining: number | null;
+}
+
+export interface BrandDashboard {
+  campaigns: DashboardCampaign[];
+  applications: Record<string, number>;
+  acceptance_rate: number | null;
+  committed_spend: number;
+  budget: number;
+}
+
 export interface TokenResponse {
   access_token: string;
   refresh_token: string;
@@ -91,9 +157,33 @@ export interface PaginatedResponse<T> {
   limit: number;
 }
 
+export type LeaderboardMetric = 'followers' | 'engagement' | 'authenticity' | 'composite';
+
+export interface Leaderboard {
+  category: string;
+  metric: LeaderboardMetric;
+  refreshed_at: string | null;
+  items: { rank: number; score: number; influencer: InfluencerProfile }[];
+}
+
+export interface SavedInfluencerPage {
+  items: InfluencerCardData[];
+  next_cursor: string | null;
+  total: number;
+}
+
+export interface InfluencerSuggestion {
+  id: string;
+  display_name: string;
+  matched_handle: string | null;
+  avatar_url: string | null;
+  follower_count: number;
+}
+
 export interface NaturalSearchResponse {
   query: string;
   interpreted_filters: Record<string, any>;
-  results: InfluencerProfile[];
+  results: InfluencerCardData[];
   total: number;
+  facets?: Record<string, Record<string, number>> | null;
 }